@@ -0,0 +1,3 @@
+"""
+Shared tooling for running and measuring the Advent of Code 2024 solutions in `day/`.
+"""
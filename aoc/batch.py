@@ -0,0 +1,155 @@
+"""
+Solve many inputs of one day in a pool of warmed-up worker processes.
+
+Usage:
+    python -m aoc.batch 14 inputs/                  # every file of the directory
+    python -m aoc.batch 14 manifest.txt -j 8        # input paths listed in the manifest
+    python -m aoc.batch 18 examples/ -p width=6 -p height=6 -p n_steps=12
+
+The manifest has one input path per line, relative to the manifest, empty lines and lines
+starting with `#` are skipped. The workers import the day once when they start and then call
+its `solve()` for every input, so there is no interpreter start or import per input. The inputs
+are sent to the workers in chunks of `--chunk-size` paths and only a few chunks per worker are
+in flight, so even huge manifests are streamed.
+
+Every solved input is printed as a JSON line as soon as its chunk finishes, in the order of
+completion: `{"input": ..., "part_one": ..., "part_two": ..., "wall": ..., "error": ...}`.
+An input whose solution raises gets the exception in `error` and the batch goes on.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from itertools import batched
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc.days import Day, discover, load
+from aoc.generate import parse_param
+
+CHUNK_SIZE = 8  # Inputs per job, amortizes the inter-process overhead of the fast days
+CHUNKS_PER_WORKER = 4  # Jobs in flight per worker
+
+_module: ModuleType | None = None  # Day solved by the worker process
+
+
+@dataclass
+class InputResult:
+    input: str
+    part_one: Any = None
+    part_two: Any = None
+    wall: float = 0.0  # seconds, including the parsing
+    error: str | None = None
+
+
+def read_manifest(path: Path) -> Iterator[Path]:
+    """
+    Input paths listed in the manifest, relative to its directory, read line by line
+    """
+    with open(path) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield path.parent / line
+
+
+def collect_inputs(source: Path) -> Iterable[Path]:
+    """
+    Files of the directory (sorted, without hidden ones) or the inputs listed in the manifest
+    """
+    if source.is_dir():
+        return sorted(path for path in source.iterdir() if path.is_file() and not path.name.startswith("."))
+    return read_manifest(source)
+
+
+def warm_up(day: Day):
+    """
+    Import the day in the worker process, once before it takes the first job
+    """
+    global _module
+    _module = load(day)
+
+
+def solve_inputs(paths: list[Path], params: dict[str, Any]) -> list[InputResult]:
+    """
+    Solve the inputs one by one in the worker process
+    """
+    assert _module is not None, "The worker is not warmed up"
+    results = []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            part_one, part_two = _module.solve(path.read_bytes(), **params)
+        except Exception as error:
+            results.append(InputResult(str(path), wall=time.perf_counter() - start, error=repr(error)))
+        else:
+            results.append(InputResult(str(path), part_one, part_two, time.perf_counter() - start))
+    return results
+
+
+def batch(
+    day: Day,
+    paths: Iterable[Path],
+    params: dict[str, Any] | None = None,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[InputResult]:
+    """
+    Solve the inputs of the day in a process pool and yield the results as they finish
+    :param day: Day solving the inputs
+    :param paths: Input files, consumed lazily
+    :param params: Keyword arguments of the day's `solve()`, e.g. the grid size
+    :param workers: Number of worker processes, defaults to the number of cores
+    :param chunk_size: Inputs sent to a worker at once
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = batched(paths, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(day,)) as executor:
+        running: set[Future] = set()
+        while True:
+            # Keep the workers busy without submitting all of the inputs at once
+            for chunk in chunks:
+                running.add(executor.submit(solve_inputs, list(chunk), params or {}))
+                if len(running) >= workers * CHUNKS_PER_WORKER:
+                    break
+            if not running:
+                return
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("day", type=int, help="Day solving the inputs")
+    parser.add_argument("inputs", type=Path, help="Directory of input files or a manifest of input paths")
+    parser.add_argument(
+        "-p", "--param", action="append", default=[], type=parse_param, help="solve() parameter as name=value"
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: cores)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help=f"Inputs per job (default: {CHUNK_SIZE})"
+    )
+    args = parser.parse_args()
+
+    days = {day.number: day for day in discover()}
+    if args.day not in days:
+        parser.error(f"Unknown day {args.day}")
+    if not args.inputs.exists():
+        parser.error(f"No such directory or manifest: {args.inputs}")
+
+    paths = collect_inputs(args.inputs)
+    results = batch(days[args.day], paths, dict(args.param), args.workers, args.chunk_size)
+    for result in results:
+        print(json.dumps(asdict(result)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
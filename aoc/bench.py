@@ -0,0 +1,456 @@
+"""
+Benchmarks of the hot functions of every day, with stored baselines.
+
+Usage:
+    python -m aoc.bench                     # run all benchmarks
+    python -m aoc.bench 7 9 -k defragment   # select by day and name
+    python -m aoc.bench --save              # store the results as the baseline
+    python -m aoc.bench --compare           # compare against the baseline
+
+Each benchmark prepares fresh arguments before every run (inputs are parsed outside the timed
+region), is warmed up, then timed `--repeat` times. The median, p95 and the peak traced memory
+of one extra run are recorded. `--compare` exits with status 1 if any median got slower than
+the baseline by more than `--threshold`.
+"""
+
+import argparse
+import fnmatch
+import gc
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc.days import ROOT, Day, discover, load
+from aoc.generate import generate
+
+BASELINE_FILE = ROOT / ".aoc" / "bench_baseline.json"
+
+# A benchmark prepares a fresh zero-argument call from the day module, only the call is timed
+Prepare = Callable[[ModuleType], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    day: int
+    name: str
+    prepare: Prepare
+
+    @property
+    def key(self) -> str:
+        return f"{self.day:02d}/{self.name}"
+
+
+@dataclass
+class Measurement:
+    key: str
+    median: float  # seconds
+    p95: float  # seconds
+    peak_memory: int  # bytes
+    repeat: int
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(day: int, name: str) -> Callable[[Prepare], Prepare]:
+    """
+    Register the decorated function as a benchmark of the day
+    """
+
+    def register(prepare: Prepare) -> Prepare:
+        BENCHMARKS.append(Benchmark(day, name, prepare))
+        return prepare
+
+    return register
+
+
+@benchmark(1, "parse_input")
+def _day_01_parse_input(m):
+    return m.parse_input
+
+
+@benchmark(1, "part_one")
+def _day_01_part_one(m):
+    lists = m.parse_input()
+    return lambda: m.part_one(lists)
+
+
+@benchmark(1, "part_two")
+def _day_01_part_two(m):
+    lists = m.parse_input()
+    return lambda: m.part_two(lists)
+
+
+@benchmark(2, "parse_input")
+def _day_02_parse_input(m):
+    return m.parse_input
+
+
+@benchmark(2, "is_increasing_or_decreasing")
+def _is_increasing_or_decreasing(m):
+    reports = m.parse_input()
+    return lambda: sum(m.is_increasing_or_decreasing(report) for report in reports)
+
+
+@benchmark(2, "is_increasing_or_decreasing[allowed_fails=1]")
+def _is_increasing_or_decreasing_with_fail(m):
+    reports = m.parse_input()
+    return lambda: sum(m.is_increasing_or_decreasing(report, allowed_fails=1) for report in reports)
+
+
+@benchmark(2, "is_safe[allowed_removals=1]")
+def _is_safe_with_removal(m):
+    reports = m.parse_input()
+    return lambda: sum(m.is_safe(report, allowed_removals=1) for report in reports)
+
+
+@benchmark(3, "solve")
+def _day_03_solve(m):
+    data = Path(m.INPUT_FILE).read_bytes()
+    return lambda: m.solve(data)
+
+
+@benchmark(4, "search_word")
+def _search_word(m):
+    grid = m.read_grid(m.INPUT_FILE)
+    return lambda: m.search_word(grid, m.WORD)
+
+
+@benchmark(4, "search_x_mas")
+def _search_x_mas(m):
+    grid = m.read_grid(m.INPUT_FILE)
+    return lambda: m.search_x_mas(grid)
+
+
+@benchmark(5, "part_one")
+def _day_05_part_one(m):
+    return m.part_one
+
+
+@benchmark(5, "part_two")
+def _day_05_part_two(m):
+    return m.part_two
+
+
+@benchmark(6, "patrol")
+def _patrol(m):
+    return m.patrol
+
+
+@benchmark(6, "World.check_obstacles")
+def _check_obstacles(m):
+    return m.patrol().check_obstacles
+
+
+@benchmark(7, "can_solve")
+def _can_solve(m):
+    equations = list(m.get_input())
+    return lambda: sum(value for value, numbers in equations if m.can_solve(value, 0, numbers.copy()))
+
+
+@benchmark(7, "can_solve[calibrate]")
+def _can_solve_calibrate(m):
+    equations = list(m.get_input())
+    return lambda: sum(
+        value for value, numbers in equations if m.can_solve(value, 0, numbers.copy(), calibrate=True)
+    )
+
+
+@benchmark(8, "World.deploy_antinodes")
+def _deploy_antinodes(m):
+    return m.World(m.parse_input()).deploy_antinodes
+
+
+@benchmark(8, "World.deploy_antinodes[resonant_harmonics]")
+def _deploy_antinodes_resonant(m):
+    world = m.World(m.parse_input())
+    return lambda: world.deploy_antinodes(resonant_harmonics=True)
+
+
+@benchmark(9, "decode_blocks")
+def _decode_blocks(m):
+    blocks = m.parse_input()
+    return lambda: m.decode_blocks(blocks)
+
+
+@benchmark(9, "defragment")
+def _defragment(m):
+    blocks = m.decode_blocks(m.parse_input())
+    return lambda: m.defragment(blocks)
+
+
+@benchmark(9, "defragment_whole_blocks")
+def _defragment_whole_blocks(m):
+    blocks = m.decode_blocks(m.parse_input())
+    return lambda: m.defragment_whole_blocks(blocks)
+
+
+@benchmark(10, "Grid.analyze_path")
+def _analyze_path(m):
+    grid = m.Grid(m.parse_input())
+    return lambda: sum(grid.analyze_path(position) for position in grid.get_trailheads_start())
+
+
+@benchmark(10, "Grid.analyze_rating")
+def _analyze_rating(m):
+    grid = m.Grid(m.parse_input())
+    return lambda: sum(grid.analyze_rating(position) for position in grid.get_trailheads_start())
+
+
+@benchmark(11, "transform[75]")
+def _transform(m):
+    stones = m.parse_input()
+    return lambda: m.transform(stones, 75)
+
+
+@benchmark(12, "total_prices")
+def _total_prices(m):
+    return m.total_prices
+
+
+def _total_prices_garden(size: int) -> Prepare:
+    """
+    Prices of a generated garden of `size` x `size` plots, the sizes show how the regions scale
+    """
+
+    def prepare(m):
+        garden = io.StringIO()
+        generate(12, garden, width=size, height=size)
+        plots = m.parse_input(garden.getvalue())
+        return lambda: m.total_prices(plots)
+
+    return prepare
+
+
+for _size in (140, 280, 560):
+    benchmark(12, f"total_prices[garden {_size}x{_size}]")(_total_prices_garden(_size))
+
+
+@benchmark(13, "parse_input")
+def _day_13_parse_input(m):
+    return m.parse_input
+
+
+@benchmark(13, "ClawMachine.solve")
+def _claw_machine_solve(m):
+    machines = list(m.read_input(shift=10000000000000))
+    return lambda: sum(machine.solve() for machine in machines)
+
+
+@benchmark(14, "part_one")
+def _day_14_part_one(m):
+    robots = m.parse_input()
+    return lambda: m.part_one(robots)
+
+
+@benchmark(14, "part_two")
+def _day_14_part_two(m):
+    robots = m.parse_input()
+    return lambda: m.part_two(robots)
+
+
+@benchmark(15, "run_robot")
+def _run_robot(m):
+    return m.run_robot
+
+
+@benchmark(16, "Maze.dijkstra")
+def _dijkstra_16(m):
+    return m.Maze(m.parse_input()).dijkstra
+
+
+@benchmark(16, "Maze.backtrack")
+def _backtrack(m):
+    maze = m.Maze(m.parse_input())
+    min_cost = maze.dijkstra()
+    return lambda: maze.backtrack(min_cost)
+
+
+@benchmark(17, "Program.execute")
+def _execute(m):
+    registers, program = m.parse_input()
+    return lambda: m.Program(registers).execute(program)
+
+
+@benchmark(17, "Program.find_a_register_value")
+def _find_a_register_value(m):
+    registers, program = m.parse_input()
+    return lambda: m.Program(registers).find_a_register_value(program)
+
+
+@benchmark(18, "Maze.dijkstra")
+def _dijkstra_18(m):
+    return m.Maze(m.parse_input()[: m.N_STEPS]).dijkstra
+
+
+@benchmark(18, "part_two")
+def _day_18_part_two(m):
+    return m.part_two
+
+
+@benchmark(19, "can_form_pattern")
+def _can_form_pattern(m):
+    towels, patterns = m.parse_input()
+    return lambda: sum(m.can_form_pattern(towels, pattern) for pattern in patterns)
+
+
+@benchmark(19, "count_formations")
+def _count_formations(m):
+    towels, patterns = m.parse_input()
+    return lambda: m.count_formations(towels, patterns)
+
+
+@benchmark(20, "Maze.dijkstra")
+def _dijkstra_20(m):
+    return m.Maze(m.parse_input()).dijkstra
+
+
+@benchmark(20, "Maze.find_cheating_paths[radius=2]")
+def _find_cheating_paths(m):
+    maze = m.Maze(m.parse_input())
+    maze.dijkstra()
+    return lambda: maze.find_cheating_paths(threshold=100)
+
+
+@benchmark(20, "Maze.find_cheating_paths[radius=20]")
+def _find_cheating_paths_radius(m):
+    maze = m.Maze(m.parse_input())
+    maze.dijkstra()
+    return lambda: maze.find_cheating_paths(threshold=100, radius=20)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile
+    :param values: Measured values
+    :param q: Percentile in range (0, 100]
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * q / 100) - 1)]
+
+
+def measure(benchmark: Benchmark, day: Day, repeat: int = 5, warmup: int = 1) -> Measurement:
+    """
+    Run the benchmark and collect its timings and peak memory
+    :param benchmark: Benchmark to run
+    :param day: Day of the benchmark, its inputs are read from the day directory
+    :param repeat: Number of timed runs
+    :param warmup: Number of untimed runs before the timed ones
+    """
+    os.chdir(day.directory)
+    module = load(day)
+    timings = []
+    for i in range(warmup + repeat):
+        call = benchmark.prepare(module)
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(elapsed)
+
+    # Memory is measured in a separate run, tracing slows down the code a lot
+    call = benchmark.prepare(module)
+    gc.collect()
+    tracemalloc.start()
+    call()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return Measurement(benchmark.key, statistics.median(timings), percentile(timings, 95), peak, repeat)
+
+
+def read_baseline(path: Path) -> dict[str, dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_baseline(measurements: list[Measurement], path: Path):
+    """
+    Store the measurements, keeping baselines of benchmarks that were not run
+    """
+    baseline = read_baseline(path)
+    baseline.update({m.key: asdict(m) for m in measurements})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+
+
+def compare(
+    measurement: Measurement, baseline: dict[str, dict], threshold: float
+) -> tuple[str, float | None]:
+    """
+    Compare the median with the baseline
+    :return: Status (`ok`, `faster`, `REGRESSION` or `new`) and the ratio to the baseline median
+    """
+    if measurement.key not in baseline:
+        return "new", None
+    ratio = measurement.median / baseline[measurement.key]["median"]
+    if ratio > 1 + threshold:
+        return "REGRESSION", ratio
+    if ratio < 1 - threshold:
+        return "faster", ratio
+    return "ok", ratio
+
+
+def select(days: list[int], pattern: str | None) -> list[Benchmark]:
+    return [
+        benchmark
+        for benchmark in BENCHMARKS
+        if (not days or benchmark.day in days)
+        and (pattern is None or fnmatch.fnmatch(benchmark.name, f"*{pattern}*"))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", type=int, help="Days to benchmark (default: all)")
+    parser.add_argument("-k", dest="pattern", help="Only benchmarks with names matching the pattern")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per benchmark (default: 1)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store the results into the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed slowdown of the median (default: 0.1 = 10%%)"
+    )
+    args = parser.parse_args()
+
+    days = {day.number: day for day in discover()}
+    baseline = read_baseline(args.baseline) if args.compare else {}
+    measurements, regressions = [], 0
+
+    print(f"{'Benchmark':<50} {'Median':>10} {'p95':>10} {'Peak memory':>12}")
+    for selected in select(args.days, args.pattern):
+        m = measure(selected, days[selected.day], repeat=args.repeat, warmup=args.warmup)
+        measurements.append(m)
+        line = f"{m.key:<50} {m.median:>9.4f}s {m.p95:>9.4f}s {m.peak_memory / 2**20:>9.2f} MiB"
+        if args.compare:
+            status, ratio = compare(m, baseline, args.threshold)
+            regressions += status == "REGRESSION"
+            line += f"  {status}" + (f" ({ratio:.2f}x)" if ratio is not None else "")
+        print(line, flush=True)
+
+    if args.save:
+        write_baseline(measurements, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    if regressions:
+        print(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
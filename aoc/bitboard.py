@@ -0,0 +1,164 @@
+"""
+Bitboards: sets of grid cells as Python integers, one bit per cell, shared by the flood fill days.
+
+The bits follow the layout of a `ByteGrid`: bit `i` is the cell at index `i`, so positions are
+interchangeable with the grid indices. A step to a neighbour is a shift of the whole set by the
+direction offset, and a breadth-first layer of any size is a handful of big-int operations done
+word by word in C instead of a Python loop over the cells:
+
+    board = Bitboard(grid)
+    track = board.cells(".SE")
+    for distance, frontier in enumerate(board.layers(board.bit(grid.find("S")), track)):
+        ...
+
+The cells of the border are never set in the masks made by `cells` (and in `inside`). Every
+expansion is masked by such a mask, so a shift over the edge of a row into the border (or over
+the ends of the buffer) never adds cells: the masks are the edge masks of all four directions at
+once. As the shifts are relative, the masks can be shifted down together to work on a part of
+the grid only, e.g. above the lowest cell that can be reached.
+
+A layer costs the length of the masks, whatever the size of its frontier. Along a winding
+corridor (one or two cells per layer) that would be quadratic, so `search` goes on cell by cell
+once the frontier is narrow compared to the masks.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from aoc.grid import ByteGrid
+
+NARROW = 1024  # Bits of the masks per cell of the frontier from which a layer is narrow
+NARROW_LAYERS = 16  # Narrow layers in a row after which a search goes on cell by cell
+
+
+class Bitboard:
+    __slots__ = ("grid", "directions", "inside")
+
+    def __init__(self, grid: ByteGrid):
+        """
+        :param grid: Grid giving the layout of the bits, it is read when the masks are created
+        """
+        self.grid = grid
+        self.directions = grid.directions
+        # Binary literal of the cells, the first cell is the lowest bit (the last character)
+        padding = "0" * grid.padding
+        rows = padding * grid.stride + (padding + "1" * grid.width + padding) * grid.height
+        self.inside = int(rows[::-1], 2)
+
+    def cells(self, values: str | bytes) -> int:
+        """
+        Mask of the cells inside the grid with any of the values
+        """
+        values = values.encode("latin-1") if isinstance(values, str) else values
+        table = bytearray(b"0") * 256
+        for value in values:
+            table[value] = ord("1")
+        return int(self.grid.cells.translate(table)[::-1], 2) & self.inside
+
+    @staticmethod
+    def bit(position: int) -> int:
+        return 1 << position
+
+    @staticmethod
+    def shift(mask: int, offset: int) -> int:
+        """
+        Cells moved by the index offset: position `p` of the mask becomes `p + offset`
+        """
+        return mask << offset if offset >= 0 else mask >> -offset
+
+    def neighbors(self, mask: int) -> int:
+        """
+        Cells next to any cell of the mask (up, right, down or left), including the border cells
+        """
+        result = 0
+        for offset in self.directions:
+            result |= mask << offset if offset >= 0 else mask >> -offset
+        return result
+
+    def layers(self, seed: int, passable: int) -> Iterator[int]:
+        """
+        Breadth-first layers from the seed cells over the passable cells: the seed first, then the
+        cells one step further from it than the previous layer, until no new cell is reached
+        :param seed: Cells to start from
+        :param passable: Cells that can be entered, without the border (e.g. made by `cells`)
+        """
+        reached = frontier = seed & passable
+        while frontier:
+            yield frontier
+            frontier = self.neighbors(frontier) & passable & ~reached
+            reached |= frontier
+
+    def flood(self, seed: int, passable: int) -> int:
+        """
+        All passable cells connected to the seed cells
+        """
+        return self.search(seed, passable)[1]
+
+    def search(self, seed: int, passable: int, target: int = 0) -> tuple[int | None, int]:
+        """
+        Breadth-first search from the seed cells over the passable cells to the nearest target cell,
+        by layers while the frontier is wide and cell by cell once it is narrow
+        :param seed: Cells to start from
+        :param passable: Cells that can be entered, without the border (e.g. made by `cells`)
+        :param target: Cells to reach, 0 to reach all cells connected to the seed
+        :return: Steps to the nearest target cell (None if no target is reached) and the cells
+            reached, all cells connected to the seed if no target is reached
+        """
+        reached = frontier = seed & passable
+        length = passable.bit_length()
+        steps = narrow = 0
+        while frontier:
+            if frontier & target:
+                return steps, reached
+            # Small regions end within a few layers, cheaper than the bytes of the cell by cell search
+            narrow = narrow + 1 if frontier.bit_count() * NARROW < length else 0
+            if narrow > NARROW_LAYERS:
+                return self._search_cells(frontier, passable, reached, target, steps)
+            frontier = self.neighbors(frontier) & passable & ~reached
+            reached |= frontier
+            steps += 1
+        return None, reached
+
+    def _search_cells(
+        self, frontier: int, passable: int, reached: int, target: int, steps: int
+    ) -> tuple[int | None, int]:
+        """
+        Go on with a search from the frontier (at the given steps, not on a target) cell by cell,
+        the masks are bytes indexed by the cell (bit `i & 7` of byte `i >> 3`)
+        """
+        unvisited = passable & ~reached
+        size = (unvisited.bit_length() >> 3) + 1
+        cells = bytearray(unvisited.to_bytes(size, "little"))
+        targets = (target & unvisited).to_bytes(size, "little")
+        end = size << 3
+        layer = list(self.positions(frontier))
+        while layer:
+            steps += 1
+            found = False
+            next_layer = []
+            for position in layer:
+                for offset in self.directions:
+                    neighbor = position + offset
+                    # Masks shifted down may have cells next to their first cell below bit 0
+                    if 0 <= neighbor < end and cells[neighbor >> 3] >> (neighbor & 7) & 1:
+                        cells[neighbor >> 3] ^= 1 << (neighbor & 7)
+                        next_layer.append(neighbor)
+                        found = found or bool(targets[neighbor >> 3] >> (neighbor & 7) & 1)
+            if found:
+                break
+            layer = next_layer
+        # The cells cleared from the bytes were reached by now
+        reached = passable & ~int.from_bytes(cells, "little")
+        return (steps if found else None), reached
+
+    @staticmethod
+    def positions(mask: int) -> Iterator[int]:
+        """
+        Indices of the cells of the mask, in increasing order
+        """
+        bits = format(mask, "b")[::-1]
+        position = bits.find("1")
+        while position != -1:
+            yield position
+            position = bits.find("1", position + 1)
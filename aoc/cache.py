@@ -0,0 +1,172 @@
+"""
+On-disk cache of the part answers, keyed by the content of the input and of the solver code.
+
+Usage:
+    python -m aoc.cache              # cached entries, most recently used first
+    python -m aoc.cache --clear      # remove all entries
+
+The key of a part is a SHA-256 hash of the input file bytes, the source of the day script and
+the sources of all `aoc` modules it imports (transitively). Any change of the input or of the
+code the day runs gives a new key, so stale entries are never returned, they are just evicted
+later. Every entry is one small JSON file with the answer and the timing of the run. A hit
+refreshes the modification time of the file, and the least recently used entries are removed
+once there are more than `max_entries` of them or they take more than `max_bytes`.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from aoc.days import ROOT, Day, declared_input
+
+CACHE_DIR = ROOT / ".aoc" / "cache"
+MAX_ENTRIES = 1000
+MAX_BYTES = 16 * 1024 * 1024
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def imported_sources(script: Path) -> list[Path]:
+    """
+    The script and the sources of all `aoc` modules it imports, directly or through other modules
+    """
+    sources = [script]
+    pending = [script]
+    while pending:
+        for module in _aoc_imports(pending.pop()):
+            path = PACKAGE_DIR / f"{module}.py"
+            if path.is_file() and path not in sources:
+                sources.append(path)
+                pending.append(path)
+    return sources
+
+
+@cache
+def _aoc_imports(path: Path) -> list[str]:
+    modules = []
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.ImportFrom) and node.module == "aoc":
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("aoc."):
+            modules.append(node.module.split(".")[1])
+        elif isinstance(node, ast.Import):
+            modules += [alias.name.split(".")[1] for alias in node.names if alias.name.startswith("aoc.")]
+    return modules
+
+
+def cache_key(day: Day, part: str) -> str | None:
+    """
+    Content hash of the part: its input, the day script and the `aoc` modules it uses
+    :return: Hex digest, None if the day has no readable input file
+    """
+    path = declared_input(day)
+    if path is None or not path.is_file():
+        return None
+    digest = hashlib.sha256(f"{day.name}/{part}\0".encode())
+    for source in [path, *imported_sources(day.script)]:
+        content = source.read_bytes()
+        digest.update(f"{len(content)}\0".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self, directory: Path = CACHE_DIR, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES
+    ):
+        """
+        :param directory: Directory of the entry files
+        :param max_entries: Number of entries kept by `evict`
+        :param max_bytes: Total size of the entries kept by `evict`
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Stored entry of the key (marked as recently used), None if there is none
+        """
+        path = self.path(key)
+        try:
+            entry = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]):
+        """
+        Store the entry (must be JSON serializable) and evict the least recently used ones
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first, so parallel runs never read a partial entry
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as file:
+            json.dump(entry, file)
+        os.replace(file.name, self.path(key))
+        self.evict()
+
+    def entries(self) -> list[tuple[Path, os.stat_result]]:
+        """
+        Entry files with their stats, most recently used first
+        """
+        stats = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stats.append((path, path.stat()))
+            except OSError:
+                continue  # Removed meanwhile by another run
+        return sorted(stats, key=lambda item: item[1].st_mtime, reverse=True)
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries over the limits
+        :return: Number of removed entries
+        """
+        removed = 0
+        total = 0
+        for count, (path, stat) in enumerate(self.entries(), start=1):
+            total += stat.st_size
+            if count > self.max_entries or total > self.max_bytes:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for path, _stat in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clear", action="store_true", help="Remove all entries")
+    args = parser.parse_args()
+
+    results = ResultCache()
+    if args.clear:
+        print(f"Removed {results.clear()} entries")
+        return
+    entries = results.entries()
+    for path, _stat in entries:
+        entry = json.loads(path.read_text())
+        day, part, wall, answer = entry["day"], entry["part"], entry["wall"], entry["answer"]
+        print(f"{path.stem[:12]} {day:>3d} {part:<9} {wall:>9.3f}s  {answer}")
+    total = sum(stat.st_size for _path, stat in entries)
+    print(f"{len(entries)} entries, {total / 1024:.1f} KiB in {results.directory}")
+
+
+if __name__ == "__main__":
+    main()
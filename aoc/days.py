@@ -0,0 +1,127 @@
+"""
+Discovery and loading of the day solutions.
+
+Every day lives in `day/NN/python_NN.py` and exposes `part_one()` and (usually) `part_two()`
+functions returning the puzzle answers. The scripts read their inputs relative to the current
+working directory, so callers are expected to run them from `Day.directory`.
+
+Days with a `parse_input()` function parse their input once: its result is picklable, not
+modified by the parts and passed to both of them, e.g. `part_one(parse_input())`.
+
+The parts and the input file of a day can be read from its source without importing it
+(`declared_parts`, `declared_input`), so tools working with many days only import the ones
+they run, and `load(day, lazy=True)` defers running the module until it is first used.
+"""
+
+import ast
+import importlib.util
+import sys
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+DAYS_DIR = ROOT / "day"
+
+PARTS = ("part_one", "part_two")
+PARSER = "parse_input"  # Function parsing the input shared by the parts
+INPUT_NAMES = ("INPUT", "INPUT_FILE")  # Module constants with the input file of the day
+
+
+@dataclass(frozen=True, order=True)
+class Day:
+    number: int
+    directory: Path
+
+    @property
+    def name(self) -> str:
+        return f"{self.number:02d}"
+
+    @property
+    def script(self) -> Path:
+        return self.directory / f"python_{self.name}.py"
+
+
+def discover(days_dir: Path = DAYS_DIR) -> list[Day]:
+    """
+    Find all day solutions in the `day/` directory
+    :param days_dir: Directory with `NN/python_NN.py` solutions
+    :return: Days sorted by their number
+    """
+    days = []
+    for directory in days_dir.iterdir():
+        if directory.name.isdigit() and (directory / f"python_{directory.name}.py").is_file():
+            days.append(Day(int(directory.name), directory))
+    return sorted(days)
+
+
+def load(day: Day, lazy: bool = False) -> ModuleType:
+    """
+    Import the solution module of the day (once per process)
+    :param day: Day to import
+    :param lazy: Run the module body (and its imports) on the first attribute access
+    :return: Imported `python_NN` module
+    """
+    name = day.script.stem
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, day.script)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {day.script}")
+    if lazy:
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parts(module: ModuleType) -> list[str]:
+    """
+    Names of the parts implemented by the day module
+    """
+    return [part for part in PARTS if callable(getattr(module, part, None))]
+
+
+@cache
+def _top_level(script: Path) -> tuple[set[str], dict[str, object]]:
+    """
+    Names of the functions and values of the constants assigned at the top level of the script
+    """
+    functions, constants = set(), {}
+    for node in ast.parse(script.read_bytes()).body:
+        if isinstance(node, ast.FunctionDef):
+            functions.add(node.name)
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+    return functions, constants
+
+
+def declared_parts(day: Day) -> list[str]:
+    """
+    Names of the parts defined by the day script, without importing it
+    """
+    functions, _constants = _top_level(day.script)
+    return [part for part in PARTS if part in functions]
+
+
+def declared_parser(day: Day) -> bool:
+    """
+    Check if the day script parses its input once for all parts, without importing it
+    """
+    functions, _constants = _top_level(day.script)
+    return PARSER in functions
+
+
+def declared_input(day: Day) -> Path | None:
+    """
+    Input file of the day script, without importing it. None if the script does not name one.
+    """
+    _functions, constants = _top_level(day.script)
+    for name in INPUT_NAMES:
+        if isinstance(constants.get(name), str):
+            return day.directory / str(constants[name])
+    return None
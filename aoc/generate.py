@@ -0,0 +1,515 @@
+"""
+Seeded generators of synthetic puzzle inputs, for stress-testing the solutions at scale.
+
+Usage:
+    python -m aoc.generate --list
+    python -m aoc.generate 12 -o /tmp/garden.txt -p width=1400 -p height=1400
+    python -m aoc.generate 9 -o /tmp/disk.txt -p length=2000000000 --seed 42
+
+Every generator yields the input as chunks of text, so the output is streamed to disk
+and never held in memory as a whole. Grids are generated row by row, keeping at most
+the previous row in memory. The same seed and parameters always produce the same file.
+"""
+
+import argparse
+import inspect
+import random
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+Generator = Callable[..., Iterator[str]]
+
+GENERATORS: dict[int, Generator] = {}
+
+CHUNK_SIZE = 1 << 16  # characters of a single yielded chunk for the very long lines
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    """
+    Register the decorated function as the input generator of the day
+    """
+
+    def register(function: Generator) -> Generator:
+        GENERATORS[day] = function
+        return function
+
+    return register
+
+
+@generator(1)
+def location_lists(rng: random.Random, lines: int = 1000, digits: int = 5) -> Iterator[str]:
+    """
+    Two columns of location IDs, e.g. `77442   88154`
+    """
+    low, high = 10 ** (digits - 1), 10**digits - 1
+    for _ in range(lines):
+        yield f"{rng.randint(low, high)}   {rng.randint(low, high)}\n"
+
+
+@generator(2)
+def reports(
+    rng: random.Random, lines: int = 1000, min_length: int = 5, max_length: int = 8, error_rate: float = 0.1
+) -> Iterator[str]:
+    """
+    Reports of levels, mostly monotonic with 1..3 steps, some levels are off by `error_rate`
+    """
+    for _ in range(lines):
+        direction = rng.choice((-1, 1))
+        level = rng.randint(1, 99)
+        levels = []
+        for _ in range(rng.randint(min_length, max_length)):
+            levels.append(level)
+            step = rng.randint(-3, 4) if rng.random() < error_rate else rng.randint(1, 3)
+            level = max(1, level + direction * step)
+        yield " ".join(map(str, levels)) + "\n"
+
+
+@generator(3)
+def corrupted_memory(
+    rng: random.Random,
+    lines: int = 6,
+    line_length: int = 3000,
+    mul_rate: float = 0.05,
+    switch_rate: float = 0.005,
+) -> Iterator[str]:
+    """
+    Garbage with `mul(a,b)`, `do()` and `don't()` instructions, some `mul` calls are broken
+    """
+    noise = "!@#$%^&*()[]{}<>,;:'?+-~/ "
+    words = ["who()", "what()", "when()", "where()", "why()", "how()", "from()", "select()", "mul[2,3]"]
+    for _ in range(lines):
+        length = 0
+        chunk = []
+        while length < line_length:
+            roll = rng.random()
+            if roll < mul_rate:
+                token = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+                if rng.random() < 0.1:
+                    token = token[:-1]  # broken call
+            elif roll < mul_rate + switch_rate:
+                token = rng.choice(("do()", "don't()"))
+            elif roll < 0.3:
+                token = rng.choice(words)
+            else:
+                token = rng.choice(noise)
+            chunk.append(token)
+            length += len(token)
+        yield "".join(chunk) + "\n"
+
+
+@generator(4)
+def word_search(rng: random.Random, width: int = 140, height: int = 140) -> Iterator[str]:
+    """
+    Grid of `X`, `M`, `A` and `S` letters
+    """
+    for _ in range(height):
+        yield "".join(rng.choices("XMAS", k=width)) + "\n"
+
+
+@generator(5)
+def page_ordering(
+    rng: random.Random,
+    pages: int = 49,
+    updates: int = 200,
+    min_length: int = 5,
+    max_length: int = 23,
+    ordered: float = 0.5,
+) -> Iterator[str]:
+    """
+    Ordering rules `X|Y` for every pair of the pages, then updates (comma-separated pages)
+
+    Pages are two-digit numbers, so there are at most 90 of them. About `ordered` of the updates
+    are already in the right order.
+    """
+    order = rng.sample(range(10, 100), pages)
+    for i, left in enumerate(order):
+        for right in order[i + 1 :]:
+            yield f"{left}|{right}\n"
+    yield "\n"
+    for _ in range(updates):
+        length = rng.randint(min_length, min(max_length, pages))
+        length -= 1 - length % 2  # odd, it has a middle page
+        update = rng.sample(order, length)
+        if rng.random() < ordered:
+            update.sort(key=order.index)
+        yield ",".join(map(str, update)) + "\n"
+
+
+@generator(6)
+def guard_map(
+    rng: random.Random, width: int = 130, height: int = 130, density: float = 0.05
+) -> Iterator[str]:
+    """
+    Lab map with obstacles `#` and the guard `^`, the guard always leaves the map
+
+    The map is kept in memory (1 byte per cell) to check the guard's patrol does not loop.
+    """
+    while True:
+        cells = bytearray(ord("#") if rng.random() < density else ord(".") for _ in range(width * height))
+        start = rng.randrange(width * height)
+        cells[start] = ord("^")
+        if _guard_leaves(cells, width, height, start):
+            break
+    for y in range(height):
+        yield cells[y * width : (y + 1) * width].decode() + "\n"
+
+
+def _guard_leaves(cells: bytearray, width: int, height: int, start: int) -> bool:
+    """
+    Walk the guard (up, right, down, left) and detect a loop by visited (cell, direction) bits
+    """
+    seen = bytearray(width * height)
+    x, y, direction = start % width, start // width, 0
+    moves = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+    while True:
+        if seen[y * width + x] & (1 << direction):
+            return False
+        seen[y * width + x] |= 1 << direction
+        dx, dy = moves[direction]
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < width and 0 <= ny < height):
+            return True
+        if cells[ny * width + nx] == ord("#"):
+            direction = (direction + 1) % 4
+        else:
+            x, y = nx, ny
+
+
+@generator(7)
+def equations(
+    rng: random.Random,
+    lines: int = 850,
+    min_numbers: int = 3,
+    max_numbers: int = 12,
+    solvable: float = 0.5,
+    max_value: int = 10**15,
+) -> Iterator[str]:
+    """
+    Calibration equations `test: n1 n2 ...`, about `solvable` of them can be solved with `+`, `*` and `||`
+
+    An operator that would take the test value over `max_value` (the puzzle ones have up to 15
+    digits) is replaced by `+`.
+    """
+    for _ in range(lines):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(min_numbers, max_numbers))]
+        value = numbers[0]
+        for number in numbers[1:]:
+            match rng.randrange(3):
+                case 1 if value * number <= max_value:
+                    value *= number
+                case 2 if value * 10 ** len(str(number)) + number <= max_value:
+                    value = int(f"{value}{number}")
+                case _:
+                    value += number
+        if rng.random() >= solvable:
+            value += rng.randint(1, 9)
+        yield f"{value}: {' '.join(map(str, numbers))}\n"
+
+
+@generator(8)
+def antenna_map(
+    rng: random.Random, width: int = 50, height: int = 50, frequencies: int = 40, antennas: int = 4
+) -> Iterator[str]:
+    """
+    Map of antennas, `frequencies` distinct characters with `antennas` of each on the map
+
+    The antenna positions are kept in memory, the rest of the map is streamed.
+    """
+    symbols = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"[:frequencies]
+    positions = rng.sample(range(width * height), min(width * height, len(symbols) * antennas))
+    placed = {position: symbols[i % len(symbols)] for i, position in enumerate(positions)}
+    for y in range(height):
+        yield "".join(placed.get(y * width + x, ".") for x in range(width)) + "\n"
+
+
+@generator(9)
+def disk_map(rng: random.Random, length: int = 19999) -> Iterator[str]:
+    """
+    Dense disk map, digits alternate between a file length (1..9) and a free space length (0..9)
+    """
+    for start in range(0, length, CHUNK_SIZE):
+        # Chunks have an even size, so every chunk starts with a file
+        pairs = (min(CHUNK_SIZE, length - start) + 1) // 2
+        files = rng.choices("123456789", k=pairs)
+        spaces = rng.choices("0123456789", k=pairs)
+        chunk = "".join(file + space for file, space in zip(files, spaces))
+        yield chunk[: length - start]
+    yield "\n"
+
+
+@generator(10)
+def topographic_map(rng: random.Random, width: int = 52, height: int = 52) -> Iterator[str]:
+    """
+    Height map (0..9) with smooth slopes, every cell differs by at most 1 from its left or upper neighbour
+    """
+    previous = [rng.randint(0, 9) for _ in range(width)]
+    for _ in range(height):
+        row: list[int] = []
+        for x in range(width):
+            base = row[-1] if row and rng.random() < 0.5 else previous[x]
+            row.append(min(9, max(0, base + rng.choice((-1, 1)))))
+        yield "".join(map(str, row)) + "\n"
+        previous = row
+
+
+@generator(11)
+def stones(rng: random.Random, count: int = 8, max_value: int = 10_000_000) -> Iterator[str]:
+    """
+    A single line of numbers engraved into the stones
+    """
+    yield " ".join(str(rng.randint(0, max_value)) for _ in range(count)) + "\n"
+
+
+@generator(12)
+def garden_plots(
+    rng: random.Random, width: int = 140, height: int = 140, plants: int = 26, spread: float = 0.9
+) -> Iterator[str]:
+    """
+    Map of garden plots, each cell copies its left or upper neighbour with probability `spread`
+    """
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"[:plants]
+    previous = rng.choices(letters, k=width)
+    for _ in range(height):
+        row: list[str] = []
+        for x in range(width):
+            if rng.random() < spread:
+                row.append(row[-1] if row and rng.random() < 0.5 else previous[x])
+            else:
+                row.append(rng.choice(letters))
+        yield "".join(row) + "\n"
+        previous = row
+
+
+@generator(13)
+def claw_machines(rng: random.Random, count: int = 320, winnable: float = 0.5) -> Iterator[str]:
+    """
+    Claw machines, about `winnable` of them have a prize reachable by button presses
+    """
+    for i in range(count):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by != ay * bx:  # The buttons must not be parallel
+                break
+        a, b = rng.randint(1, 100), rng.randint(1, 100)
+        px, py = a * ax + b * bx, a * ay + b * by
+        if rng.random() >= winnable:
+            px += rng.randint(1, 9)
+        separator = "\n" if i else ""
+        yield f"{separator}Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}\n"
+
+
+@generator(14)
+def robots(rng: random.Random, count: int = 500, width: int = 101, height: int = 103) -> Iterator[str]:
+    """
+    Robots with positions and velocities, the solution expects its `WIDTH` and `HEIGHT`
+
+    Random robots never draw the easter egg, so part 2 has no answer for generated inputs.
+    """
+    for _ in range(count):
+        px, py = rng.randrange(width), rng.randrange(height)
+        vx, vy = rng.randint(-width + 1, width - 1), rng.randint(-height + 1, height - 1)
+        yield f"p={px},{py} v={vx},{vy}\n"
+
+
+@generator(15)
+def warehouse(
+    rng: random.Random,
+    width: int = 50,
+    height: int = 50,
+    boxes: float = 0.3,
+    walls: float = 0.05,
+    moves: int = 20000,
+) -> Iterator[str]:
+    """
+    Warehouse map surrounded by walls with boxes `O` and the robot `@`, then the robot moves
+    """
+    robot = (rng.randrange(1, width - 1), rng.randrange(1, height - 1))
+    yield "#" * width + "\n"
+    for y in range(1, height - 1):
+        row = ["#"]
+        for x in range(1, width - 1):
+            roll = rng.random()
+            if (x, y) == robot:
+                row.append("@")
+            elif roll < walls:
+                row.append("#")
+            elif roll < walls + boxes:
+                row.append("O")
+            else:
+                row.append(".")
+        yield "".join(row) + "#\n"
+    yield "#" * width + "\n\n"
+    for start in range(0, moves, 1000):
+        yield "".join(rng.choices("^>v<", k=min(1000, moves - start))) + "\n"
+
+
+@generator(16)
+def reindeer_maze(
+    rng: random.Random, width: int = 141, height: int = 141, loops: float = 0.05
+) -> Iterator[str]:
+    """
+    Maze with `S` in the bottom-left and `E` in the top-right corner, see `_maze`
+    """
+    yield from _maze(rng, width, height, loops)
+
+
+@generator(17)
+def chronospatial_program(rng: random.Random, a_bits: int = 48) -> Iterator[str]:
+    """
+    Registers and a program of the puzzle's shape: `A` is shifted by 3 bits per output
+
+    Part 2 only has a solution for some of the generated programs.
+    """
+    k1, k2 = rng.randrange(8), rng.randrange(8)
+    program = [2, 4, 1, k1, 7, 5, 4, 0, 1, k2, 0, 3, 5, 5, 3, 0]
+    yield f"Register A: {rng.getrandbits(a_bits)}\nRegister B: 0\nRegister C: 0\n\n"
+    yield f"Program: {','.join(map(str, program))}\n"
+
+
+@generator(18)
+def falling_bytes(rng: random.Random, width: int = 71, height: int = 71, count: int = 3450) -> Iterator[str]:
+    """
+    Unique positions `X,Y` of the falling bytes, never the start (top-left) or the exit (bottom-right)
+
+    The solution expects its `WIDTH` and `HEIGHT` (size - 1).
+    """
+    cells = width * height
+    for position in rng.sample(range(1, cells - 1), min(count, cells - 2)):
+        yield f"{position % width},{position // width}\n"
+
+
+@generator(19)
+def towel_patterns(
+    rng: random.Random,
+    towels: int = 450,
+    max_towel_length: int = 8,
+    patterns: int = 400,
+    min_length: int = 40,
+    max_length: int = 60,
+    formable: float = 0.7,
+) -> Iterator[str]:
+    """
+    Available towels (stripes of `wubrg` colors), then desired patterns
+
+    About `formable` of the patterns are concatenations of the towels, the rest are random stripes.
+    """
+    colors = "wubrg"
+    available: set[str] = set()
+    while len(available) < min(towels, 5**max_towel_length):
+        available.add("".join(rng.choices(colors, k=rng.randint(1, max_towel_length))))
+    ordered = sorted(available)
+    yield ", ".join(ordered) + "\n\n"
+    for _ in range(patterns):
+        length = rng.randint(min_length, max_length)
+        if rng.random() < formable:
+            pattern = ""
+            while len(pattern) < length:
+                pattern += rng.choice(ordered)
+        else:
+            pattern = "".join(rng.choices(colors, k=length))
+        yield pattern + "\n"
+
+
+@generator(20)
+def racetrack(rng: random.Random, width: int = 141, height: int = 141, loops: float = 0.0) -> Iterator[str]:
+    """
+    Racetrack with `S` in the bottom-left and `E` in the top-right corner, see `_maze`
+    """
+    yield from _maze(rng, width, height, loops)
+
+
+def _maze(rng: random.Random, width: int, height: int, loops: float) -> Iterator[str]:
+    """
+    Maze of corridors generated row by row by the binary tree algorithm
+
+    Every cell (odd coordinates) opens the wall to the north or to the east, which connects all
+    cells into a tree. With `loops` > 0 additional walls are opened to create alternative paths.
+    Width and height are rounded down to odd numbers.
+    """
+    columns, rows = (width - 1) // 2, (height - 1) // 2
+    for row in range(rows):
+        north, east = ["#"] * (2 * columns + 1), ["#"] * (2 * columns + 1)
+        for column in range(columns):
+            x = 2 * column + 1
+            east[x] = "."
+            top, right = row == 0, column == columns - 1
+            if top and right:
+                continue
+            if top or (not right and rng.random() < 0.5):
+                east[x + 1] = "."
+            else:
+                north[x] = "."
+            if not top and rng.random() < loops:
+                north[x] = "."
+            if not right and rng.random() < loops:
+                east[x + 1] = "."
+        if row == 0:
+            east[2 * columns - 1] = "E"
+        if row == rows - 1:
+            east[1] = "S"
+        yield "".join(north) + "\n"
+        yield "".join(east) + "\n"
+    yield "#" * (2 * columns + 1) + "\n"
+
+
+def generate(day: int, output: TextIO, seed: int = 0, **params):
+    """
+    Write a generated input of the day
+    :param day: Day of the input format
+    :param output: Text file to stream the input into
+    :param seed: Seed of the random generator
+    :param params: Size parameters of the day generator
+    """
+    rng = random.Random(seed)
+    for chunk in GENERATORS[day](rng, **params):
+        output.write(chunk)
+
+
+def parse_param(param: str) -> tuple[str, int | float]:
+    name, _, value = param.partition("=")
+    try:
+        return name, int(value)
+    except ValueError:
+        return name, float(value)
+
+
+def describe() -> str:
+    lines = []
+    for day, function in sorted(GENERATORS.items()):
+        params = list(inspect.signature(function).parameters.values())[1:]
+        signature = ", ".join(f"{p.name}={p.default}" for p in params)
+        lines.append(f"{day:>3} {function.__name__:<24} {signature}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("day", type=int, nargs="?", help="Day of the input format")
+    parser.add_argument("-o", "--output", type=Path, help="Output file (default: stdout)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "-p", "--param", action="append", default=[], type=parse_param, help="Size parameter as name=value"
+    )
+    parser.add_argument("--list", action="store_true", help="List generators and their parameters")
+    args = parser.parse_args()
+
+    if args.list or args.day is None:
+        print(describe())
+        return
+    if args.day not in GENERATORS:
+        parser.error(f"No generator for day {args.day}")
+
+    params = dict(args.param)
+    if args.output is None:
+        generate(args.day, sys.stdout, args.seed, **params)
+    else:
+        with open(args.output, "w", buffering=CHUNK_SIZE) as output:
+            generate(args.day, output, args.seed, **params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compact 2D grid of single-byte cells shared by the grid days.
+
+The cells are stored in one flat `bytearray` row by row. The grid is surrounded by `padding`
+cells of the `border` value, so a step of up to `padding` cells in any direction never leaves
+the buffer and the solvers can detect the edge by the cell value instead of bounds checks.
+
+Positions are plain integer indices into the buffer, a step in a direction is an addition of
+the precomputed offset:
+
+    grid = ByteGrid.from_lines(["#..", ".S."])
+    start = grid.find("S")
+    for offset in grid.directions:
+        if grid[start + offset] == ord("."):
+            ...
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+
+def to_byte(value: str | int) -> int:
+    """
+    Byte value of a single character
+    """
+    return ord(value) if isinstance(value, str) else value
+
+
+class ByteGrid:
+    """
+    Grid of `width` x `height` byte cells with a border of `padding` cells around
+    """
+
+    def __init__(
+        self, width: int, height: int, fill: str | int = ".", border: str | int = "#", padding: int = 1
+    ):
+        """
+        :param width: Number of columns
+        :param height: Number of rows
+        :param fill: Initial value of the cells
+        :param border: Value of the cells around the grid
+        :param padding: Width of the border, the longest step without bounds checks
+        """
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.border = to_byte(border)
+        self.cells = bytearray([self.border]) * (self.stride * (height + 2 * padding))
+        row = bytes([to_byte(fill)]) * width
+        for y in range(height):
+            start = self.index(0, y)
+            self.cells[start : start + width] = row
+
+        # Offsets of the neighbours: up, right, down, left and up-left, up-right, down-right, down-left
+        self.directions = (-self.stride, 1, self.stride, -1)
+        self.diagonals = (-self.stride - 1, -self.stride + 1, self.stride + 1, self.stride - 1)
+        self.neighbors8 = self.directions + self.diagonals
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str | bytes], border: str | int = "#", padding: int = 1) -> ByteGrid:
+        """
+        Create the grid from its text rows, all rows must be of the same length
+        :raises ValueError: If a row is shorter or longer than the first one
+        """
+        rows = [line.encode() if isinstance(line, str) else line for line in lines]
+        grid = cls(len(rows[0]) if rows else 0, len(rows), border=border, padding=padding)
+        for y, row in enumerate(rows):
+            # A slice assignment of another length would resize the buffer and shift the next rows
+            if len(row) != grid.width:
+                raise ValueError(f"Row {y} has {len(row)} cells, expected {grid.width}")
+            start = grid.index(0, y)
+            grid.cells[start : start + grid.width] = row
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        """
+        Index of the cell in column `x` and row `y`
+        """
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coords(self, index: int) -> tuple[int, int]:
+        """
+        Column and row of the cell at the index
+        """
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        Check if the column and row are inside the grid (not in the border)
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: str | int):
+        self.cells[index] = to_byte(value)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def positions(self) -> Iterator[int]:
+        """
+        Indices of all cells inside the grid, row by row
+        """
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, value: str | int) -> int:
+        """
+        Index of the first cell with the value
+        :raises ValueError: If there is no such cell
+        """
+        return self.cells.index(to_byte(value))
+
+    def find_all(self, value: str | int) -> Iterator[int]:
+        """
+        Indices of all cells with the value
+        """
+        value = to_byte(value)
+        index = self.cells.find(value)
+        while index != -1:
+            yield index
+            index = self.cells.find(value, index + 1)
+
+    def count(self, value: str | int) -> int:
+        """
+        Number of cells with the value (the border is counted only when asked for the border value)
+        """
+        return self.cells.count(to_byte(value))
+
+    def rows(self) -> Iterator[memoryview]:
+        """
+        Views of the rows without the border
+        """
+        view = memoryview(self.cells)
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield view[start : start + self.width]
+
+    def copy(self) -> ByteGrid:
+        grid = ByteGrid.__new__(ByteGrid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = self.cells.copy()
+        return grid
+
+    def __str__(self) -> str:
+        return "\n".join(bytes(row).decode() for row in self.rows())
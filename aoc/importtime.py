@@ -0,0 +1,118 @@
+"""
+Report how long it takes to import each day, like `python -X importtime` per day.
+
+Usage:
+    python -m aoc.importtime                # all days
+    python -m aoc.importtime 16 18 -n 5     # selected days with their 5 slowest imports
+    python -m aoc.importtime --budget 20    # exit with status 1 if a day takes over 20 ms
+
+Every day is imported in a fresh interpreter started with `-X importtime`, so the numbers are
+cold-start times, the imports done by the interpreter startup itself are not counted. `Imports`
+is the time spent importing other modules (standard library and `aoc`), `Body` the rest of the
+module body, e.g. compiling regexes or building tables at the top level.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from aoc.days import ROOT, Day, discover
+
+START, END = "-- load --", "-- loaded"
+
+# Runs in the child interpreter: import the script given as the argument and report the time
+LOADER = f"""
+import importlib.util, sys, time
+path = sys.argv[1]
+sys.stderr.write("{START}\\n")
+start = time.perf_counter_ns()
+spec = importlib.util.spec_from_file_location("day", path)
+module = sys.modules["day"] = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+sys.stderr.write(f"{END} {{(time.perf_counter_ns() - start) // 1000}}\\n")
+"""
+
+
+@dataclass
+class ImportTime:
+    day: int
+    total: int  # microseconds
+    imports: list[tuple[str, int]]  # (module, cumulative microseconds) of the top-level imports
+
+    @property
+    def imports_total(self) -> int:
+        return sum(cumulative for _module, cumulative in self.imports)
+
+
+def parse_importtime(output: str) -> tuple[int, list[tuple[str, int]]]:
+    """
+    Total load time and the top-level imports from the `-X importtime` output of the loader
+    """
+    lines = output.splitlines()
+    lines = lines[lines.index(START) + 1 :]
+    imports, total = [], 0
+    for line in lines:
+        if line.startswith(END):
+            total = int(line.split()[-1])
+            break
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit() and not name.startswith("   "):
+            # Top-level import, the nested ones are indented by two more spaces
+            imports.append((name.strip(), int(cumulative)))
+    return total, imports
+
+
+def measure(day: Day) -> ImportTime:
+    """
+    Import the day in a fresh interpreter and measure the import times
+    """
+    path = os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": path}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOADER, str(day.script)],
+        cwd=day.directory,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, imports = parse_importtime(process.stderr)
+    return ImportTime(day.number, total, imports)
+
+
+def format_time(result: ImportTime, top: int) -> str:
+    total, imports = result.total / 1000, result.imports_total / 1000
+    lines = [f"{result.day:>3d} {total:>9.1f} {imports:>9.1f} {total - imports:>9.1f}"]
+    for module, cumulative in sorted(result.imports, key=lambda item: -item[1])[:top]:
+        lines.append(f"{'':>3} {'':>9} {cumulative / 1000:>9.1f}   {module}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", type=int, help="Days to measure (default: all)")
+    parser.add_argument("-n", "--top", type=int, default=3, help="Slowest imports per day (default: 3)")
+    parser.add_argument("--budget", type=float, help="Import time budget of a day in milliseconds")
+    args = parser.parse_args()
+
+    days = [day for day in discover() if not args.days or day.number in args.days]
+    print(f"{'Day':>3} {'Total ms':>9} {'Imports':>9} {'Body':>9}")
+    over_budget = []
+    for day in days:
+        result = measure(day)
+        print(format_time(result, args.top), flush=True)
+        if args.budget is not None and result.total > args.budget * 1000:
+            over_budget.append(day.name)
+    if over_budget:
+        print(f"\nOver the budget of {args.budget} ms: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Opt-in instrumentation of the solutions: operation counters, phase timing and profiling.
+
+Usage:
+    python -m aoc.instrument 6                          # counters and phase times of day 6
+    python -m aoc.instrument 16 --pstats 16.pstats      # cProfile stats (pstats, snakeviz, ...)
+    python -m aoc.instrument 20 --collapsed 20.folded   # sampled stacks for flamegraph.pl/speedscope
+    python -m aoc.instrument 9 --memory                 # peak memory and allocation sites per phase
+
+The solvers mark their hot spots with `@counted("name")` (calls of a function) or
+`count("name", n)` (outside of loops). Instrumentation is switched on by the `AOC_INSTRUMENT=1`
+environment variable, read when this module is imported, or by `enable()` before the solvers are
+loaded. When it is off `counted` returns the function itself and `count`/`phase` do nothing, so
+the marks cost nothing in the hot loops.
+
+Phases are the parts of the day and the parsing inside them: every `parse_*` / `read_*` /
+`get_input` function of the day is timed as `parse` while instrumented. Days with
+`parse_input()` are parsed once and the result is passed to both parts, as the runner does.
+
+The solvers import this module, so the profiling modules are only imported when used.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from types import FrameType, ModuleType
+
+ENABLED = os.environ.get("AOC_INSTRUMENT", "") not in ("", "0")
+
+COUNTERS: Counter[str] = Counter()
+PHASES: defaultdict[str, float] = defaultdict(float)  # phase -> seconds
+
+MEMORY = None  # `aoc.memory.MemoryProfiler` tracking the phases, set by `--memory`
+
+PARSERS = ("parse_", "read_", "get_input")  # Prefixes of the day functions timed as `parse`
+
+
+def enable():
+    """
+    Switch the instrumentation on, for modules imported from now on and for child processes
+    """
+    global ENABLED
+    ENABLED = True
+    os.environ["AOC_INSTRUMENT"] = "1"
+
+
+def reset():
+    COUNTERS.clear()
+    PHASES.clear()
+
+
+def counted[F: Callable](name: str) -> Callable[[F], F]:
+    """
+    Count the calls of the decorated function, the function is returned unchanged when disabled
+    """
+
+    def decorator(function: F) -> F:
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            COUNTERS[name] += 1
+            return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def count(name: str, n: int = 1):
+    """
+    Add `n` to the counter, keep it out of hot loops (use `counted` there)
+    """
+    if ENABLED:
+        COUNTERS[name] += n
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Add the wall time of the block to the phase
+    """
+    if not ENABLED:
+        yield
+        return
+    if MEMORY is not None:
+        MEMORY.enter(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASES[name] += time.perf_counter() - start
+        if MEMORY is not None:
+            MEMORY.exit(name)
+
+
+def timed[F: Callable](name: str) -> Callable[[F], F]:
+    """
+    Add the wall time of every call of the decorated function to the phase, for generator functions
+    the time spent in the generator
+    """
+
+    def decorator(function: F) -> F:
+        import inspect
+
+        if inspect.isgeneratorfunction(function):
+
+            @functools.wraps(function)
+            def generator(*args, **kwargs):
+                iterator = function(*args, **kwargs)
+                while True:
+                    with phase(name):
+                        try:
+                            item = next(iterator)
+                        except StopIteration:
+                            return
+                    yield item
+
+            return generator  # type: ignore[return-value]
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def time_parsers(module: ModuleType):
+    """
+    Time the input reading functions of the day module as the `parse` phase. The part functions
+    look the readers up in the module globals, so replacing them there is enough.
+    """
+    for name, value in vars(module).copy().items():
+        defined_here = getattr(value, "__module__", None) == module.__name__
+        if name.startswith(PARSERS) and callable(value) and defined_here:
+            setattr(module, name, timed("parse")(value))
+
+
+class StackSampler:
+    """
+    Sample the call stack of the current thread from a background thread, for flame graphs.
+    The samples are taken at most every `sys.getswitchinterval()` as the sampler needs the GIL.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        import threading
+
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> StackSampler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[";".join(reversed(list(self._frames(frame))))] += 1
+
+    @staticmethod
+    def _frames(frame: FrameType | None) -> Iterator[str]:
+        while frame is not None:
+            code = frame.f_code
+            yield f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            frame = frame.f_back
+
+    def write(self, path: str | os.PathLike):
+        """
+        Write the stacks in the collapsed format: `outer;inner;leaf count` per line
+        """
+        with open(path, "w") as file:
+            file.writelines(f"{stack} {samples}\n" for stack, samples in sorted(self.stacks.items()))
+
+
+def report() -> str:
+    lines = [f"{'Phase':<40} {'Wall':>10}"]
+    lines += [f"{name:<40} {seconds:>9.3f}s" for name, seconds in PHASES.items()]
+    if COUNTERS:
+        lines += ["", f"{'Counter':<40} {'Count':>10}"]
+        lines += [f"{name:<40} {value:>10,d}" for name, value in sorted(COUNTERS.items())]
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    import cProfile
+    import pstats
+    from contextlib import nullcontext
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("day", type=int, help="Day to run")
+    parser.add_argument("--part", choices=("part_one", "part_two"), help="Run only one part")
+    parser.add_argument("--pstats", type=Path, help="Profile with cProfile and write the stats to the file")
+    parser.add_argument("--top", type=int, default=20, help="Functions to print with --pstats (default: 20)")
+    parser.add_argument("--collapsed", type=Path, help="Write sampled stacks collapsed to the file")
+    parser.add_argument("--interval", type=float, default=0.001, help="Sampling interval in seconds")
+    parser.add_argument("--memory", action="store_true", help="Track peak memory and allocation sites")
+    parser.add_argument("--sites", type=int, default=10, help="Allocation sites per phase (default: 10)")
+    args = parser.parse_args()
+
+    # The day runs in its directory
+    pstats_path = args.pstats.resolve() if args.pstats else None
+    collapsed_path = args.collapsed.resolve() if args.collapsed else None
+
+    # Before loading the day, so the `counted` decorators take effect
+    enable()
+    from aoc.days import PARSER, discover, load, parts
+
+    days = {day.number: day for day in discover()}
+    if args.day not in days:
+        parser.error(f"Unknown day {args.day}")
+    day = days[args.day]
+    os.chdir(day.directory)
+    module = load(day)
+    time_parsers(module)
+    selected = [args.part] if args.part else parts(module)
+
+    global MEMORY
+    if args.memory:
+        from aoc.memory import MemoryProfiler
+
+        MEMORY = MemoryProfiler()
+
+    profiler = cProfile.Profile() if pstats_path else None
+    sampler = StackSampler(args.interval) if collapsed_path else None
+    with sampler or nullcontext(), MEMORY or nullcontext():
+        # The input shared by the parts, parsed within the `parse` phase
+        shared = (getattr(module, PARSER)(),) if hasattr(module, PARSER) else ()
+        for part in selected:
+            solve = getattr(module, part)
+            with phase(part):
+                if profiler:
+                    answer = profiler.runcall(solve, *shared)
+                else:
+                    answer = solve(*shared)
+            print(f"{part}: {answer}")
+
+    print()
+    print(report())
+    if MEMORY is not None:
+        print()
+        print(MEMORY.report(args.sites))
+    if profiler and pstats_path:
+        profiler.dump_stats(pstats_path)
+        print()
+        pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.top)
+    if sampler and collapsed_path:
+        sampler.write(collapsed_path)
+        print(f"\n{sum(sampler.stacks.values())} stack samples written to {collapsed_path}")
+
+
+if __name__ == "__main__":
+    # Run the imported module, the solvers count into its counters and not into `__main__`
+    from aoc import instrument
+
+    instrument.main()
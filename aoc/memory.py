@@ -0,0 +1,178 @@
+"""
+Peak memory of the instrumented phases, used by `python -m aoc.instrument DAY --memory`.
+
+For every phase (parse, part_one, part_two) it records:
+
+- the peak of the memory allocated by Python (`tracemalloc`)
+- the peak resident set size of the process, reset at the start of the phase where the kernel
+  allows it (Linux `/proc/self/clear_refs`), otherwise the peak of the process so far
+- the top allocation sites near the peak, compared to the start of the phase
+
+The structures that blow up are usually freed by the end of the phase, so a background thread
+polls the traced memory and takes a snapshot every time it grows by `growth` over the last
+snapshot of an open phase. The snapshots are taken geometrically, so only a few of them are needed
+even for huge peaks. Tracing every allocation is slow, allocation-heavy loops run up to tens of
+times slower.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import tracemalloc
+
+CLEAR_REFS = "/proc/self/clear_refs"
+STATUS = "/proc/self/status"
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak RSS of the process to the current RSS
+    :return: False if the platform does not support it
+    """
+    try:
+        with open(CLEAR_REFS, "w") as file:
+            file.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss() -> int:
+    """
+    Peak resident set size of the process in bytes
+    """
+    try:
+        with open(STATUS) as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    import sys
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+class PhaseMemory:
+    def __init__(self, name: str):
+        self.name = name
+        self.peak_traced = 0  # bytes
+        self.peak_rss = 0  # bytes
+        self.start: tracemalloc.Snapshot | None = None  # snapshot at the start of the current run
+        self.snapshot: tracemalloc.Snapshot | None = None  # snapshot closest to the peak
+        self.snapshot_start: tracemalloc.Snapshot | None = None  # start of the run of the snapshot
+        self.snapshot_size = 0  # traced memory when the snapshot was taken (or the phase started)
+
+    def begin(self, start: tracemalloc.Snapshot, traced: int):
+        self.start = start
+        self.snapshot_size = max(self.snapshot_size, traced)
+
+    def take(self, snapshot: tracemalloc.Snapshot, traced: int):
+        self.snapshot, self.snapshot_start, self.snapshot_size = snapshot, self.start, traced
+
+    def top_sites(self, top: int) -> list[tracemalloc.StatisticDiff]:
+        """
+        Allocation sites that grew the most from the start of the phase to the snapshot
+        """
+        if self.snapshot is None or self.snapshot_start is None:
+            return []
+        statistics = self.snapshot.compare_to(self.snapshot_start, "lineno")
+        return sorted((s for s in statistics if s.size_diff > 0), key=lambda s: -s.size_diff)[:top]
+
+
+class MemoryProfiler:
+    def __init__(self, interval: float = 0.05, growth: float = 1.25, frames: int = 1):
+        """
+        :param interval: Seconds between the checks of the traced memory
+        :param growth: Take a new snapshot when the traced memory grows by this factor
+        :param frames: Frames stored per allocation, more frames group the sites by their callers
+        """
+        self.interval = interval
+        self.growth = growth
+        self.frames = frames
+        self.phases: dict[str, PhaseMemory] = {}
+        self.rss_resettable = False
+        self._open: list[PhaseMemory] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def __enter__(self) -> MemoryProfiler:
+        tracemalloc.start(self.frames)
+        self.rss_resettable = reset_peak_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        )
+
+    def _fold_peaks(self):
+        """
+        Add the peaks since the last reset to all open phases and reset them, so the nested phases
+        measure their own peaks without losing the peaks of the outer ones
+        """
+        traced, rss = tracemalloc.get_traced_memory()[1], peak_rss()
+        for memory in self._open:
+            memory.peak_traced = max(memory.peak_traced, traced)
+            memory.peak_rss = max(memory.peak_rss, rss)
+        tracemalloc.reset_peak()
+        if self.rss_resettable:
+            reset_peak_rss()
+
+    def enter(self, name: str):
+        with self._lock:
+            self._fold_peaks()
+            # A repeated phase (e.g. parsing in both parts) keeps the peaks of all of its runs
+            memory = self.phases.setdefault(name, PhaseMemory(name))
+            memory.begin(self._snapshot(), tracemalloc.get_traced_memory()[0])
+            self._open.append(memory)
+
+    def exit(self, name: str):
+        with self._lock:
+            self._fold_peaks()
+            memory = self._open.pop()
+            assert memory.name == name, f"Phase {name} exited inside {memory.name}"
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            current = tracemalloc.get_traced_memory()[0]
+            with self._lock:
+                growing = [memory for memory in self._open if current > memory.snapshot_size * self.growth]
+                if not growing or not tracemalloc.is_tracing():
+                    continue
+                snapshot = self._snapshot()
+                for memory in growing:
+                    memory.take(snapshot, current)
+
+    def report(self, top: int = 10) -> str:
+        rss = "Peak RSS" if self.rss_resettable else "Peak RSS*"
+        lines = [f"{'Phase':<40} {'Peak traced':>12} {rss:>12}"]
+        for memory in self.phases.values():
+            traced, rss = format_size(memory.peak_traced), format_size(memory.peak_rss)
+            lines.append(f"{memory.name:<40} {traced} {rss}")
+        if not self.rss_resettable:
+            lines.append("* peak of the process so far, the platform can not reset it")
+        for memory in self.phases.values():
+            sites = memory.top_sites(top)
+            if not sites:
+                continue
+            lines += ["", f"Top allocation sites of {memory.name} near its peak:"]
+            for statistic in sites:
+                frame = statistic.traceback[0]
+                site = f"{os.path.relpath(frame.filename)}:{frame.lineno}"
+                lines.append(f"  {format_size(statistic.size_diff)} {statistic.count_diff:>10,d}  {site}")
+        return "\n".join(lines)
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:>8.2f} MiB"
@@ -0,0 +1,237 @@
+"""
+Integer tokenizer for the number-heavy inputs.
+
+The input file is memory-mapped and the integers of all records are split and converted at once
+into one flat `array("q")`, without a Python loop over the lines. Records (lines by default,
+paragraphs with `separator=b"\\n\\n"`) are kept apart by row offsets, so ragged records like the
+reports of day 2 or the equations of day 7 need no list of lists:
+
+    numbers = read_numbers("input.txt")
+    for report in numbers:  # memoryview of the record's values
+        ...
+    left, right = numbers.columns(2)
+
+Everything that is not a number is skipped, so `p=0,4 v=3,-3` or `Button A: X+94, Y+34` parse
+without any format specific code. Inputs with numbers over 64 bits (e.g. large day 7 equations)
+get a list of ints instead of the array. `Numbers.to_numpy()` returns zero-copy NumPy views of the
+buffers when NumPy is installed.
+
+Buffers of `VECTORIZED_BYTES` and more are scanned by NumPy when it is installed, over views of
+the (mapped) buffer in chunks of whole records, without copying the buffer and without a Python
+object per number. The puzzle inputs are smaller, they are parsed without importing NumPy.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from collections.abc import Iterator
+from functools import cache
+from itertools import accumulate
+
+SIGNED = rb"-?\d+"
+UNSIGNED = rb"\d+"
+VECTORIZED_BYTES = 1 << 20  # Buffers from this size are scanned by NumPy when it is installed
+CHUNK_BYTES = 1 << 16  # Bytes scanned by NumPy at once, so its temporary arrays stay small
+MAX_DIGITS = 18  # Longest number scanned by NumPy, any 18 digits fit into 64 bits
+
+
+class Numbers:
+    __slots__ = ("values", "offsets")
+
+    def __init__(self, values: array | list[int], offsets: array):
+        self.values = values  # all integers of the input, array("q") (a list if some exceed 64 bits)
+        self.offsets = offsets  # start of every record in `values`, followed by the total length
+
+    def __repr__(self):
+        return f"Numbers(values={self.values!r}, offsets={self.offsets!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Numbers) and (self.values, self.offsets) == (other.values, other.offsets)
+
+    def __len__(self) -> int:
+        """
+        Number of records
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> memoryview | list[int]:
+        """
+        Values of the record, a view into the `values` buffer (a list when the values are)
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("record index out of range")
+        index %= len(self)
+        return self._view()[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[memoryview | list[int]]:
+        view = self._view()
+        for start, end in zip(self.offsets, self.offsets[1:]):
+            yield view[start:end]
+
+    def _view(self) -> memoryview | list[int]:
+        return memoryview(self.values) if isinstance(self.values, array) else self.values
+
+    def columns(self, width: int) -> tuple[array | list[int], ...]:
+        """
+        Split records of `width` values into columns
+        :raises ValueError: If some record has a different number of values
+        """
+        if self.offsets != array("q", range(0, len(self.values) + 1, width)):
+            raise ValueError(f"All records must have {width} values")
+        return tuple(self.values[column::width] for column in range(width))
+
+    def to_numpy(self):
+        """
+        NumPy int64 views of the `values` and `offsets` buffers (no copy)
+        :raises ImportError: If NumPy is not installed
+        :raises OverflowError: If some value does not fit into 64 bits
+        """
+        import numpy as np
+
+        if not isinstance(self.values, array):
+            raise OverflowError("Values over 64 bits can not be viewed as int64")
+        return np.frombuffer(self.values, dtype=np.int64), np.frombuffer(self.offsets, dtype=np.int64)
+
+
+def parse_numbers(
+    buffer: str | bytes | bytearray | mmap.mmap, separator: bytes = b"\n", signed: bool = True
+) -> Numbers:
+    """
+    Scan the integers of the buffer, records without any number are skipped. The values are an
+    `array("q")`, or a list of ints if some number does not fit into 64 bits.
+
+    Every byte that can not be part of a number becomes a space, then the numbers are split and
+    converted by `bytes.split` and `int` mapped in C, with no Python loop over the lines. A `-`
+    that is not a sign (e.g. `1-2`) fails the conversion, such buffers are scanned by a regular
+    expression instead.
+    :param buffer: Input text or bytes (or any buffer, e.g. a memory map)
+    :param separator: Bytes separating the records
+    :param signed: Read a `-` in front of the digits as the sign
+    """
+    if isinstance(buffer, str):
+        buffer = buffer.encode()
+    if len(buffer) >= VECTORIZED_BYTES:
+        try:
+            return _scan_numpy(buffer, separator, signed)
+        except ImportError:
+            pass  # NumPy is optional
+        except OverflowError:
+            pass  # Numbers longer than MAX_DIGITS, scanned below into a list
+    if not isinstance(buffer, bytes):
+        buffer = bytes(buffer)
+    cleaned = buffer.translate(_table(separator, signed))
+    try:
+        values = _values(cleaned.split())
+        # Numbers per record, the lists of a record are freed right away
+        counts = map(len, map(bytes.split, cleaned.split(separator)))
+    except ValueError:
+        findall = _compile(SIGNED if signed else UNSIGNED).findall
+        values = _values(findall(buffer))
+        counts = map(len, map(findall, buffer.split(separator)))
+    offsets = array("q", [0])
+    offsets.extend(accumulate(filter(None, counts)))
+    return Numbers(values, offsets)
+
+
+def _scan_numpy(buffer: bytes | bytearray | mmap.mmap, separator: bytes, signed: bool) -> Numbers:
+    """
+    `parse_numbers` by NumPy on views of the buffer, chunk by chunk of whole records. The numbers
+    are the runs of digits (with the `-` in front if signed), their values are summed up digit by
+    digit from the last one, one pass over all numbers of the chunk per digit.
+    :raises ImportError: If NumPy is not installed
+    :raises OverflowError: If a number has more than MAX_DIGITS digits
+    """
+    import numpy as np
+
+    values, offsets = array("q"), array("q", [0])
+    start, size = 0, len(buffer)
+    while start < size:
+        end = size
+        if start + CHUNK_BYTES < size:
+            # The chunk ends after a separator, the records are never split
+            end = buffer.rfind(separator, start, start + CHUNK_BYTES)
+            if end == -1:
+                end = buffer.find(separator, start + CHUNK_BYTES)
+            end = size if end == -1 else end + len(separator)
+        chunk = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+        start = end
+
+        digits = chunk - ord("0")  # The other bytes wrap around over 9
+        # Starts and ends of the runs of digits alternate
+        edges = np.flatnonzero(np.diff(digits < 10, prepend=False, append=False))
+        starts, ends = edges[::2], edges[1::2]
+        if not len(starts):
+            continue
+        lengths = ends - starts
+        longest = int(lengths.max())
+        if longest > MAX_DIGITS:
+            raise OverflowError(f"Number of {longest} digits")
+        number = digits[ends - 1].astype(np.int64)
+        shortest = int(lengths.min())
+        for position in range(1, longest):
+            digit = ends - 1 - position
+            scale = np.int64(10**position)
+            if position < shortest:
+                number += digits[digit] * scale
+            else:
+                long = lengths > position
+                number[long] += digits[digit[long]] * scale
+        if signed:
+            minus = np.flatnonzero(starts > 0)
+            minus = minus[chunk[starts[minus] - 1] == ord("-")]
+            number[minus] *= -1
+
+        # Record of every number: the separators before it, only the records with numbers are kept
+        if len(separator) == 1:
+            breaks = np.flatnonzero(chunk == separator[0])
+        else:
+            length = len(chunk) - len(separator) + 1
+            match = chunk[:length] == separator[0]
+            for shift, byte in enumerate(separator[1:], start=1):
+                match &= chunk[shift : shift + length] == byte
+            breaks = np.flatnonzero(match)
+        record = np.searchsorted(breaks, starts)
+        record_ends = np.append(np.flatnonzero(np.diff(record)) + 1, len(record)) + len(values)
+        values.frombytes(number.tobytes())
+        offsets.frombytes(record_ends.astype(np.int64).tobytes())
+    return Numbers(values, offsets)
+
+
+def _values(tokens: list[bytes]) -> array | list[int]:
+    """
+    :raises ValueError: If a token is not a number
+    """
+    try:
+        return array("q", map(int, tokens))
+    except OverflowError:
+        return list(map(int, tokens))
+
+
+@cache
+def _table(separator: bytes, signed: bool) -> bytes:
+    # Translation of the bytes that can not be part of a number (or of the separator) to spaces
+    table = bytearray(b" ") * 256
+    for byte in b"0123456789" + (b"-" if signed else b"") + separator:
+        table[byte] = byte
+    return bytes(table)
+
+
+@cache
+def _compile(pattern: bytes):
+    # Compiled on the first use, `re` is slow to import
+    import re
+
+    return re.compile(pattern)
+
+
+def read_numbers(path: str | os.PathLike, separator: bytes = b"\n", signed: bool = True) -> Numbers:
+    """
+    Memory-map the file and scan its integers, see `parse_numbers`
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return parse_numbers(b"", separator, signed)  # Empty files can not be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return parse_numbers(buffer, separator, signed)
@@ -0,0 +1,146 @@
+"""
+Progress, ETA and cooperative cancellation of the long loops of the solvers.
+
+The solvers wrap their long loops (e.g. trying every obstacle of day 6) in a tracker and mark
+every finished item:
+
+    with Progress("day06.check_obstacles", len(candidates)) as progress:
+        for candidate in candidates:
+            ...
+            progress.update()
+
+`update()` is where a loop can be stopped: it raises `Cancelled` once `cancel()` was called
+(e.g. from another thread or a signal handler) and `BudgetExceeded` once the time budget of the
+run is spent. The budget starts with `start()`, called by the runner before every part, or when
+this module is imported. When reporting is switched on, the trackers write the work done, the
+throughput and the ETA to stderr every `INTERVAL` seconds and when they finish.
+
+Both are configured by `configure()` or by the environment variables read on import, so they
+work for the days run on their own too:
+
+    AOC_PROGRESS=1 python python_06.py
+    AOC_TIME_BUDGET=5 python python_07.py     # raises BudgetExceeded after 5 s
+
+Without them a tracker only counts, an update costs a few attribute lookups.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+INTERVAL = 1.0  # Seconds between the reports of a tracker
+
+BUDGET = float(os.environ.get("AOC_TIME_BUDGET") or "inf")  # Seconds of a run
+REPORT = os.environ.get("AOC_PROGRESS", "") not in ("", "0")
+
+DEADLINE = time.perf_counter() + BUDGET
+CANCELLED = False
+
+
+class Cancelled(Exception):
+    """
+    The run was cancelled, raised by the trackers of the solvers
+    """
+
+
+class BudgetExceeded(Cancelled):
+    """
+    The run took longer than its time budget
+    """
+
+
+def configure(budget: float | None = None, report: bool = False):
+    """
+    :param budget: Seconds of every run started from now on, None for no limit
+    :param report: Write the progress of the trackers to stderr
+    """
+    global BUDGET, REPORT
+    BUDGET = float("inf") if budget is None else budget
+    REPORT = report
+    start()
+
+
+def start():
+    """
+    Start a new run: the time budget starts again and an earlier cancellation is forgotten
+    """
+    global DEADLINE, CANCELLED
+    DEADLINE = time.perf_counter() + BUDGET
+    CANCELLED = False
+
+
+def cancel():
+    """
+    Cancel the run, the next `update()` of a tracker raises `Cancelled`
+    """
+    global CANCELLED
+    CANCELLED = True
+
+
+class Progress:
+    __slots__ = ("name", "total", "done", "started", "next_report")
+
+    def __init__(self, name: str, total: int | None = None):
+        """
+        :param name: Name of the loop in the reports
+        :param total: Number of items of the loop, None if unknown (no ETA)
+        """
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+        self.next_report = self.started + INTERVAL
+
+    def __enter__(self) -> Progress:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if REPORT:
+            state = "done" if exc_type is None else f"stopped ({exc_type.__name__})"
+            sys.stderr.write(f"{self.format()} {state}\n")
+
+    def update(self, n: int = 1):
+        """
+        Mark `n` items as done
+        :raises Cancelled: If the run was cancelled
+        :raises BudgetExceeded: If the time budget of the run is spent
+        """
+        self.done += n
+        if CANCELLED:
+            raise Cancelled(f"{self.name} cancelled at {self.done}/{self.total}")
+        now = time.perf_counter()
+        if now > DEADLINE:
+            raise BudgetExceeded(f"{self.name} over the budget of {BUDGET:g}s at {self.done}/{self.total}")
+        if REPORT and now >= self.next_report:
+            self.next_report = now + INTERVAL
+            sys.stderr.write(f"{self.format()}\n")
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """
+        Items per second
+        """
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """
+        Seconds to finish all items at the current rate, None when unknown
+        """
+        rate = self.rate
+        if self.total is None or not rate:
+            return None
+        return max(0, self.total - self.done) / rate
+
+    def format(self) -> str:
+        done = f"{self.done}/{self.total} ({self.done / self.total:.0%})" if self.total else f"{self.done}"
+        eta = self.eta
+        remaining = f" ETA {eta:.1f}s" if eta is not None and self.done < (self.total or 0) else ""
+        return f"{self.name}: {done} in {self.elapsed:.1f}s, {self.rate:,.1f}/s{remaining}"
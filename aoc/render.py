@@ -0,0 +1,157 @@
+"""
+Frames of the simulations, rendered in one pass over the grid and streamed to a file.
+
+Usage:
+    python -m aoc.render 6 -o patrol.cast               # asciinema cast of the whole simulation
+    python -m aoc.render 14 -o robots.pbm --every 101   # every 101st frame as PBM images
+    python -m aoc.render 15 -o warehouse.txt -n 100     # the first 100 frames as text
+
+A frame is the text of the grid without its border, rows separated by newlines, as bytes:
+
+- `frame(grid, marks)` copies the cells of a `ByteGrid` (only when there are marks to draw over
+  them) and slices out its rows
+- `plot(width, height, points)` draws points on an empty grid, e.g. robots without a map
+
+The days with a simulation expose `frames(data=None)` yielding a frame per step, recorded by the
+command above. The writer is picked by the output suffix:
+
+- `.txt`: the frames separated by a blank line
+- `.pbm`: binary PBM (P4) images, one per frame in the same file (a multi-image netpbm stream),
+  the background cells (`.` and space) white, the others black
+- `.cast`: asciinema cast (v2), played at `--fps` frames per second
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from io import BufferedWriter
+
+from aoc.grid import ByteGrid, to_byte
+
+BACKGROUND = b". "  # Cells drawn white in PBM images
+BUFFER_SIZE = 1 << 20
+
+
+def frame(grid: ByteGrid, marks: Iterable[tuple[int, str | int]] = ()) -> bytes:
+    """
+    Rows of the grid without the border, joined by newlines
+    :param grid: Grid to render, not modified
+    :param marks: (position, value) pairs drawn over the cells, e.g. a guard
+    """
+    cells = grid.cells
+    marks = list(marks)
+    if marks:
+        cells = cells.copy()
+        for position, value in marks:
+            cells[position] = to_byte(value)
+    start, width, stride = grid.index(0, 0), grid.width, grid.stride
+    rows = range(start, start + grid.height * stride, stride)
+    return b"\n".join([cells[row : row + width] for row in rows])
+
+
+def plot(width: int, height: int, points: Iterable[int], on: str = "#", off: str = ".") -> bytes:
+    """
+    Points drawn on an empty grid, joined by newlines like `frame`
+    :param points: Indices `y * width + x` of the points
+    """
+    cells = bytearray(off.encode()) * (width * height)
+    value = to_byte(on)
+    for point in points:
+        cells[point] = value
+    return b"\n".join([cells[row : row + width] for row in range(0, width * height, width)])
+
+
+class TextWriter:
+    def __init__(self, file: BufferedWriter):
+        self.file = file
+
+    def write(self, frame: bytes):
+        self.file.write(frame)
+        self.file.write(b"\n\n")
+
+
+class PbmWriter:
+    def __init__(self, file: BufferedWriter, background: bytes = BACKGROUND):
+        """
+        :param background: Cell values drawn white, all others are black
+        """
+        self.file = file
+        self.table = bytearray(b"1") * 256
+        for value in background:
+            self.table[value] = ord("0")
+
+    def write(self, frame: bytes):
+        rows = frame.split(b"\n")
+        width = len(rows[0])
+        padding = b"0" * (-width % 8)  # Rows of P4 images are padded to whole bytes
+        row_bytes = (width + 7) // 8
+        self.file.write(f"P4\n{width} {len(rows)}\n".encode())
+        for row in rows:
+            bits = row.translate(self.table) + padding
+            self.file.write(int(bits, 2).to_bytes(row_bytes) if row_bytes else b"")
+
+
+class CastWriter:
+    def __init__(self, file: BufferedWriter, fps: float = 30.0):
+        self.file = file
+        self.fps = fps
+        self.frames = 0
+
+    def write(self, frame: bytes):
+        import json
+
+        if not self.frames:
+            rows = frame.split(b"\n")
+            header = {"version": 2, "width": len(rows[0]), "height": len(rows)}
+            self.file.write(json.dumps(header).encode() + b"\n")
+        # Cursor home before every frame, clearing the screen only once avoids flickering
+        screen = ("\x1b[2J" if not self.frames else "") + "\x1b[H" + frame.decode().replace("\n", "\r\n")
+        self.file.write(json.dumps([round(self.frames / self.fps, 6), "o", screen]).encode() + b"\n")
+        self.frames += 1
+
+
+WRITERS = {".txt": TextWriter, ".pbm": PbmWriter, ".cast": CastWriter}
+
+
+def main():
+    import argparse
+    import os
+    from itertools import islice
+    from pathlib import Path
+
+    from aoc.days import discover, load
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("day", type=int, help="Day to record")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Output file (.txt, .pbm or .cast)")
+    parser.add_argument("--every", type=int, default=1, help="Record every n-th frame (default: 1)")
+    parser.add_argument("-n", "--frames", type=int, help="Stop after recording this many frames")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frames per second of a cast (default: 30)")
+    args = parser.parse_args()
+
+    if args.output.suffix not in WRITERS:
+        parser.error(f"Unknown output format {args.output.suffix!r}, use one of {', '.join(WRITERS)}")
+    days = {day.number: day for day in discover()}
+    if args.day not in days:
+        parser.error(f"Unknown day {args.day}")
+    day = days[args.day]
+    module = load(day)
+    if not hasattr(module, "frames"):
+        parser.error(f"Day {args.day} has no simulation to record")
+
+    # The day reads its input relative to its directory
+    output = args.output.resolve()
+    os.chdir(day.directory)
+    frames = islice(module.frames(), 0, None, args.every)
+    with open(output, "wb", buffering=BUFFER_SIZE) as file:
+        writer = CastWriter(file, args.fps) if output.suffix == ".cast" else WRITERS[output.suffix](file)
+        count = 0
+        for count, image in enumerate(islice(frames, args.frames), start=1):
+            writer.write(image)
+    print(f"{count} frames written to {output}")
+
+
+if __name__ == "__main__":
+    main()
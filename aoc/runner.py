@@ -0,0 +1,229 @@
+"""
+Run the day solutions in parallel and report answers with per-part timing.
+
+Usage:
+    python -m aoc.runner            # all days
+    python -m aoc.runner 6 7 9      # selected days
+    python -m aoc.runner -j 1       # serially
+
+Each (day, part) pair is a separate job of a process pool sized to the number of cores.
+Jobs are scheduled longest-first using the timings recorded by the previous run, so the
+whole suite takes roughly as long as the slowest part. Days with `parse_input()` are parsed
+once by a separate job and the parsed input is sent to the jobs of both parts.
+
+Answers are cached by the content of the input and of the solver code (see `aoc.cache`), parts
+of unchanged days are not run again. `--no-cache` runs everything.
+
+A part that raises (or whose shared input can not be parsed) is reported with its error and no
+answer, neither cached nor timed, the other parts go on. `--budget SECONDS` gives every part a
+time budget: the long loops of the solvers check it (see `aoc.progress`) and a part over it is
+stopped and reported the same way. `--progress` makes those loops report their progress and ETA
+to stderr.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from aoc import progress
+from aoc.cache import ResultCache, cache_key
+from aoc.days import PARSER, ROOT, Day, declared_parser, declared_parts, discover, load
+
+TIMINGS_FILE = ROOT / ".aoc" / "timings.json"
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: str
+    answer: Any
+    wall: float  # seconds
+    cpu: float  # seconds
+    cached: bool = False  # answer and timing of an earlier run
+    error: str | None = None  # why the part failed or was stopped, no answer
+
+    @property
+    def key(self) -> str:
+        return f"{self.day:02d}/{self.part}"
+
+
+def parse_day(day: Day) -> Any:
+    """
+    Parse the input of the day in the current process, for the jobs of its parts
+    """
+    os.chdir(day.directory)
+    return getattr(load(day), PARSER)()
+
+
+def run_part(day: Day, part: str, parsed: Any = None) -> PartResult:
+    """
+    Run a single part of the day in the current process
+    :param day: Day to run
+    :param part: Name of the part function, e.g. `part_one`
+    :param parsed: Result of the day's `parse_input()`, None to let the part read the input
+    :return: Answer with wall and CPU time of the part (without parsing the shared input), no
+        answer but the error if the part was cancelled or over its time budget
+    """
+    # The solutions open their inputs relative to the working directory
+    os.chdir(day.directory)
+    solve = getattr(load(day), part)
+    answer, error = None, None
+    wall, cpu = time.perf_counter(), time.process_time()
+    progress.start()
+    try:
+        answer = solve() if parsed is None else solve(parsed)
+    except progress.Cancelled as cancelled:
+        error = str(cancelled)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return PartResult(day.number, part, answer, wall, cpu, error=error)
+
+
+def failed(job: tuple[Day, str], error: BaseException) -> PartResult:
+    """
+    Result of a part that raised (or whose shared input could not be parsed), without an answer
+    """
+    day, part = job
+    return PartResult(day.number, part, None, 0.0, 0.0, error=f"{type(error).__name__}: {error}")
+
+
+def read_timings(path: Path = TIMINGS_FILE) -> dict[str, float]:
+    """
+    Read wall times of the previous run, keyed by `NN/part`
+    """
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_timings(results: list[PartResult], path: Path = TIMINGS_FILE):
+    """
+    Store wall times of the run for the next longest-job-first scheduling, the stopped parts keep
+    their earlier timing
+    """
+    timings = read_timings(path)
+    timings.update({result.key: result.wall for result in results if result.error is None})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings, indent=2, sort_keys=True))
+
+
+def schedule(jobs: list[tuple[Day, str]], timings: dict[str, float]) -> list[tuple[Day, str]]:
+    """
+    Order jobs longest first. Jobs without a recorded timing go first, they might be slow.
+    """
+    return sorted(jobs, key=lambda job: -timings.get(f"{job[0].number:02d}/{job[1]}", float("inf")))
+
+
+def run(
+    days: list[Day],
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+    budget: float | None = None,
+    report: bool = False,
+) -> Iterator[PartResult]:
+    """
+    Run all parts of the days in a process pool and yield results as they finish
+    :param days: Days to run
+    :param workers: Number of worker processes, defaults to the number of cores
+    :param cache: Cache of the answers, cached parts are yielded first without running them
+    :param budget: Seconds every part may run, None for no limit
+    :param report: Report the progress of the long loops to stderr
+    """
+    jobs = []
+    keys: dict[tuple[Day, str], str | None] = {}
+    # The days are imported by the workers only
+    for day in days:
+        for part in declared_parts(day):
+            key = keys[day, part] = cache_key(day, part) if cache else None
+            entry = cache.get(key) if cache and key else None
+            if entry is not None:
+                yield PartResult(**{**entry, "cached": True})
+            else:
+                jobs.append((day, part))
+
+    jobs = schedule(jobs, read_timings())
+    # Days with more than one part to run parse their input first
+    counts = Counter(day for day, _part in jobs)
+    shared = {day for day, count in counts.items() if count > 1 and declared_parser(day)}
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), initializer=progress.configure, initargs=(budget, report)
+    ) as executor:
+        parsing: dict[Future, Day] = {executor.submit(parse_day, day): day for day in sorted(shared)}
+        running: dict[Future, tuple[Day, str]] = {
+            executor.submit(run_part, day, part): (day, part) for day, part in jobs if day not in shared
+        }
+        while parsing or running:
+            done, _pending = wait([*parsing, *running], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in parsing:
+                    day = parsing.pop(future)
+                    try:
+                        parsed = future.result()
+                    except Exception as error:
+                        # The parts of the day are reported failed, the other days go on
+                        for job in jobs:
+                            if job[0] == day:
+                                yield failed(job, error)
+                        continue
+                    for job in jobs:
+                        if job[0] == day:
+                            running[executor.submit(run_part, day, job[1], parsed)] = job
+                    continue
+                job = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    yield failed(job, error)
+                    continue
+                key = keys[job]
+                if cache and key and result.error is None:
+                    cache.put(key, asdict(result))
+                yield result
+
+
+def format_result(result: PartResult) -> str:
+    answer = f"{result.answer} (cached)" if result.cached else result.answer
+    if result.error is not None:
+        answer = f"failed: {result.error}"
+    return f"{result.day:>3d} {result.part:<9} {result.wall:>9.3f}s {result.cpu:>9.3f}s  {answer}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", type=int, help="Days to run (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: cores)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    parser.add_argument("--no-cache", action="store_true", help="Run all parts, ignore cached answers")
+    parser.add_argument("--budget", type=float, help="Stop the parts running longer (seconds)")
+    parser.add_argument("--progress", action="store_true", help="Report progress of the long loops")
+    args = parser.parse_args()
+
+    days = [day for day in discover() if not args.days or day.number in args.days]
+    if not args.json:
+        print(f"{'Day':>3} {'Part':<9} {'Wall':>10} {'CPU':>10}  Answer")
+
+    start = time.perf_counter()
+    results = []
+    cache = None if args.no_cache else ResultCache()
+    for result in run(days, args.workers, cache, args.budget, args.progress):
+        results.append(result)
+        print(json.dumps(asdict(result)) if args.json else format_result(result), flush=True)
+    elapsed = time.perf_counter() - start
+
+    write_timings(results)
+    if not args.json:
+        total = sum(result.wall for result in results)
+        print(f"Finished {len(results)} parts in {elapsed:.3f}s (sum of parts {total:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
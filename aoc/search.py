@@ -0,0 +1,229 @@
+"""
+Shortest paths over integer states, shared by the maze days.
+
+States are integers in `range(size)`, e.g. `ByteGrid` indices or packed `(position, direction)`
+states. The graph is given by callbacks: `neighbors(state)` yields the reachable states and
+`cost(state, neighbor)` the weight of the edge (unit weights when omitted). The algorithm is
+picked by the declared edge `weights`:
+
+- unit weights: breadth-first search with a deque
+- weights 0 and 1: 0-1 BFS with a double-ended deque
+- small integer weights (up to `DIAL_MAX_WEIGHT`): Dial's algorithm with a circular bucket queue
+- otherwise: Dijkstra's algorithm with a binary heap, A* when a `heuristic` is given
+
+The result holds the distance of every state (`INFINITY` when unreachable) and, when asked for,
+the predecessor DAG of all shortest paths.
+"""
+
+import heapq
+from array import array
+from collections import deque
+from collections.abc import Callable, Collection, Iterable
+
+from aoc import instrument
+
+INFINITY = 2**63 - 1  # Distance of unreachable states, the largest value of array("q")
+DIAL_MAX_WEIGHT = 1 << 12  # Largest edge weight for the bucket queue, there is one bucket per weight
+
+Neighbors = Callable[[int], Iterable[int]]
+Cost = Callable[[int, int], int]
+
+
+class SearchResult:
+    __slots__ = ("algorithm", "distances", "predecessors")
+
+    def __init__(self, algorithm: str, distances: array, predecessors: dict[int, list[int]] | None):
+        self.algorithm = algorithm
+        self.distances = distances  # state -> distance
+        self.predecessors = predecessors  # state -> previous states on the shortest paths
+
+    def __repr__(self):
+        reached = len(self.distances) - self.distances.count(INFINITY)
+        return f"SearchResult(algorithm={self.algorithm!r}, reached={reached})"
+
+    def distance(self, state: int) -> int | None:
+        """
+        Distance of the state, None if it is unreachable
+        """
+        distance = self.distances[state]
+        return None if distance == INFINITY else distance
+
+    def path_states(self, ends: Iterable[int]) -> set[int]:
+        """
+        All states on any shortest path to the end states, found by walking the predecessor DAG
+        """
+        if self.predecessors is None:
+            raise ValueError("Search was run without predecessors")
+        seen = set(ends)
+        queue = deque(seen)
+        while queue:
+            for previous in self.predecessors.get(queue.popleft(), ()):
+                if previous not in seen:
+                    seen.add(previous)
+                    queue.append(previous)
+        return seen
+
+
+def choose_algorithm(weights: Collection[int] | None, heuristic: Callable[[int], int] | None = None) -> str:
+    """
+    Pick the fastest algorithm for the edge weights
+    :param weights: All possible edge weights, None for unit weights
+    :param heuristic: A* heuristic, forces the heap-based search
+    """
+    if heuristic is not None:
+        return "astar"
+    if weights is None or set(weights) == {1}:
+        return "bfs"
+    if min(weights) < 0:
+        raise ValueError("Negative edge weights are not supported")
+    if set(weights) <= {0, 1}:
+        return "01bfs"
+    if all(isinstance(weight, int) for weight in weights) and max(weights) <= DIAL_MAX_WEIGHT:
+        return "dial"
+    return "dijkstra"
+
+
+def shortest_paths(
+    starts: Iterable[int],
+    neighbors: Neighbors,
+    size: int,
+    cost: Cost | None = None,
+    weights: Collection[int] | None = None,
+    heuristic: Callable[[int], int] | None = None,
+    target: int | None = None,
+    predecessors: bool = False,
+    algorithm: str | None = None,
+) -> SearchResult:
+    """
+    Find the shortest distances from the start states
+    :param starts: States with distance 0
+    :param neighbors: Callback yielding the states reachable from a state
+    :param size: Number of states, all states must be in `range(size)`
+    :param cost: Callback with the weight of an edge, None for unit weights
+    :param weights: All weights the `cost` can return, used to pick the algorithm
+    :param heuristic: Admissible estimate of the distance to the `target` (A*)
+    :param target: Stop once the distance of this state is final
+    :param predecessors: Collect the predecessor DAG of the shortest paths
+    :param algorithm: Force an algorithm (`bfs`, `01bfs`, `dial`, `dijkstra`, `astar`)
+    :return: Distances of all states, final for the states settled before the `target`
+    """
+    if cost is None and weights is None:
+        weights = (1,)
+    algorithm = algorithm or choose_algorithm(weights, heuristic)
+    # Expanded states and relaxed edges, the callbacks are returned as they are when not instrumented
+    neighbors = instrument.counted(f"search.{algorithm}.expanded")(neighbors)
+    if cost is not None:
+        cost = instrument.counted(f"search.{algorithm}.relaxed")(cost)
+    distances = array("q", [INFINITY]) * size
+    previous: dict[int, list[int]] | None = {} if predecessors else None
+    starts = list(starts)
+    for start in starts:
+        distances[start] = 0
+
+    match algorithm:
+        case "bfs":
+            _bfs(starts, neighbors, distances, previous, target)
+        case "01bfs":
+            _zero_one_bfs(starts, neighbors, _unit(cost), distances, previous, target)
+        case "dial":
+            _dial(starts, neighbors, _unit(cost), max(weights or (1,)), distances, previous, target)
+        case "dijkstra" | "astar":
+            _heap(starts, neighbors, _unit(cost), heuristic, distances, previous, target)
+        case _:
+            raise ValueError(f"Unknown algorithm {algorithm}")
+    if instrument.ENABLED:
+        instrument.count(f"search.{algorithm}.reached", sum(distance != INFINITY for distance in distances))
+    return SearchResult(algorithm, distances, previous)
+
+
+def _unit(cost: Cost | None) -> Cost:
+    return cost if cost is not None else lambda state, neighbor: 1
+
+
+def _bfs(starts, neighbors, distances, previous, target):
+    queue = deque(starts)
+    while queue:
+        state = queue.popleft()
+        if state == target:
+            return
+        distance = distances[state] + 1
+        for neighbor in neighbors(state):
+            if distances[neighbor] == INFINITY:
+                distances[neighbor] = distance
+                queue.append(neighbor)
+                if previous is not None:
+                    previous[neighbor] = [state]
+            elif previous is not None and distances[neighbor] == distance:
+                previous.setdefault(neighbor, []).append(state)
+
+
+def _zero_one_bfs(starts, neighbors, cost, distances, previous, target):
+    queue = deque((0, start) for start in starts)
+    while queue:
+        distance, state = queue.popleft()
+        if distance != distances[state]:
+            continue  # Already reached by a shorter path
+        if state == target:
+            return
+        for neighbor in neighbors(state):
+            weight = cost(state, neighbor)
+            new_distance = distance + weight
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                if weight:
+                    queue.append((new_distance, neighbor))
+                else:
+                    queue.appendleft((new_distance, neighbor))
+                if previous is not None:
+                    previous[neighbor] = [state]
+            elif previous is not None and new_distance == distances[neighbor]:
+                previous.setdefault(neighbor, []).append(state)
+
+
+def _dial(starts, neighbors, cost, max_weight, distances, previous, target):
+    # Pending states are never further than `max_weight` from the current distance
+    buckets: list[list[int]] = [[] for _ in range(max_weight + 1)]
+    buckets[0].extend(starts)
+    pending = len(starts)
+    distance = 0
+    while pending:
+        bucket = buckets[distance % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if distances[state] != distance:
+                continue  # Already reached by a shorter path
+            if state == target:
+                return
+            for neighbor in neighbors(state):
+                new_distance = distance + cost(state, neighbor)
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    buckets[new_distance % len(buckets)].append(neighbor)
+                    pending += 1
+                    if previous is not None:
+                        previous[neighbor] = [state]
+                elif previous is not None and new_distance == distances[neighbor]:
+                    previous.setdefault(neighbor, []).append(state)
+        distance += 1
+
+
+def _heap(starts, neighbors, cost, heuristic, distances, previous, target):
+    estimate = heuristic or (lambda state: 0)
+    queue = [(estimate(start), 0, start) for start in starts]
+    heapq.heapify(queue)
+    while queue:
+        _priority, distance, state = heapq.heappop(queue)
+        if distance != distances[state]:
+            continue  # Already reached by a shorter path
+        if state == target:
+            return
+        for neighbor in neighbors(state):
+            new_distance = distance + cost(state, neighbor)
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(queue, (new_distance + estimate(neighbor), new_distance, neighbor))
+                if previous is not None:
+                    previous[neighbor] = [state]
+            elif previous is not None and new_distance == distances[neighbor]:
+                previous.setdefault(neighbor, []).append(state)
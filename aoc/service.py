@@ -0,0 +1,376 @@
+"""
+Local solve service: answers (day, input) requests over a socket using a pool of worker processes.
+
+Usage:
+    python -m aoc.service                       # TCP on 127.0.0.1:8024
+    python -m aoc.service --unix /tmp/aoc.sock  # Unix socket
+    python -m aoc.service -j 4 --slow-workers 4 --timeout 30
+
+The protocol is JSON lines, one request per line, one response per line:
+
+    {"id": 1, "day": 14, "input": "p=0,4 v=3,-3\\n...", "params": {"width": 11, "height": 7}}
+    {"id": 1, "day": 14, "part_one": 12, "part_two": null, "cached": false, "latency": 0.0021, "error": null}
+
+    {"stats": true}
+    {"days": {"14": {"count": 1, "cached": 0, ...}}, "lanes": {...}}
+
+A connection can send many requests without waiting for the answers, the responses come in the
+order the requests finish, matched by `id`. `params` are passed to the day's `solve()`.
+
+The solvers run in two pools of worker processes (lanes): the days that took more than `SLOW`
+seconds in the last `aoc-run` (or were never timed) run in the slow lane, the rest in the fast
+lane, so a few day 6 requests never hold up day 1. Every lane takes at most `--queue` requests at
+once, the others wait for a place. A connection is read on while a lane is full, until `--queue`
+of its own requests wait for that lane (TCP backpressure), so its requests of the other lane go
+on. A request that does not finish within `--timeout` seconds (waiting included) gets a `timeout`
+error. Its solve gets the timeout as its time budget (see `aoc.progress`), the long loops of the
+solvers stop after it and free the place in the lane. A lane whose worker process died (e.g.
+killed for its memory) starts a new pool.
+
+Answers are memoized by the SHA-256 of the day, the input and the params (least recently used
+first out), and identical requests arriving while one is being solved wait for that one. The
+latency of every request is recorded in a histogram per day with power-of-two millisecond
+buckets, returned by the `stats` request.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from aoc import progress
+from aoc.days import Day, discover, load
+from aoc.runner import read_timings
+
+HOST = "127.0.0.1"
+PORT = 8024
+SLOW = 0.5  # Seconds of the recorded parts of a day to run it in the slow lane
+TIMEOUT = 60.0  # Seconds
+CACHE_ENTRIES = 1024
+MAX_REQUEST = 64 * 1024 * 1024  # Longest request line in bytes
+
+
+def solve_in_worker(day: Day, data: str, params: dict[str, Any], budget: float | None = None) -> list[Any]:
+    """
+    Solve the input in the worker process, the day is imported on its first request
+    :param budget: Seconds the long loops of the solver may run, None for no limit
+    :raises progress.BudgetExceeded: If the solve takes longer than its budget
+    """
+    progress.configure(budget)
+    return list(load(day).solve(data, **params))
+
+
+def request_key(day: Day, data: str, params: dict[str, Any]) -> str:
+    digest = hashlib.sha256(f"{day.name}\0{json.dumps(params, sort_keys=True)}\0".encode())
+    digest.update(data.encode())
+    return digest.hexdigest()
+
+
+class Histogram:
+    """
+    Latencies counted in power-of-two millisecond buckets: <= 1 ms, <= 2 ms, <= 4 ms, ...
+    """
+
+    def __init__(self):
+        self.buckets: Counter[int] = Counter()  # upper bound in ms -> count
+        self.count = 0
+        self.cached = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def add(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.buckets[2 ** max(0, math.ceil(math.log2(milliseconds))) if milliseconds > 1 else 1] += 1
+        self.count += 1
+
+    def percentile(self, q: float) -> int | None:
+        """
+        Upper bound (ms) of the bucket with the nearest-rank percentile, None without latencies
+        """
+        rank, seen = max(1, math.ceil(self.count * q / 100)), 0
+        for bound in sorted(self.buckets):
+            seen += self.buckets[bound]
+            if seen >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "cached": self.cached,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets_ms": {str(bound): self.buckets[bound] for bound in sorted(self.buckets)},
+        }
+
+
+class Lane:
+    def __init__(self, name: str, workers: int, queue: int):
+        """
+        :param name: Name of the lane in the stats
+        :param workers: Number of worker processes
+        :param queue: Requests taken at once, running or waiting for a worker
+        """
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.slots = asyncio.Semaphore(queue)
+        self.in_flight = 0
+        self.restarts = 0
+
+    def submit(self, day: Day, data: str, params: dict[str, Any], budget: float | None) -> Future:
+        """
+        Solve in a worker, a slot of the lane must be acquired first and is released when the solve
+        finishes (or could not be submitted)
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                future = self.executor.submit(solve_in_worker, day, data, params, budget)
+            except BrokenProcessPool:
+                # A worker died, the pool does not take any more work
+                self.restart()
+                future = self.executor.submit(solve_in_worker, day, data, params, budget)
+        except BaseException:
+            self.slots.release()
+            raise
+        self.in_flight += 1
+        future.add_done_callback(lambda _future: loop.call_soon_threadsafe(self._release))
+        return future
+
+    def restart(self):
+        """
+        Replace the pool, the solves of the old one have already failed with `BrokenProcessPool`
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.restarts += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self.slots.release()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue": self.queue,
+            "in_flight": self.in_flight,
+            "restarts": self.restarts,
+        }
+
+
+class SolveService:
+    def __init__(
+        self,
+        days: list[Day],
+        workers: int,
+        slow_workers: int,
+        queue: int | None = None,
+        timeout: float = TIMEOUT,
+        cache_entries: int = CACHE_ENTRIES,
+    ):
+        """
+        :param days: Days served
+        :param workers: Worker processes of the fast days
+        :param slow_workers: Worker processes of the slow days
+        :param queue: Requests taken at once per lane, defaults to 4 per worker
+        :param timeout: Seconds to wait for an answer
+        :param cache_entries: Answers memoized
+        """
+        self.days = {day.number: day for day in days}
+        self.fast = Lane("fast", workers, queue or 4 * workers)
+        self.slow = Lane("slow", slow_workers, queue or 4 * slow_workers)
+        timings = read_timings()
+        self.lanes = {day.number: self.slow if self._is_slow(day, timings) else self.fast for day in days}
+        self.timeout = timeout
+        self.cache_entries = cache_entries
+        self.cache: OrderedDict[str, list[Any]] = OrderedDict()
+        self.pending: dict[str, asyncio.Future] = {}  # key -> answers of the request being solved
+        self.histograms: dict[int, Histogram] = {}
+
+    @staticmethod
+    def _is_slow(day: Day, timings: dict[str, float]) -> bool:
+        recorded = [wall for key, wall in timings.items() if key.startswith(f"{day.name}/")]
+        return not recorded or sum(recorded) > SLOW
+
+    def close(self):
+        for lane in (self.fast, self.slow):
+            lane.executor.shutdown(cancel_futures=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "days": {str(day): histogram.to_dict() for day, histogram in sorted(self.histograms.items())},
+            "lanes": {lane.name: lane.to_dict() for lane in (self.fast, self.slow)},
+            "cache": {"entries": len(self.cache), "max_entries": self.cache_entries},
+        }
+
+    def prepare(self, request: dict[str, Any]) -> tuple[Day, str, dict[str, Any], str]:
+        """
+        :return: Day, input, params and memo key of the request
+        :raises KeyError: If the day is not served
+        """
+        day = self.days[int(request["day"])]
+        data, params = request["input"], request.get("params") or {}
+        return day, data, params, request_key(day, data, params)
+
+    async def start(
+        self, day: Day, data: str, params: dict[str, Any], key: str, budget: float
+    ) -> asyncio.Future:
+        """
+        Look the answers of the request up or start solving it, waiting for a place in its lane
+        :param budget: Seconds the solve may run
+        :return: Future of the answers
+        """
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            answers = asyncio.get_running_loop().create_future()
+            answers.set_result(self.cache[key])
+            return answers
+        if key in self.pending:
+            return self.pending[key]
+
+        lane = self.lanes[day.number]
+        await lane.slots.acquire()
+        if key in self.pending:
+            # Started by an identical request while this one waited
+            lane.slots.release()
+            return self.pending[key]
+        future = lane.submit(day, data, params, budget)
+        answers = self.pending[key] = asyncio.wrap_future(future)
+        answers.add_done_callback(lambda _answers: self._store(key, future))
+        return answers
+
+    def _store(self, key: str, future: Future):
+        self.pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.cache[key] = future.result()
+        while len(self.cache) > self.cache_entries:
+            self.cache.popitem(last=False)
+
+    async def respond(
+        self, request_id: Any, prepared: tuple[Day, str, dict[str, Any], str], start: float
+    ) -> dict[str, Any]:
+        """
+        Wait for a place in the lane and the answers of a prepared request, record its latency
+        """
+        day, data, params, key = prepared
+        histogram = self.histograms.setdefault(day.number, Histogram())
+        response = {"id": request_id, "day": day.number, "part_one": None, "part_two": None}
+        cached = False
+        try:
+            remaining = self.timeout - (time.perf_counter() - start)
+            async with asyncio.timeout(remaining):
+                answers = await self.start(day, data, params, key, remaining)
+                cached = answers.done()
+                # Shielded, the other requests waiting for the same answers keep waiting
+                part_one, part_two = await asyncio.shield(answers)
+            response.update(part_one=part_one, part_two=part_two, error=None)
+        except TimeoutError:
+            histogram.timeouts += 1
+            response["error"] = "timeout"
+        except Exception as error:
+            histogram.errors += 1
+            response["error"] = repr(error)
+        histogram.cached += cached
+        histogram.add(time.perf_counter() - start)
+        return {**response, "cached": cached, "latency": time.perf_counter() - start}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve the requests of one connection, writing the responses as they finish
+        """
+        lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+        # Requests of the connection taken per lane, the reading waits for the full lane only
+        backlog = {lane.name: asyncio.Semaphore(lane.queue) for lane in (self.fast, self.slow)}
+
+        async def write(response: dict[str, Any]):
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        async def answer(request_id: Any, prepared: Any, start: float, taken: asyncio.Semaphore):
+            try:
+                response = await self.respond(request_id, prepared, start)
+            finally:
+                taken.release()
+            await write(response)
+
+        try:
+            while line := await reader.readline():
+                start, request = time.perf_counter(), None
+                try:
+                    request = json.loads(line)
+                    if request.get("stats"):
+                        await write(self.stats())
+                        continue
+                    prepared = self.prepare(request)
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    await write({"id": request_id, "error": f"Invalid request: {error!r}"})
+                    continue
+                taken = backlog[self.lanes[prepared[0].number].name]
+                await taken.acquire()  # Backpressure: the connection is not read while its lane is full
+                task = asyncio.create_task(answer(request.get("id"), prepared, start, taken))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, ValueError):
+            pass  # Client gone or a request longer than MAX_REQUEST
+        finally:
+            writer.close()
+
+
+async def serve(service: SolveService, host: str, port: int, unix: str | None):
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, unix, limit=MAX_REQUEST)
+    else:
+        server = await asyncio.start_server(service.handle, host, port, limit=MAX_REQUEST)
+    addresses = ", ".join(str(socket.getsockname()) for socket in server.sockets)
+    print(f"Serving on {addresses}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    cores = os.cpu_count() or 2
+    parser.add_argument("--host", default=HOST, help=f"TCP host (default: {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"TCP port (default: {PORT})")
+    parser.add_argument("--unix", help="Listen on the Unix socket instead of TCP")
+    workers = max(1, cores // 2)
+    parser.add_argument("-j", "--workers", type=int, default=workers, help="Workers of the fast days")
+    parser.add_argument("--slow-workers", type=int, default=workers, help="Workers of the slow days")
+    parser.add_argument("--queue", type=int, help="Requests taken at once per lane (default: 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds per request (default: 60)")
+    parser.add_argument("--cache-entries", type=int, default=CACHE_ENTRIES, help="Answers memoized")
+    args = parser.parse_args()
+
+    service = SolveService(
+        discover(), args.workers, args.slow_workers, args.queue, args.timeout, args.cache_entries
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
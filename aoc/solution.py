@@ -0,0 +1,32 @@
+"""
+Shared pieces of the `solve()` API of the days.
+
+Every day exposes `solve(data: bytes | str, **params) -> Results`, solving both parts for the
+puzzle input given as `data`. It reads no files and does not depend on the working directory,
+so the solutions can be called in-process any number of times:
+
+    from aoc.days import discover, load
+
+    days = {day.number: load(day, lazy=True) for day in discover()}
+    days[14].solve(example, width=11, height=7).part_one
+
+The `params` are the sizes of the puzzle that differ between the examples and the real input,
+e.g. the grid size of days 14 and 18. They default to the sizes of the real input.
+
+The parsing is split the same way: `parse_input(data)` of a day parses the given data, or reads
+the day's `INPUT` file (relative to the working directory) when `data` is None.
+"""
+
+from collections import namedtuple
+
+Results = namedtuple("Results", ["part_one", "part_two"])
+
+
+def read_text(data: bytes | str | None, path: str) -> str:
+    """
+    Puzzle input as text: the given data or the content of the file when there is no data
+    """
+    if data is None:
+        with open(path) as file:
+            return file.read()
+    return data.decode() if isinstance(data, bytes) else data
@@ -1,46 +1,375 @@
+from __future__ import annotations
+
+import heapq
+import math
+import os
+from array import array
 from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import groupby
+
+from aoc.parse import parse_numbers, read_numbers
+from aoc.solution import Results
 
 INPUT_FILE = "input.txt"
+RUN_BYTES = 64 << 20  # Input sorted in memory at once by `solve_external`
+BLOCK = 1 << 16  # Values read at once from every sorted run
+SIZE = 1 << 17  # Location IDs indexed by `LocationIndex`, the puzzle ones have 5 digits
 
 
-def read_lists() -> tuple[list, list]:
-    with open(INPUT_FILE) as file:
-        list_1, list_2 = [], []
-        # Read file to list variables
-        for line in file:
-            one, two = line.split()
-            list_1.append(int(one))
-            list_2.append(int(two))
-        return list_1, list_2
+def parse_input(data: bytes | str | None = None) -> tuple[Sequence[int], Sequence[int]]:
+    """
+    Left and right column of the input (the file when no data is given), parsed once and shared by
+    both parts (which do not modify them)
+    """
+    numbers = read_numbers(INPUT_FILE) if data is None else parse_numbers(data)
+    list_1, list_2 = numbers.columns(2)
+    return list_1, list_2
 
 
-def main():
+def part_one(lists: tuple[Sequence[int], Sequence[int]] | None = None) -> int:
     result = 0
     # Read file to list variables
-    list_1, list_2 = read_lists()
+    list_1, list_2 = lists or parse_input()
     # Sort the lists
-    list_1.sort()
-    list_2.sort()
+    sorted_1 = sorted(list_1)
+    sorted_2 = sorted(list_2)
     # Calculate the result
-    for one, two in zip(list_1, list_2):
+    for one, two in zip(sorted_1, sorted_2):
         result += abs(one - two)
-    print(f"The result is: {result}")  # 2176849
+    return result
 
 
-def part_two():
+def part_two(lists: tuple[Sequence[int], Sequence[int]] | None = None) -> int:
     result = 0
-    location_counter = defaultdict(int)
+    location_counter: defaultdict[int, int] = defaultdict(int)
     # Read file to list variables
-    list_1, list_2 = read_lists()
+    list_1, list_2 = lists or parse_input()
     # Count the number of times a value appears in the list_2
     for value in list_2:
         location_counter[value] += 1
     # Calculate the result
     for value in list_1:
         result += value * location_counter[value]
-    print(f"The part two result is: {result}")  # 23384288
+    return result
+
+
+def parse_arrays(data: bytes | str | None = None):
+    """
+    Left and right column as NumPy int64 arrays, views of the values of `parse_numbers` (large
+    inputs are scanned by NumPy without creating a Python int per value)
+    :raises ImportError: If NumPy is not installed
+    :raises OverflowError: If some value does not fit into 64 bits
+    :raises ValueError: If some record does not have 2 values
+    """
+    import numpy as np
+
+    numbers = read_numbers(INPUT_FILE) if data is None else parse_numbers(data)
+    values, offsets = numbers.to_numpy()
+    if not np.array_equal(offsets, np.arange(0, len(values) + 1, 2)):
+        raise ValueError("All records must have 2 values")
+    pairs = values.reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def part_one_vectorized(arrays=None) -> int:
+    """
+    `part_one` on the arrays of `parse_arrays`
+    """
+    import numpy as np
+
+    list_1, list_2 = parse_arrays() if arrays is None else arrays
+    return int(np.abs(np.sort(list_1) - np.sort(list_2)).sum())
+
+
+def part_two_vectorized(arrays=None) -> int:
+    """
+    `part_two` on the arrays of `parse_arrays`: the occurrences of the distinct right values are
+    looked up for all left values at once by a binary search
+    """
+    import numpy as np
+
+    list_1, list_2 = parse_arrays() if arrays is None else arrays
+    values, counts = np.unique(list_2, return_counts=True)
+    if not len(values):
+        return 0
+    index = np.searchsorted(values, list_1).clip(max=len(values) - 1)
+    occurrences = np.where(values[index] == list_1, counts[index], 0)
+    return int((list_1 * occurrences).sum())
+
+
+def spill_runs(
+    path: str | os.PathLike, directory: str, run_bytes: int = RUN_BYTES
+) -> tuple[list[str], list[str]]:
+    """
+    Sort the input in runs of whole lines of about `run_bytes` and write the sorted columns of every
+    run to binary files of int64 values
+    :param directory: Directory of the run files
+    :return: Paths of the runs of the left and of the right column
+    """
+    import tempfile
+
+    runs: tuple[list[str], list[str]] = ([], [])
+    with open(path, "rb") as file:
+        while block := file.read(run_bytes):
+            block += file.readline()  # Up to the end of the last line
+            for column, paths in zip(parse_numbers(block).columns(2), runs):
+                with tempfile.NamedTemporaryFile(dir=directory, suffix=".run", delete=False) as run:
+                    array("q", sorted(column)).tofile(run)
+                paths.append(run.name)
+    return runs
+
+
+def read_run(path: str) -> Iterator[int]:
+    """
+    Values of a run file, read in blocks of `BLOCK` values
+    """
+    with open(path, "rb") as file:
+        while True:
+            values = array("q")
+            try:
+                values.fromfile(file, BLOCK)
+            except EOFError:
+                pass  # The last block is shorter, its values are read anyway
+            if not values:
+                return
+            yield from values
+
+
+def counts(values: Iterable[int]) -> Iterator[tuple[int, int]]:
+    """
+    Distinct values of a sorted iterator with their number of occurrences
+    """
+    for value, group in groupby(values):
+        yield value, sum(1 for _ in group)
+
+
+def solve_external(
+    path: str | os.PathLike = INPUT_FILE, run_bytes: int = RUN_BYTES, directory: str | None = None
+) -> Results:
+    """
+    Solve lists larger than the memory: sorted runs of the columns are spilled to temporary files
+    and k-way merged, both parts are summed in one pass over the distinct values of the merged
+    columns in increasing order.
+
+    The similarity adds up the values found in both columns. The distance of the pairs of sorted
+    lists equals the area between their cumulative counts (the lists have the same length), so
+    between two consecutive values every left value not yet paired with a right one (or the other
+    way round) adds the gap to the distance.
+    :param run_bytes: Input sorted in memory at once
+    :param directory: Directory of the temporary files, the system temporary directory by default
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="aoc-01-", dir=directory) as temporary:
+        runs_1, runs_2 = spill_runs(path, temporary, run_bytes)
+        counts_1 = counts(heapq.merge(*map(read_run, runs_1)))
+        counts_2 = counts(heapq.merge(*map(read_run, runs_2)))
+        # (value, count) of the next distinct value of each column, None at its end
+        next_1, next_2 = next(counts_1, None), next(counts_2, None)
+        distance = similarity = previous = balance = 0  # balance: unpaired left values (right < 0)
+        while next_1 is not None or next_2 is not None:
+            value = min(pair[0] for pair in (next_1, next_2) if pair is not None)
+            distance += abs(balance) * (value - previous)
+            left = next_1[1] if next_1 is not None and next_1[0] == value else 0
+            right = next_2[1] if next_2 is not None and next_2[0] == value else 0
+            similarity += value * left * right
+            balance += left - right
+            previous = value
+            if left:
+                next_1 = next(counts_1, None)
+            if right:
+                next_2 = next(counts_2, None)
+    return Results(distance, similarity)
+
+
+class LocationIndex:
+    """
+    Both answers kept up to date while pairs of locations are inserted and removed.
+
+    The similarity changes by the inserted (removed) value times its count in the other column,
+    kept in the `location_counter` of each column. The distance of the sorted columns is the area
+    between their cumulative counts (see `solve_external`): the sum of `|balance[x]|` over the IDs,
+    `balance[x]` being the number of left values <= x minus the right ones. A pair `(left, right)`
+    adds one to the balance of the IDs `left..right - 1` (or subtracts one from `right..left - 1`).
+
+    The IDs are split into blocks of about `sqrt(size)`. A block keeps a balance added to all its
+    IDs, the histogram of the balances of its IDs without it and the number of its negative
+    balances. Adding one to a whole block changes its absolute balances by the IDs that are not
+    negative minus the negative ones, and only the IDs at -1 stop being negative, so the histogram
+    updates a block in O(1) however many of its balances change sign. An update takes
+    O(sqrt(size)): the blocks of its range and the IDs at both ends. Both answers are read in O(1).
+    """
+
+    __slots__ = (
+        "size",
+        "width",
+        "counters",
+        "pairs",
+        "similarity",
+        "distance",
+        "balance",
+        "offset",
+        "histogram",
+        "negative",
+    )
+
+    def __init__(self, size: int = SIZE):
+        """
+        :param size: Location IDs 0 .. size - 1 can be indexed
+        """
+        self.size = size
+        self.width = max(1, math.isqrt(size) // 2)  # IDs of a block, an ID costs more than a block
+        self.counters: tuple[dict[int, int], dict[int, int]] = (defaultdict(int), defaultdict(int))
+        self.pairs = 0
+        self.similarity = 0
+        self.distance = 0
+        blocks = -(-size // self.width)
+        self.balance = [0] * size  # Balance of the IDs without the offset of their block
+        self.offset = [0] * blocks  # Balance added to all IDs of the block
+        self.histogram: list[defaultdict[int, int]] = [defaultdict(int) for _ in range(blocks)]
+        self.negative = [0] * blocks  # IDs of the block with a negative balance
+        for block, histogram in enumerate(self.histogram):
+            histogram[0] = min(self.width, size - block * self.width)
+
+    @classmethod
+    def from_lists(cls, list_1: Iterable[int], list_2: Iterable[int], size: int = SIZE) -> LocationIndex:
+        """
+        Index of the columns (e.g. of `parse_input`), built in O(n + size)
+        :raises ValueError: If the columns have different lengths or a location ID is out of range
+        """
+        index = cls(size)
+        balance = index.balance
+        for column, sign in ((list_1, 1), (list_2, -1)):
+            location_counter = index.counters[sign < 0]
+            for value in column:
+                index._check(value)
+                location_counter[value] += 1
+                balance[value] += sign
+        index.pairs = sum(index.counters[0].values())
+        if index.pairs != sum(index.counters[1].values()):
+            raise ValueError("Both lists must have the same length")
+        counter_1, counter_2 = index.counters
+        index.similarity = sum(value * count * counter_2.get(value, 0) for value, count in counter_1.items())
+        for position in range(1, size):
+            balance[position] += balance[position - 1]
+        index.distance = sum(map(abs, balance))
+        for block, histogram in enumerate(index.histogram):
+            values = balance[block * index.width : (block + 1) * index.width]
+            histogram.clear()
+            for value in values:
+                histogram[value] += 1
+            index.negative[block] = sum(value < 0 for value in values)
+        return index
+
+    def __len__(self) -> int:
+        """
+        Number of pairs
+        """
+        return self.pairs
+
+    def insert(self, left: int, right: int):
+        """
+        :raises ValueError: If a location ID is out of range
+        """
+        self._check(left)
+        self._check(right)
+        counter_1, counter_2 = self.counters
+        self.similarity += left * counter_2[left]
+        counter_1[left] += 1
+        self.similarity += right * counter_1[right]
+        counter_2[right] += 1
+        self.pairs += 1
+        self._add_pair(left, right, 1)
+
+    def remove(self, left: int, right: int):
+        """
+        Remove a left and a right location, not necessarily inserted as a pair
+        :raises ValueError: If a location is not in its list
+        """
+        counter_1, counter_2 = self.counters
+        if not counter_1.get(left) or not counter_2.get(right):
+            raise ValueError(f"Pair ({left}, {right}) is not in the lists")
+        counter_1[left] -= 1
+        self.similarity -= left * counter_2[left]
+        counter_2[right] -= 1
+        self.similarity -= right * counter_1[right]
+        self.pairs -= 1
+        self._add_pair(left, right, -1)
+
+    def _check(self, value: int):
+        if not 0 <= value < self.size:
+            raise ValueError(f"Location ID {value} is out of the range 0..{self.size - 1}")
+
+    def _add_pair(self, left: int, right: int, sign: int):
+        if left < right:
+            self._add(left, right, sign)
+        elif right < left:
+            self._add(right, left, -sign)
+
+    def _add(self, first: int, last: int, delta: int):
+        """
+        Add delta (1 or -1) to the balance of the IDs first .. last - 1
+        """
+        width = self.width
+        block, end = first // width, last // width  # Block of the first ID and of the one after the last
+        if block == end:
+            self._add_ids(first, last, delta)
+            return
+        if first % width:
+            self._add_ids(first, (block + 1) * width, delta)
+            block += 1
+        for block in range(block, end):
+            self._add_block(block, delta)
+        if last % width:
+            self._add_ids(end * width, last, delta)
+
+    def _add_block(self, block: int, delta: int):
+        # Blocks before the last ID are whole, `width` IDs
+        offset = self.offset[block]
+        if delta > 0:
+            self.distance += self.width - 2 * self.negative[block]
+            self.negative[block] -= self.histogram[block].get(-1 - offset, 0)  # -1 becomes 0
+        else:
+            self.negative[block] += self.histogram[block].get(-offset, 0)  # 0 becomes -1
+            self.distance += 2 * self.negative[block] - self.width
+        self.offset[block] = offset + delta
+
+    def _add_ids(self, first: int, last: int, delta: int):
+        # The IDs are in the same block
+        block = first // self.width
+        offset, histogram, balance = self.offset[block], self.histogram[block], self.balance
+        distance = negative = 0
+        for position in range(first, last):
+            value = balance[position]
+            histogram[value] -= 1
+            if not histogram[value]:
+                del histogram[value]
+            balance[position] = value + delta
+            histogram[value + delta] += 1
+            value += offset
+            distance += abs(value + delta) - abs(value)
+            negative += (value + delta < 0) - (value < 0)
+        self.distance += distance
+        self.negative[block] += negative
+
+
+def solve(data: bytes | str, vectorized: bool = False) -> Results:
+    """
+    :param vectorized: Solve with NumPy (see `parse_arrays`), for inputs of millions of lines
+    """
+    if vectorized:
+        arrays = parse_arrays(data)
+        return Results(part_one_vectorized(arrays), part_two_vectorized(arrays))
+    lists = parse_input(data)
+    return Results(part_one(lists), part_two(lists))
+
+
+def main():
+    lists = parse_input()
+    print(f"The result is: {part_one(lists)}")  # 2176849
+    print(f"The part two result is: {part_two(lists)}")  # 23384288
 
 
 if __name__ == "__main__":
     main()
-    part_two()
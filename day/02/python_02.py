@@ -1,12 +1,13 @@
-INPUT_FILE = "input.txt"
+from collections.abc import Sequence
 
+from aoc.parse import Numbers, parse_numbers, read_numbers
+from aoc.solution import Results
 
-def read_lines():
-    with open(INPUT_FILE) as file:
-        yield from file
+INPUT_FILE = "input.txt"
+BATCH = 1 << 14  # Reports checked at once by `count_safe_vectorized`
 
 
-def is_increasing_or_decreasing(reports: list[int], allowed_fails: int = 0) -> bool:
+def is_increasing_or_decreasing(reports: Sequence[int], allowed_fails: int = 0) -> bool:
     # Check if the reports are increasing or decreasing
     direction = None
     fails = 0
@@ -29,15 +30,120 @@ def is_increasing_or_decreasing(reports: list[int], allowed_fails: int = 0) -> b
     return True
 
 
+def is_safe(report: Sequence[int], allowed_removals: int = 0) -> bool:
+    """
+    Whether the report is safe after removing at most `allowed_removals` of its levels, decided
+    exactly in one pass per direction (O(n) for any number of removals).
+
+    The levels kept form the longest chain of levels going up (or down) by 1 to 3 at every step.
+    A chain ending with a level continues one ending 1, 2 or 3 below (above) it, so the longest
+    chains ending with every level value seen so far are enough to extend them. The pass stops
+    once more levels are left out of the best chain of the levels seen than may be removed.
+    """
+    for sign in (1, -1):
+        longest: dict[int, int] = {}  # level -> longest chain of the levels seen ending with it
+        chain = longest.get
+        best = 0
+        for seen, level in enumerate(report, start=1):
+            length = 1 + max(chain(level - sign, 0), chain(level - 2 * sign, 0), chain(level - 3 * sign, 0))
+            if length > longest.get(level, 0):
+                longest[level] = length
+                best = max(best, length)
+            if seen - best > allowed_removals:
+                break
+        else:
+            return True
+    return False
+
+
+def parse_input(data: bytes | str | None = None) -> Numbers:
+    """
+    Levels of all reports, one record per line (of the file when no data is given)
+    """
+    return read_numbers(INPUT_FILE) if data is None else parse_numbers(data)
+
+
+def count_safe_vectorized(reports: Numbers, allowed_removals: int = 0, batch: int = BATCH) -> int:
+    """
+    Number of safe reports (see `is_safe`) checked with NumPy on the flat levels and the record
+    offsets of `reports`, `batch` reports at once: the steps of the reports of a batch are one
+    array and every per-report check is a difference of cumulative sums at the report offsets.
+    Batches keep the temporary arrays small enough to stay in the CPU caches.
+
+    With a removal allowed, removing the level at `j` works if the steps before `j - 1` and after
+    `j + 1` of its report are safe and, when `j` is not at either end, the step over it from `j - 1`
+    to `j + 1` is too. Every level of the batch is tried at once.
+    :param allowed_removals: 0 or 1, see `is_safe` for more
+    :param batch: Reports checked at once
+    :raises ImportError: If NumPy is not installed
+    :raises ValueError: If more than one removal is allowed
+    """
+    import numpy as np
+
+    if allowed_removals not in (0, 1):
+        raise ValueError("Only 0 or 1 allowed removals are vectorized, use is_safe for more")
+    levels, offsets = reports.to_numpy()
+    safe = 0
+    for first in range(0, len(reports), batch):
+        bounds = offsets[first : first + batch + 1]
+        safe += _count_safe_batch(np, levels[bounds[0] : bounds[-1]], bounds - bounds[0], allowed_removals)
+    return safe
+
+
+def _count_safe_batch(np, levels, offsets, allowed_removals: int) -> int:
+    starts, ends = offsets[:-1], offsets[1:]
+    steps = np.diff(levels)  # The steps at ends - 1 join two reports, they are never counted
+    safe = np.zeros(len(starts), dtype=bool)
+    if allowed_removals:
+        # Start and end of the report of every level, the step over a level
+        sizes = ends - starts
+        start, end = np.repeat(starts, sizes), np.repeat(ends, sizes)
+        level = np.arange(len(levels))
+        inner = (level > start) & (level < end - 1)
+        skip = levels[np.minimum(level + 1, len(levels) - 1)] - levels[np.maximum(level - 1, 0)]
+    for low, high in ((1, 3), (-3, -1)):
+        # unsafe[i]: number of unsafe steps among the first i steps
+        unsafe = np.zeros(len(levels), dtype=np.int32)
+        np.cumsum((steps < low) | (steps > high), out=unsafe[1:])
+        if not allowed_removals:
+            safe |= unsafe[ends - 1] == unsafe[starts]
+            continue
+        before = unsafe[np.maximum(level - 1, start)] == unsafe[start]
+        after = unsafe[end - 1] == unsafe[np.minimum(level + 1, end - 1)]
+        over = ~inner | ((skip >= low) & (skip <= high))
+        # removable[i]: number of levels among the first i that can be removed
+        removable = np.zeros(len(levels) + 1, dtype=np.int32)
+        np.cumsum(before & after & over, out=removable[1:])
+        safe |= removable[ends] > removable[starts]
+    return int(safe.sum())
+
+
+def part_one(reports: Numbers | None = None) -> int:
+    if reports is None:
+        reports = parse_input()
+    return sum(is_increasing_or_decreasing(report) for report in reports)
+
+
+def part_two(reports: Numbers | None = None) -> int:
+    if reports is None:
+        reports = parse_input()
+    return sum(is_safe(report, allowed_removals=1) for report in reports)
+
+
+def solve(data: bytes | str, vectorized: bool = False) -> Results:
+    """
+    :param vectorized: Count with NumPy (see `count_safe_vectorized`), for millions of reports
+    """
+    reports = parse_input(data)
+    if vectorized:
+        return Results(count_safe_vectorized(reports), count_safe_vectorized(reports, allowed_removals=1))
+    return Results(part_one(reports), part_two(reports))
+
+
 def main():
-    lines = [[int(i) for i in line.split()] for line in read_lines()]
-    safe_reports = sum(is_increasing_or_decreasing(reports) for reports in lines)
-    safe_reports_with_one_fail = sum(
-        is_increasing_or_decreasing(reports, allowed_fails=1) for reports in lines
-    )
-
-    print(f"Safe reports: {safe_reports}")  # 534
-    print(f"Safe reports with allowed fail: {safe_reports_with_one_fail}")  # 577
+    reports = parse_input()
+    print(f"Safe reports: {part_one(reports)}")  # 534
+    print(f"Safe reports with allowed fail: {part_two(reports)}")  # 577
 
 
 if __name__ == "__main__":
@@ -1,49 +1,112 @@
-import re
+from collections.abc import Iterable, Iterator
+from functools import cache
+
+from aoc.solution import Results
 
 INPUT_FILE = "input.txt"
-REGEX = re.compile(
-    r"mul\((?P<left>[0-9]{1,3}),(?P<right>[0-9]{1,3})\)"
-)  # mul(123,456) -> left=123, right=456
+CHUNK_SIZE = 1 << 20  # Bytes scanned at once by `read_chunks` and `split_chunks`
+# mul(123,456) -> 123, 456; do() and don't() -> None, None
+TOKENS = rb"mul\(([0-9]{1,3}),([0-9]{1,3})\)|do\(\)|don't\(\)"
+LONGEST_TOKEN = len(b"mul(123,456)")
+
+
+def parse_input(data: bytes | str | None = None) -> Results:
+    """
+    Both sums of the corrupted memory (of the file when no data is given), from one streaming pass
+    shared by both parts
+    """
+    return scan(read_chunks()) if data is None else solve(data)
+
+
+def scan(chunks: Iterable[bytes | memoryview]) -> Results:
+    """
+    Sum of all `mul` calls and of the enabled ones, in one pass over the corrupted memory given in
+    chunks of any size (e.g. read from a file by `read_chunks`), keeping only one chunk in memory.
+
+    The tokens can not overlap, so a token is found the same way in any part of the text it is
+    in. A token starting in the last `LONGEST_TOKEN - 1` bytes of a chunk may go on in the next
+    one, those bytes (without the tokens found) are scanned again with the next chunk.
+    """
+    finditer = _tokens().finditer
+    total = enabled_total = 0
+    enabled = True
+    buffer, done = b"", False
+    chunks = iter(chunks)
+    while not done:
+        chunk = next(chunks, None)
+        done = chunk is None
+        if chunk:
+            buffer += chunk
+        # Tokens starting from the limit on might not be complete yet
+        limit = len(buffer) if done else len(buffer) - LONGEST_TOKEN + 1
+        end = 0
+        for token in finditer(buffer):
+            if token.start() >= limit:
+                break
+            left, right = token.groups()
+            if left is None:
+                enabled = token.end() - token.start() == len(b"do()")
+            else:
+                product = int(left) * int(right)
+                total += product
+                enabled_total += product if enabled else 0
+            end = token.end()
+        buffer = buffer[max(limit, end, 0) :]
+    return Results(total, enabled_total)
+
+
+@cache
+def _tokens():
+    # Compiled on the first use, `re` is slow to import
+    import re
+
+    return re.compile(TOKENS)
 
 
-def read_lines():
-    with open(INPUT_FILE) as file:
-        yield from file
+def read_chunks(path: str = INPUT_FILE, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
 
 
-def sum_line(line):
-    result = 0
-    for mul in REGEX.finditer(line):
-        # Extract left and right values from the "mul" call
-        # e.g. mul(123,456) -> 123 * 456
-        left, right = map(int, mul.groups())
-        result += left * right
-    return result
+def split_chunks(data: bytes | str, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Chunks of the data, as views without copying it
+    """
+    view = memoryview(data.encode() if isinstance(data, str) else data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start : start + chunk_size]
 
 
-def sum_multiplication_calls(lines):
+def sum_multiplication_calls(lines: Iterable[str]) -> int:
     # Summarise result of "multiplication" calls
-    return sum(sum_line(line) for line in lines)
+    return scan(line.encode() for line in lines).part_one
+
+
+def sum_enabled_multiplication_calls(lines: Iterable[str]) -> int:
+    # Same as sum_multiplication_calls() but keywords `do()` and `don't()` turn on/off the multiplication
+    return scan(line.encode() for line in lines).part_two
+
+
+def part_one(sums: Results | None = None) -> int:
+    return (parse_input() if sums is None else sums).part_one
+
+
+def part_two(sums: Results | None = None) -> int:
+    return (parse_input() if sums is None else sums).part_two
+
+
+def solve(data: bytes | str) -> Results:
+    # Both sums in one pass over the data, in chunks
+    return scan(split_chunks(data))
 
 
-def part_two(lines):
-    # Same as sum_multiplication_calls() but keywords `do()` amd `don't()` turn on/off the multiplication
-    result = 0
-    # Join lines into one string
-    line = "".join(lines)
-    # Split the string by "do()"
-    do_lines = line.split("do()")
-    for do_line in do_lines:
-        # Split the string by "don't()"
-        do, *_dont = do_line.split("don't()")
-        # Find all "mul" calls in the "do()" part
-        result += sum_line(do)
-    return result
+def main():
+    # Both sums in one pass over the file, read in chunks
+    part_one, part_two = parse_input()
+    print(f"Sum of 'mul' calls: {part_one}")  # 164730528
+    print(f"Sum of 'mul' calls with 'do()' and 'don't()': {part_two}")  # 70478672
 
 
 if __name__ == "__main__":
-    lines = list(read_lines())
-    mul_calls = sum_multiplication_calls(lines)
-    print(f"Sum of 'mul' calls: {mul_calls}")  # 164730528
-    mul_calls_with_do_dont = part_two(lines)
-    print(f"Sum of 'mul' calls with 'do()' and 'don't()': {mul_calls_with_do_dont}")  # 70478672
+    main()
@@ -1,3 +1,6 @@
+from aoc.grid import ByteGrid
+from aoc.solution import Results, read_text
+
 INPUT_FILE = "input.txt"  # Path to the input file
 WORD = "XMAS"  # Word to search in the grid
 # Define the 8 possible directions (dx, dy)
@@ -21,70 +24,75 @@ PATTERNS = [
 ]
 
 
-def read_grid(file_path) -> list[str]:
+def read_grid(file_path) -> ByteGrid:
     # Read the grid from the file
     with open(file_path) as file:
-        return [line.strip() for line in file]
+        return parse_input(file.read())
 
 
-def is_valid(x, y, n, m) -> bool:
-    # Check if the cell (x, y) is inside the grid
-    return 0 <= x < n and 0 <= y < m
+def parse_input(data: bytes | str | None = None) -> ByteGrid:
+    # Grid of the data (of the input file when there is no data), padded so the word never steps
+    # out of the buffer
+    lines = read_text(data, INPUT_FILE).splitlines()
+    return ByteGrid.from_lines((line.strip() for line in lines), border=".", padding=len(WORD) - 1)
 
 
-def search_word(grid, word):
+def search_word(grid: ByteGrid, word: str) -> int:
     # Search for the word in the grid
-    n, m = len(grid), len(grid[0])
-    word_len = len(word)
+    offsets = [dx * grid.stride + dy for dx, dy in DIRECTIONS]
+    letters = word.encode()
+    cells = grid.cells
     count = 0
 
-    # Iterate over the grid
-    for i in range(n):
-        # Iterate over the columns
-        for j in range(m):
-            # Iterate over the directions
-            for dx, dy in DIRECTIONS:
-                x, y = i, j
-                k = 0
-                # Check if the word is in the grid
-                while k < word_len and is_valid(x, y, n, m) and grid[x][y] == word[k]:
-                    x += dx
-                    y += dy
-                    k += 1
-                # If the word is found, increment the count
-                if k == word_len:
-                    count += 1
+    # Iterate over the cells with the first letter of the word
+    for start in grid.find_all(letters[0]):
+        # Iterate over the directions
+        for offset in offsets:
+            # Check if the word is in the grid
+            if all(cells[start + k * offset] == letter for k, letter in enumerate(letters[1:], start=1)):
+                count += 1
 
     return count
 
 
-def search_pattern(grid, i, j, pattern):
-    # Search for the pattern in the grid
-    n, m = len(grid), len(grid[0])
-    for char, dx, dy in pattern:
-        new_i, new_j = i + dx, j + dy
-        if not is_valid(new_i, new_j, n, m) or grid[new_i][new_j] != char:
-            return False
-    return True
+def search_pattern(grid: ByteGrid, position: int, pattern: list[tuple[int, int]]) -> bool:
+    # Search for the pattern (letter, offset) in the grid
+    cells = grid.cells
+    return all(cells[position + offset] == char for char, offset in pattern)
 
 
-def search_x_mas(grid):
+def search_x_mas(grid: ByteGrid) -> int:
     # Search for the X-MAS pattern in the grid
-    n, m = len(grid), len(grid[0])
+    patterns = [[(ord(char), dx * grid.stride + dy) for char, dx, dy in pattern] for pattern in PATTERNS]
     count = 0
 
-    for i in range(n):
-        for j in range(m):
-            for pattern in PATTERNS:
-                if search_pattern(grid, i, j, pattern):
-                    count += 1
+    # Every pattern has "A" in its center
+    for position in grid.find_all("A"):
+        for pattern in patterns:
+            if search_pattern(grid, position, pattern):
+                count += 1
 
     return count
 
 
+def part_one(grid: ByteGrid | None = None) -> int:
+    return search_word(parse_input() if grid is None else grid, WORD)
+
+
+def part_two(grid: ByteGrid | None = None) -> int:
+    return search_x_mas(parse_input() if grid is None else grid)
+
+
+def solve(data: bytes | str) -> Results:
+    grid = parse_input(data)
+    return Results(part_one(grid), part_two(grid))
+
+
+def main():
+    grid = parse_input()
+    print(f"The word '{WORD}' appears {part_one(grid)} times in the grid.")  # 2454
+    print(f"The X-MAS pattern appears {part_two(grid)} times in the grid.")  # 1858
+
+
 if __name__ == "__main__":
-    grid = read_grid(INPUT_FILE)
-    occurrences = search_word(grid, WORD)
-    print(f"The word '{WORD}' appears {occurrences} times in the grid.")  # 2454
-    occurrences = search_x_mas(grid)
-    print(f"The X-MAS pattern appears {occurrences} times in the grid.")  # 1858
+    main()
@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from aoc.solution import Results, read_text
+
 INPUT = "input.txt"
 
 
@@ -7,14 +9,14 @@ def get_middle(lst: list[int]) -> int:
     return lst[len(lst) // 2]
 
 
-def read_input(file):
+def parse_input(data: bytes | str | None = None):
     """
-    Input file example:
+    Input example:
     1|3
     3|5
 
     1,3,5
-    :param file:
+    :param data: Puzzle input, the input file is read when None
     :return: tuple of to_right, to_left and updates
     to_right: {1: [3], 3: [5], 5: []}
     to_left: {3: [1], 5: [3]}
@@ -23,14 +25,14 @@ def read_input(file):
     updates = []
     to_left = defaultdict(list)
     to_right = defaultdict(list)
-    with open(file) as f:
-        while line := f.readline().strip():  # Walrus operator (Assignment expressions)
-            l, r = line.split("|")
-            l, r = int(l), int(r)
-            to_right[l].append(r)
-            to_left[r].append(l)
-
-        for line in f:
+    lines = iter(read_text(data, INPUT).splitlines())
+    while line := next(lines, "").strip():  # Walrus operator (Assignment expressions)
+        l, r = map(int, line.split("|"))
+        to_right[l].append(r)
+        to_left[r].append(l)
+
+    for line in lines:
+        if line.strip():
             updates.append(list(map(int, line.strip().split(","))))
 
     return to_right, to_left, updates
@@ -86,15 +88,35 @@ def fix_update(update: list[int], to_right: dict[int, list[int]], to_left: dict[
     return get_middle(left)
 
 
-if __name__ == "__main__":
-    to_right, to_left, updates = read_input(INPUT)
+def part_one(rules_and_updates=None) -> int:
+    to_right, to_left, updates = parse_input() if rules_and_updates is None else rules_and_updates
     result = 0
-    result_2 = 0
     for update in updates:
         middle = validate_updates(update.copy(), to_right, to_left)
         if middle is not None:
             result += middle
-        else:
-            result_2 += fix_update(update.copy(), to_right, to_left)
-    print(f"Result: {result}")  # 6498
-    print(f"Result part 2: {result_2}")  # 5017
+    return result
+
+
+def part_two(rules_and_updates=None) -> int:
+    to_right, to_left, updates = parse_input() if rules_and_updates is None else rules_and_updates
+    result = 0
+    for update in updates:
+        if validate_updates(update.copy(), to_right, to_left) is None:
+            result += fix_update(update.copy(), to_right, to_left)
+    return result
+
+
+def solve(data: bytes | str) -> Results:
+    rules_and_updates = parse_input(data)
+    return Results(part_one(rules_and_updates), part_two(rules_and_updates))
+
+
+def main():
+    rules_and_updates = parse_input()
+    print(f"Result: {part_one(rules_and_updates)}")  # 6498
+    print(f"Result part 2: {part_two(rules_and_updates)}")  # 4655
+
+
+if __name__ == "__main__":
+    main()
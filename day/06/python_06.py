@@ -1,3 +1,11 @@
+from collections.abc import Iterator
+
+from aoc.grid import ByteGrid
+from aoc.instrument import counted
+from aoc.progress import Progress
+from aoc.render import frame
+from aoc.solution import Results, read_text
+
 INPUT = "input.txt"
 # INPUT = "input_example.txt"
 
@@ -8,8 +16,8 @@ LEFT = "<"
 OBSTACLE = "#"
 VISITED = "X"
 NOTHING = "."
+OUTSIDE = " "  # Border around the map
 
-DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 DIRECTIONS_STR = [UP, RIGHT, DOWN, LEFT]
 
 
@@ -18,23 +26,21 @@ class Guard:
     Guard class represents the guard in the world.
     """
 
-    def __init__(self, x: int, y: int):
+    def __init__(self, position: int, directions: tuple[int, int, int, int]):
         """
         Constructor for the Guard class.
-        :param x: X coordinate
-        :param y: Y coordinate
+        :param position: Index of the guard's cell in the grid
+        :param directions: Index offsets of the up, right, down and left steps
         """
-        self.x = x
-        self.y = y
+        self.position = position
+        self.directions = directions
         self.direction = 0
 
     def move(self):
         """
         Move the guard in the direction it is facing.
         """
-        x, y = DIRECTIONS[self.direction]
-        self.x += x
-        self.y += y
+        self.position += self.directions[self.direction]
 
     def turn(self):
         """
@@ -42,12 +48,11 @@ class Guard:
         """
         self.direction = (self.direction + 1) % 4
 
-    def position_ahead(self) -> tuple[int, int]:
+    def position_ahead(self) -> int:
         """
         Get the position ahead of the guard.
         """
-        x, y = DIRECTIONS[self.direction]
-        return self.x + x, self.y + y
+        return self.position + self.directions[self.direction]
 
     def __str__(self):
         """
@@ -56,27 +61,6 @@ class Guard:
         return DIRECTIONS_STR[self.direction]
 
 
-class Obstacle:
-    """
-    Obstacle class represents an obstacle in the world.
-    """
-
-    def __init__(self, x, y):
-        """
-        Constructor for the Obstacle class.
-        :param x: X coordinate
-        :param y: Y coordinate
-        """
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        """
-        String representation of the obstacle.
-        """
-        return OBSTACLE
-
-
 class World:
     """
     World-class represents the world the guard is walking in.
@@ -87,44 +71,34 @@ class World:
         Constructor for the World class.
         :param data: List of strings representing the world.
         """
-        self.guard: Guard
-        self.height: int = len(data)
-        self.width: int = len(data[0])
-        self.start: tuple[int, int] = (0, 0)
-        self.obstacles: set = set()
-        self.visited: set = set()
-
-        for i in range(self.height):
-            for j in range(self.width):
-                if data[i][j] == UP:
-                    self.guard = Guard(i, j)
-                    self.start = (i, j)
-                elif data[i][j] == OBSTACLE:
-                    self.obstacles.add(Obstacle(i, j))
+        self.grid = ByteGrid.from_lines(data, border=OUTSIDE)
+        self.height: int = self.grid.height
+        self.width: int = self.grid.width
+        self.start: int = self.grid.find(UP)
+        self.grid[self.start] = NOTHING
+        self.guard = Guard(self.start, self.grid.directions)
+        self.visited: set[int] = set()
 
     def walk(self, add_visit: bool = True):
         """
         Walk the guard in the world.
         """
-        x, y = self.guard.position_ahead()
-
-        if any([o.x == x and o.y == y for o in self.obstacles]):
+        if self.grid[self.guard.position_ahead()] == ord(OBSTACLE):
             self.guard.turn()
             return
 
         if add_visit:
-            visit = (self.guard.x, self.guard.y)
-            if visit not in self.visited:
-                self.visited.add(visit)
+            self.visited.add(self.guard.position)
         self.guard.move()
 
-    def on_map(self, x, y) -> bool:
+    def on_map(self, position: int) -> bool:
         """
-        Check if the given coordinates are on the map.
+        Check if the given position is on the map.
         """
-        return 0 <= x < self.height and 0 <= y < self.width
+        return self.grid[position] != ord(OUTSIDE)
 
-    def check_loop(self, obstacle: tuple[int, int]) -> bool:
+    @counted("day06.check_loop")
+    def check_loop(self, obstacle: int) -> bool:
         """
         Check if there is a loop in the world.
         :param obstacle: Obstacle to be added to create a time paradox.
@@ -133,29 +107,33 @@ class World:
 
         # Reset guard position and direction
         self.guard.direction = 0
-        self.guard.x, self.guard.y = self.start
-
-        # Locations and directions visited
-        states = set()
-
-        while self.on_map(self.guard.x, self.guard.y):
-            # Add visited state
-            states.add(((self.guard.x, self.guard.y), self.guard.direction))
-            # Get position ahead
-
-            # Turn if there is an obstacle or the position ahead is the obstacle
-            while (
-                Obstacle(*self.guard.position_ahead()) in self.obstacles
-                or self.guard.position_ahead() == obstacle
-            ):
-                self.guard.turn()
-
-            # If the position ahead and the direction is in the states, there is a loop
-            if (self.guard.position_ahead(), self.guard.direction) in states:
-                return True
-
-            # Walk without changing the visited set
-            self.walk(add_visit=False)
+        self.guard.position = self.start
+
+        # Directions visited in each location, one bit per direction
+        states = bytearray(len(self.grid))
+        cells = self.grid.cells
+        blocked, outside = ord(OBSTACLE), ord(OUTSIDE)
+
+        # Place the obstacle for this check only
+        original = cells[obstacle]
+        cells[obstacle] = blocked
+        try:
+            while cells[self.guard.position] != outside:
+                # Add visited state
+                states[self.guard.position] |= 1 << self.guard.direction
+
+                # Turn while there is an obstacle ahead
+                while cells[self.guard.position_ahead()] == blocked:
+                    self.guard.turn()
+
+                # If the position ahead and the direction is in the states, there is a loop
+                if states[self.guard.position_ahead()] & (1 << self.guard.direction):
+                    return True
+
+                # Walk without changing the visited set
+                self.guard.move()
+        finally:
+            cells[obstacle] = original
 
         return False
 
@@ -165,27 +143,22 @@ class World:
         :return: Number of obstacles to add.
         """
         obstacles_to_add = 0
-        for obstacle in self.visited:
-            if self.check_loop(obstacle):
-                obstacles_to_add += 1
-                print(".", end="")  # This takes a while
+        # An obstacle can be placed on the guard's path, but not where the guard stands at the start
+        candidates = self.visited - {self.start}
+        with Progress("day06.check_obstacles", len(candidates)) as progress:
+            for obstacle in candidates:
+                if self.check_loop(obstacle):
+                    obstacles_to_add += 1
+                progress.update()
         return obstacles_to_add
 
     def print(self):
         """
         Print the world.
         """
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.guard.x == i and self.guard.y == j:
-                    print(self.guard, end="")
-                elif any([o.x == i and o.y == j for o in self.obstacles]):
-                    print(OBSTACLE, end="")
-                elif (i, j) in self.visited:
-                    print(VISITED, end="")
-                else:
-                    print(NOTHING, end="")
-            print("")
+        marks = [(position, VISITED) for position in self.visited]
+        marks.append((self.guard.position, str(self.guard)))
+        print(frame(self.grid, marks).decode())
         print("\n\n\n")
 
     def print_stats(self):
@@ -197,22 +170,64 @@ class World:
                 "height": self.height,
                 "width": self.width,
                 "visited": len(self.visited),
-                "obstacles": len(self.obstacles),
+                "obstacles": self.grid.count(OBSTACLE),
             }
         )
 
 
-def main():
-    with open(INPUT) as f:
-        data = f.read().splitlines()
+def parse_input(data: bytes | str | None = None) -> list[str]:
+    """
+    Lines of the map, of the input file when no data is given.
+    """
+    return read_text(data, INPUT).splitlines()
+
 
-    world = World(data)
+def patrol(data: list[str] | None = None) -> World:
+    """
+    Walk the guard until it leaves the map.
+    :param data: Lines of the map, read from the input file when None.
+    :return: World with the visited locations.
+    """
+    world = World(parse_input() if data is None else data)
     while True:
         # world.print()
         world.walk()
-        if not world.on_map(world.guard.x, world.guard.y):
+        if not world.on_map(world.guard.position):
+            break
+    return world
+
+
+def frames(data: list[str] | None = None) -> Iterator[bytes]:
+    """
+    Frames of the guard's walk until it leaves the map, one per step or turn.
+    The visited locations are drawn into a copy of the map as the guard leaves them.
+    """
+    world = World(parse_input() if data is None else data)
+    canvas = world.grid.copy()
+    while True:
+        canvas[world.guard.position] = str(world.guard)
+        yield frame(canvas)
+        canvas[world.guard.position] = VISITED
+        world.walk()
+        if not world.on_map(world.guard.position):
             break
 
+
+def part_one(data: list[str] | None = None) -> int:
+    return len(patrol(data).visited)
+
+
+def part_two(data: list[str] | None = None) -> int:
+    return patrol(data).check_obstacles()
+
+
+def solve(data: bytes | str) -> Results:
+    lines = parse_input(data)
+    return Results(part_one(lines), part_two(lines))
+
+
+def main():
+    world = patrol()
     world.print()
     world.print_stats()  # visited: 4647, obstacles: 807
 
@@ -1,12 +1,24 @@
 from collections.abc import Generator
 
+from aoc.instrument import count
+from aoc.parse import Numbers, parse_numbers, read_numbers
+from aoc.progress import Progress
+from aoc.solution import Results
+
 INPUT = "input.txt"
 # INPUT = "input_example.txt"
 
 
-def get_input() -> Generator[tuple[int, list[int]]]:
+def parse_input(data: bytes | str | None = None) -> Numbers:
+    """
+    Parse the equations (of the input file when no data is given) once, shared by both parts
     """
-    Get input from file
+    return read_numbers(INPUT, signed=False) if data is None else parse_numbers(data, signed=False)
+
+
+def get_input(equations: Numbers | None = None) -> Generator[tuple[int, list[int]]]:
+    """
+    Get input from file (or the parsed equations)
 
     Example:
     190: 10 19
@@ -16,20 +28,20 @@ def get_input() -> Generator[tuple[int, list[int]]]:
     (190, [10, 19])
     (3267, [81, 40, 27])
     """
-    with open(INPUT) as file:
-        for line in file.read().splitlines():
-            test_value: int
-            numbers: list[int]
-            test_value_str, numbers_str = line.split(":")
-            test_value = int(test_value_str)
-            numbers = list(map(int, numbers_str.split()))
-            yield test_value, numbers
+    if equations is None:
+        equations = parse_input()
+    for equation in equations:
+        yield equation[0], list(equation[1:])
 
 
 def can_solve(test_value: int, result: int, numbers: list[int], calibrate=False):
     """
     Solve equations using addition (`+`) and multiplication (`*`).
 
+    Depth-first search over the operators with an explicit stack of (result, count of the numbers
+    used). The results never decrease, so a result over the test value is a dead end. The
+    `day07.can_solve` counter counts the popped states, one per call of the recursive search.
+
     :param: calibrate: If True, it will allow to concatenate numbers. Default is False.
 
     Example:
@@ -42,37 +54,63 @@ def can_solve(test_value: int, result: int, numbers: list[int], calibrate=False)
     3267 = 81 * 40 + 27 (or 81 + 40 * 27)
     7290 = 6 * 8 || 6 * 15
     """
-    if result > test_value:
-        return False
-
-    if not numbers:
-        return test_value == result
-
-    number = numbers.pop(0)
-    return any(
-        [
-            can_solve(test_value, result + number, numbers.copy(), calibrate),
-            can_solve(test_value, result * number, numbers.copy(), calibrate),
-            (
-                can_solve(test_value, int(f"{result}{number}"), numbers.copy(), calibrate)
-                if calibrate
-                else False
-            ),
-        ]
-    )
+    # Concatenation `a || b` is `a * 10 ** digits(b) + b`
+    shifts = [10 ** len(str(number)) for number in numbers]
+    stack = [(result, 0)]
+    found = False
+    states = 0
+    while stack:
+        result, used = stack.pop()
+        states += 1
+        if result > test_value:
+            continue
+        if used == len(numbers):
+            if result == test_value:
+                found = True
+                break
+            continue
+        number = numbers[used]
+        stack.append((result + number, used + 1))
+        stack.append((result * number, used + 1))
+        if calibrate:
+            stack.append((result * shifts[used] + number, used + 1))
+    count("day07.can_solve", states)
+    return found
+
+
+def part_one(equations: Numbers | None = None) -> int:
+    if equations is None:
+        equations = parse_input()
+    test_values = 0
+    with Progress("day07.part_one", len(equations)) as progress:
+        for test_value, numbers in get_input(equations):
+            if can_solve(test_value, 0, numbers):
+                test_values += test_value
+            progress.update()
+    return test_values
 
 
-def main():
-    test_values = 0
-    for test_value, numbers in get_input():
-        if can_solve(test_value, 0, numbers):
-            test_values += test_value
-    print(f"Sum of test values: {test_values}")  # 2664460013123
+def part_two(equations: Numbers | None = None) -> int:
+    if equations is None:
+        equations = parse_input()
     test_values_with_calibration = 0
-    for test_value, numbers in get_input():
-        if can_solve(test_value, 0, numbers, calibrate=True):
-            test_values_with_calibration += test_value
-    print(f"Sum of test values with calibration: {test_values_with_calibration}")  # 426214131924213
+    with Progress("day07.part_two", len(equations)) as progress:
+        for test_value, numbers in get_input(equations):
+            if can_solve(test_value, 0, numbers, calibrate=True):
+                test_values_with_calibration += test_value
+            progress.update()
+    return test_values_with_calibration
+
+
+def solve(data: bytes | str) -> Results:
+    equations = parse_input(data)
+    return Results(part_one(equations), part_two(equations))
+
+
+def main():
+    equations = parse_input()
+    print(f"Sum of test values: {part_one(equations)}")  # 2664460013123
+    print(f"Sum of test values with calibration: {part_two(equations)}")  # 426214131924213
 
 
 if __name__ == "__main__":
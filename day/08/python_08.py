@@ -1,6 +1,9 @@
 from collections import defaultdict
 from itertools import combinations
 
+from aoc.grid import ByteGrid
+from aoc.solution import Results, read_text
+
 # INPUT = "input_example.txt"
 INPUT = "input.txt"
 
@@ -9,12 +12,11 @@ ANITONODE = "#"
 EMPTY = "."
 
 
-def read_input() -> list[str]:
+def parse_input(data: bytes | str | None = None) -> list[str]:
     """
-    Read the input file and return a list of strings
+    Lines of the data, of the input file when no data is given
     """
-    with open(INPUT) as f:
-        return f.read().splitlines()
+    return read_text(data, INPUT).splitlines()
 
 
 class Location:
@@ -38,25 +40,23 @@ class World:
     """
 
     def __init__(self, data: list[str]):
-        self.height: int = len(data)
-        self.width: int = len(data[0])
-        self.grid: list[list[str]] = [[EMPTY for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = ByteGrid.from_lines(data)
+        self.height: int = self.grid.height
+        self.width: int = self.grid.width
         self.antennas: dict[str, list[Location]] = defaultdict(list)
-        self.antinodes: set[Location] = set()
+        self.antinodes: set[int] = set()  # Grid indices of the antinodes
 
-        # Initialize the grid with antennas
+        # Collect antennas of the grid (not empty cells)
         for i, row in enumerate(data):
             for j, cell in enumerate(row):
-                # Add antennas to the grid if not empty
                 if cell != EMPTY:
                     self.antennas[cell].append(Location(i, j))
-                    self.grid[i][j] = cell
 
     def on_map(self, location: Location) -> bool:
         """
         Check if the location is on the map
         """
-        return 0 <= location.x < self.height and 0 <= location.y < self.width
+        return self.grid.contains(location.y, location.x)
 
     def add_antinodes(self, location: Location, direction: Location, start: int = 1, stop: int = 2):
         """
@@ -69,11 +69,14 @@ class World:
         """
         for i in range(start, stop):
             ax, ay = location.x + (i * direction.x), location.y + (i * direction.y)
-            if self.on_map(Location(ax, ay)):
-                # Antinodes can't overlap each other
-                if self.grid[ax][ay] != ANITONODE:
-                    self.antinodes.add(Location(ax, ay))
-                    self.grid[ax][ay] = "#"
+            if not self.grid.contains(ay, ax):
+                # The next antinodes are even further away
+                break
+            index = self.grid.index(ay, ax)
+            # Antinodes can't overlap each other
+            if self.grid[index] != ord(ANITONODE):
+                self.antinodes.add(index)
+                self.grid[index] = ANITONODE
 
     def deploy_antinodes(self, resonant_harmonics=False):
         """
@@ -98,20 +101,33 @@ class World:
         """
         Print the grid
         """
-        for row in self.grid:
-            print("".join(row))
+        print(self.grid)
         print("")
 
 
-def main():
-    data = read_input()
-    world = World(data)
+def part_one(data: list[str] | None = None) -> int:
+    world = World(parse_input() if data is None else data)
     world.deploy_antinodes()
     # world.print()
-    print(f"Lenght of antinodes: {len(world.antinodes)}")  # 332
+    return len(world.antinodes)
+
+
+def part_two(data: list[str] | None = None) -> int:
+    world = World(parse_input() if data is None else data)
     world.deploy_antinodes(resonant_harmonics=True)
     # world.print()
-    print(f"Lenght of antinodes: {len(world.antinodes)}")  # 1174
+    return len(world.antinodes)
+
+
+def solve(data: bytes | str) -> Results:
+    lines = parse_input(data)
+    return Results(part_one(lines), part_two(lines))
+
+
+def main():
+    lines = parse_input()
+    print(f"Lenght of antinodes: {part_one(lines)}")  # 332
+    print(f"Lenght of antinodes: {part_two(lines)}")  # 1174
 
 
 if __name__ == "__main__":
@@ -1,13 +1,14 @@
+from aoc.solution import Results, read_text
+
 # INPUT = "input_example.txt"
 INPUT = "input.txt"
 
 
-def read_input() -> str:
+def parse_input(data: bytes | str | None = None) -> str:
     """
-    Read the input file and return the first line.
+    Return the first line of the data (of the input file when no data is given).
     """
-    with open(INPUT) as f:
-        return f.read().splitlines()[0]
+    return read_text(data, INPUT).splitlines()[0]
 
 
 def decode_blocks(blocks: str) -> list[int | None]:
@@ -114,18 +115,30 @@ def checksum_blocks(blocks: list[int | None]) -> int:
     return result
 
 
-def main():
-    blocks = read_input()
-    decoded = decode_blocks(blocks)
+def part_one(blocks: str | None = None) -> int:
+    decoded = decode_blocks(parse_input() if blocks is None else blocks)
     # print(decoded)
-    defragmented = defragment(decoded.copy())
+    defragmented = defragment(decoded)
     # print(defragmented)
-    checksum = checksum_blocks(defragmented)
-    print(f"Checksum: {checksum}")
-    defragment_whole = defragment_whole_blocks(decoded.copy())
+    return checksum_blocks(defragmented)
+
+
+def part_two(blocks: str | None = None) -> int:
+    decoded = decode_blocks(parse_input() if blocks is None else blocks)
+    defragment_whole = defragment_whole_blocks(decoded)
     # print(defragment_whole)
-    checksum_whole = checksum_blocks(defragment_whole)
-    print(f"Checksum whole: {checksum_whole}")
+    return checksum_blocks(defragment_whole)
+
+
+def solve(data: bytes | str) -> Results:
+    blocks = parse_input(data)
+    return Results(part_one(blocks), part_two(blocks))
+
+
+def main():
+    blocks = parse_input()
+    print(f"Checksum: {part_one(blocks)}")  # 6359213660505
+    print(f"Checksum whole: {part_two(blocks)}")  # 6381624803796
 
 
 if __name__ == "__main__":
@@ -1,82 +1,98 @@
+from collections import Counter
+
+from aoc.bitboard import Bitboard
+from aoc.grid import ByteGrid
+from aoc.solution import Results, read_text
+
 # INPUT = "input_example.txt"
 INPUT = "input.txt"
 
-DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+TRAILHEAD = ord("0")
+SUMMIT = ord("9")
 
 
-def read_input() -> list[list[int]]:
-    with open(INPUT) as f:
-        return [[int(c) for c in line] for line in f.read().splitlines()]
+def parse_input(data: bytes | str | None = None) -> list[str]:
+    return read_text(data, INPUT).splitlines()
 
 
 class Grid:
-    def __init__(self, grid: list[list[int]]):
-        self.height = len(grid)
-        self.width = len(grid[0])
-        self.grid = grid
+    def __init__(self, grid: list[str]):
+        # Heights are stored as digit characters, the border ("." < "0") is never a next step
+        self.grid = ByteGrid.from_lines(grid, border=".")
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.board = Bitboard(self.grid)
+        # Bitboards of the cells of every height
+        self.heights = {height: self.board.cells(bytes([height])) for height in range(TRAILHEAD, SUMMIT + 1)}
 
     def __str__(self):
-        return "\n".join("".join(str(c) for c in line) for line in self.grid)
+        return str(self.grid)
 
-    def on_map(self, x: int, y: int) -> bool:
+    def get_trailheads_start(self) -> list[int]:
         """
-        Check if x, y is on the map
+        Return positions of 0s in the grid
         """
-        return 0 <= x < self.width and 0 <= y < self.height
+        return list(self.grid.find_all(TRAILHEAD))
 
-    def get_trailheads_start(self) -> list[tuple[int, int]]:
-        """
-        Return location of 0s in the grid
-        """
-        return [(x, y) for y in range(self.height) for x in range(self.width) if self.grid[y][x] == 0]
-
-    def get_neighbors(self, x, y, visited=None) -> list[tuple[int, int]]:
+    def get_neighbors(self, position: int) -> list[int]:
         """
         Get neighbors of a cell that applies
         """
+        cells = self.grid.cells
         return [
-            (x + dx, y + dy)
-            for dx, dy in DIRECTIONS
-            if self.on_map(x + dx, y + dy)  # On the map
-            and self.grid[y + dy][x + dx] == self.grid[y][x] + 1  # Next cell == current + 1
-            and (visited is None or not visited[y + dy][x + dx])  # Not visited, if applicable
+            position + offset
+            for offset in self.grid.directions
+            if cells[position + offset] == cells[position] + 1  # Next cell == current + 1
         ]
 
-    def analyze_path(self, x: int, y: int, visited=None) -> int:
+    def analyze_path(self, position: int) -> int:
         """
-        Analyze the path starting at x, y
+        Analyze the path starting at the position: number of summits reachable from it
+
+        Every step goes one height up, so the positions reachable in `n` steps all have the same
+        height and the trails are walked level by level up to the summits, with all positions of a
+        level as one bitboard.
         """
-        if visited is None:
-            visited = [[False for _ in range(self.width)] for _ in range(self.height)]
-        current = self.grid[y][x]
-        visited[y][x] = True
-        if current == 9:
-            return 1
-
-        return sum(
-            self.analyze_path(dx, dy, visited=visited) for dx, dy in self.get_neighbors(x, y, visited=visited)
-        )
-
-    def analyze_rating(self, x: int, y: int) -> int:
+        reachable = self.board.bit(position)
+        for height in range(self.grid[position] + 1, SUMMIT + 1):
+            reachable = self.board.neighbors(reachable) & self.heights[height]
+        return reachable.bit_count()
+
+    def analyze_rating(self, position: int) -> int:
         """
-        Analyze the path ratings starting at x, y
+        Analyze the path ratings starting at the position: number of distinct trails to the summits
+
+        Level by level like `analyze_path`, counting the trails leading to every position.
         """
-        current = self.grid[y][x]
-        if current == 9:
-            return 1
+        trails = Counter({position: 1})
+        for _ in range(SUMMIT - self.grid[position]):
+            next_trails: Counter[int] = Counter()
+            for current, count in trails.items():
+                for neighbor in self.get_neighbors(current):
+                    next_trails[neighbor] += count
+            trails = next_trails
+        return sum(trails.values())
+
+
+def part_one(data: list[str] | None = None) -> int:
+    grid = Grid(parse_input() if data is None else data)
+    return sum(grid.analyze_path(position) for position in grid.get_trailheads_start())
+
+
+def part_two(data: list[str] | None = None) -> int:
+    grid = Grid(parse_input() if data is None else data)
+    return sum(grid.analyze_rating(position) for position in grid.get_trailheads_start())
+
 
-        return sum(self.analyze_rating(dx, dy) for dx, dy in self.get_neighbors(x, y))
+def solve(data: bytes | str) -> Results:
+    lines = parse_input(data)
+    return Results(part_one(lines), part_two(lines))
 
 
 def main():
-    score, rating = 0, 0
-    data = read_input()
-    grid = Grid(data)
-    for x, y in grid.get_trailheads_start():
-        score += grid.analyze_path(x, y)
-        rating += grid.analyze_rating(x, y)
-    print(f"Summary of path score is: {score}")  # 646
-    print(f"Summary of path rating is: {rating}")  # 23364
+    lines = parse_input()
+    print(f"Summary of path score is: {part_one(lines)}")  # 646
+    print(f"Summary of path rating is: {part_two(lines)}")  # 1494
 
 
 if __name__ == "__main__":
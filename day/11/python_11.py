@@ -1,17 +1,20 @@
 from collections import Counter
 
+from aoc.parse import parse_numbers, read_numbers
+from aoc.solution import Results
+
 # INPUT = "input_example.txt"
 INPUT = "input.txt"
 
 MULTIPLY_BY = 2024
 
 
-def read_input() -> list[int]:
+def parse_input(data: bytes | str | None = None) -> list[int]:
     """
-    Read input file and return list of integers, graved into the stones
+    Return list of integers graved into the stones, read from the input file when no data is given
     """
-    with open(INPUT) as file:
-        return [int(char) for char in file.readline().split()]
+    numbers = read_numbers(INPUT, signed=False) if data is None else parse_numbers(data, signed=False)
+    return list(numbers[0])
 
 
 def transform_stones(counter: Counter) -> Counter:
@@ -49,13 +52,23 @@ def transform(data: list[int], iterations: int) -> Counter:
     return counter
 
 
-def main():
-    data = read_input()
-    stone_counts = transform(data, 25)
-    print(f"Number of stones after 25 transformations: {sum(stone_counts.values())}")  # 193269
+def part_one(stones: list[int] | None = None) -> int:
+    return sum(transform(parse_input() if stones is None else stones, 25).values())
+
+
+def part_two(stones: list[int] | None = None) -> int:
+    return sum(transform(parse_input() if stones is None else stones, 75).values())
 
-    stone_counts = transform(data, 75)
-    print(f"Number of stones after 75 transformations: {sum(stone_counts.values())}")  # 228449040027793
+
+def solve(data: bytes | str) -> Results:
+    stones = parse_input(data)
+    return Results(part_one(stones), part_two(stones))
+
+
+def main():
+    stones = parse_input()
+    print(f"Number of stones after 25 transformations: {part_one(stones)}")  # 193269
+    print(f"Number of stones after 75 transformations: {part_two(stones)}")  # 228449040027793
 
 
 if __name__ == "__main__":
@@ -1,116 +1,186 @@
+from collections.abc import Iterator
+
+from aoc.bitboard import Bitboard
+from aoc.grid import ByteGrid
+from aoc.solution import Results, read_text
+
 # INPUT = "input_example_small.txt"  # 140, 80
 # INPUT = "input_example.txt"  # 1930, 1206
 INPUT = "input.txt"
 
+SMALL_REGION = 8  # Regions under (row length / SMALL_REGION) cells are searched cell by cell
+
 
-def read_input():
-    with open(INPUT) as f:
-        return [line.strip() for line in f.readlines()]
+def parse_input(data: bytes | str | None = None) -> list[str]:
+    return [line.strip() for line in read_text(data, INPUT).splitlines()]
 
 
 class Grid:
-    def __init__(self, grid):
-        self.grid = grid
-        self.width = len(grid[0])
-        self.height = len(grid)
-        self.directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
-        self.corner_directions = [
-            (-1, -1),  # Up-Left
-            (1, -1),  # Up-Right
-            (-1, 1),  # Down-Left
-            (1, 1),  # Down-Right
-        ]
-        self.visited = [[False for _ in range(self.width)] for _ in range(self.height)]
-
-    def on_map(self, x: int, y: int) -> bool:
+    def __init__(self, grid: list[str]):
+        # Plants are letters, the border (".") never belongs to a region
+        self.grid = ByteGrid.from_lines(grid, border=".")
+        self.board = Bitboard(self.grid)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.directions = self.grid.directions  # Up, Right, Down, Left
+        # Masks as bytes (bit `i & 7` of byte `i >> 3` is the cell `i`), cropped to the rows of a region
+        self.size = (len(self.grid) >> 3) + 1
+        self.plants: dict[int, bytes] = {}  # plant -> mask of its cells
+        self.remaining = bytearray(self.board.inside.to_bytes(self.size, "little"))  # Cells in no region yet
+
+    def starts(self) -> Iterator[int]:
         """
-        Check if the position is on the map
+        The first cell not in any region found so far, until every cell is in a found region
         """
-        return 0 <= x < self.width and 0 <= y < self.height
+        remaining = self.remaining
+        for byte in range(self.size):
+            # The bits of the byte are cleared by `find_region`
+            while bits := remaining[byte]:
+                yield (byte << 3) + (bits & -bits).bit_length() - 1
 
-    def get_neighbors(self, x: int, y: int) -> list[tuple[int, int]]:
+    def find_region(self, position: int) -> tuple[int, int]:
         """
-        Get neighbors of the given position
+        Find the region of the given position, as a bitboard of its own layout and the row length
+        (stride) of the layout. All cells before the position must be in the regions found before.
+
+        A region costs its size, not the size of the grid: small regions (compared to the rows) are
+        searched cell by cell into a bitboard of their bounding box, larger ones by bitboard layers
+        cropped to their rows.
         """
-        return [
-            (x + dx, y + dy)
-            for dx, dy in self.directions
-            if self.on_map(x + dx, y + dy)
-            and self.grid[y + dy][x + dx] == self.grid[y][x]
-            and not self.visited[y + dy][x + dx]
-        ]
-
-    def find_region(self, x: int, y: int) -> set[tuple[int, int]]:
+        plant = self.grid[position]
+        cells, remaining = self.grid.cells, self.remaining
+        remaining[position >> 3] ^= 1 << (position & 7)
+        region = [position]
+        stack = [position]
+        while stack and len(region) * SMALL_REGION < self.grid.stride:
+            current = stack.pop()
+            for offset in self.directions:
+                neighbor = current + offset
+                if cells[neighbor] == plant and remaining[neighbor >> 3] >> (neighbor & 7) & 1:
+                    remaining[neighbor >> 3] ^= 1 << (neighbor & 7)
+                    region.append(neighbor)
+                    stack.append(neighbor)
+        if stack:
+            return self.flood_region(plant, region), self.grid.stride
+
+        # Bounding box of the region with an empty column on its right, the fence between the rows
+        rows = [divmod(cell, self.grid.stride) for cell in region]
+        top = min(y for y, _ in rows)
+        left = min(x for _, x in rows)
+        stride = max(x for _, x in rows) - left + 2
+        mask = 0
+        for y, x in rows:
+            mask |= 1 << ((y - top) * stride + x - left)
+        return mask, stride
+
+    def flood_region(self, plant: int, region: list[int]) -> int:
         """
-        Find the region of the given position
+        Go on with the search of a large region from its cells found so far (the first one is the
+        lowest cell of the region), by bitboard layers in a window of rows from the first cell on.
+        The window grows while the region reaches its last row.
+        :return: Bitboard of the region, bit `i` is the cell `(region[0] >> 3 << 3) + i`
         """
-        region = {(x, y)}
-        self.visited[y][x] = True
-
-        for dx, dy in self.get_neighbors(x, y):
-            region.update(self.find_region(dx, dy))
-
-        return set(region)
-
-    def calculate_perimeter(self, region: set[tuple[int, int]]) -> int:
+        if plant not in self.plants:
+            self.plants[plant] = self.board.cells(bytes([plant])).to_bytes(self.size, "little")
+        cells = self.plants[plant]
+        start = region[0] >> 3
+        seed = bytearray(self.size - start)
+        for cell in region:
+            cell -= start << 3
+            seed[cell >> 3] |= 1 << (cell & 7)
+        rows = (max(region) - region[0]) // self.grid.stride + 2
+        mask = int.from_bytes(seed, "little")
+        while True:
+            end = min(start + (rows * self.grid.stride >> 3) + 1, self.size)
+            mask = self.board.flood(mask, int.from_bytes(cells[start:end], "little"))
+            if end == self.size or mask.bit_length() <= ((end - start) << 3) - self.grid.stride:
+                break
+            rows *= 2
+        remaining = int.from_bytes(self.remaining[start:end], "little") & ~mask
+        self.remaining[start:end] = remaining.to_bytes(end - start, "little")
+        return mask
+
+    @staticmethod
+    def calculate_perimeter(region: int, stride: int) -> int:
         """
-        Calculate the perimeter of the region
+        Calculate the perimeter of the region, laid out in rows of `stride` cells
         """
         perimeter = 0
 
-        for x, y in region:
-            for dx, dy in self.directions:
-                if (x + dx, y + dy) not in region:
-                    perimeter += 1
+        for offset in (-stride, 1, stride, -1):
+            # Cells of the region without the region on the other side of the fence
+            perimeter += (region & ~Bitboard.shift(region, -offset)).bit_count()
         return perimeter
 
-    def calculate_corners(self, region: set[tuple[int, int]]) -> int:
+    @staticmethod
+    def calculate_corners(region: int, stride: int) -> int:
         """
-        Calculate the corners of the region
+        Calculate the corners of the region, laid out in rows of `stride` cells
         """
         corners = 0
 
-        for x, y in region:
-            for dx, dy in self.corner_directions:
+        # Horizontal and vertical offsets of the corners: Up-Left, Up-Right, Down-Left, Down-Right
+        for dx, dy in ((-1, -stride), (1, -stride), (-1, stride), (1, stride)):
+            # Cells of the region with the region in the horizontal, vertical and diagonal direction
+            horizontal = Bitboard.shift(region, -dx)
+            vertical = Bitboard.shift(region, -dy)
+            diagonal = Bitboard.shift(region, -dx - dy)
 
-                # Inner corners
-                if (x + dx, y) in region and (x, y + dy) in region and (x + dx, y + dy) not in region:
-                    corners += 1
+            # Inner corners
+            corners += (region & horizontal & vertical & ~diagonal).bit_count()
 
-                # Outer corners
-                if (x + dx, y) not in region and (x, y + dy) not in region:
-                    corners += 1
+            # Outer corners
+            corners += (region & ~horizontal & ~vertical).bit_count()
 
         return corners
 
     def print(self):
-        for row in self.grid:
-            print(row)
+        print(self.grid)
         print()
 
 
-def main():
-    grid = Grid(read_input())
+def total_prices(data: list[str] | None = None) -> tuple[int, int]:
+    """
+    Sum the fence prices of all regions, by perimeter and by corners (sides)
+    """
+    grid = Grid(parse_input() if data is None else data)
     # grid.print()
     perimeter_price_sum, corner_price_sum = 0, 0
 
-    for y in range(grid.height):
-        for x in range(grid.width):
-            if not grid.visited[y][x]:
-                region = grid.find_region(x, y)
-                perimeter = grid.calculate_perimeter(region)
-                corners = grid.calculate_corners(region)
+    for position in grid.starts():
+        region, stride = grid.find_region(position)
+        perimeter = grid.calculate_perimeter(region, stride)
+        corners = grid.calculate_corners(region, stride)
+
+        area = region.bit_count()
+        perimeter_price = perimeter * area
+        corner_price = corners * area
 
-                perimeter_price = perimeter * len(region)
-                corner_price = corners * len(region)
+        perimeter_price_sum += perimeter_price
+        corner_price_sum += corner_price
 
-                perimeter_price_sum += perimeter_price
-                corner_price_sum += corner_price
+        # print(f"Perimeter price: {perimeter_price}, Corner price: {corner_price} Area: {area}")
 
-                # print(f"Perimeter price: {perimeter_price}, Corner price: {corner_price} Region: {region}")
+    return perimeter_price_sum, corner_price_sum
 
-    print(f"Total perimeter price: {perimeter_price_sum}")
-    print(f"Total corner price: {corner_price_sum}")
+
+def part_one(data: list[str] | None = None) -> int:
+    return total_prices(data)[0]
+
+
+def part_two(data: list[str] | None = None) -> int:
+    return total_prices(data)[1]
+
+
+def solve(data: bytes | str) -> Results:
+    # Both prices come from the same walk over the regions
+    return Results(*total_prices(parse_input(data)))
+
+
+def main():
+    perimeter_price_sum, corner_price_sum = total_prices()
+    print(f"Total perimeter price: {perimeter_price_sum}")  # 1431316
+    print(f"Total corner price: {corner_price_sum}")  # 821428
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from collections.abc import Generator
 
+from aoc.parse import Numbers, parse_numbers, read_numbers
+from aoc.solution import Results
+
 # INPUT = "input_example.txt"
 INPUT = "input.txt"
 
@@ -9,9 +12,19 @@ A_TOKENS = 3
 B_TOKENS = 1
 
 
-def read_input(shift: int = 0) -> Generator[ClawMachine]:
+def parse_input(data: bytes | str | None = None) -> Numbers:
+    """
+    Parse the machines (of the input file when no data is given) once, shared by both parts.
+    One record per machine: a_x, a_y, b_x, b_y, prize_x, prize_y
+    """
+    if data is None:
+        return read_numbers(INPUT, separator=b"\n\n", signed=False)
+    return parse_numbers(data, separator=b"\n\n", signed=False)
+
+
+def read_input(shift: int = 0, machines: Numbers | None = None) -> Generator[ClawMachine]:
     """
-    Read the input file and return a generator of ClawMachine objects
+    Read the input file (or the parsed machines) and return a generator of ClawMachine objects
 
     Example:
         Button A: X+94, Y+34
@@ -21,16 +34,10 @@ def read_input(shift: int = 0) -> Generator[ClawMachine]:
     Result:
         ClawMachine(a=Point(x=94, y=34), b=Point(x=22, y=67), prize=Point(x=8400, y=5400))
     """
-    with open(INPUT) as f:
-        for data in f.read().split("\n\n"):
-            button_a, button_b, prize = data.strip().split("\n")
-            _button, _a, x, y = button_a.split()
-            a = Point(int(x[1:-1]), int(y[1:]))
-            _button, _b, x, y = button_b.split()
-            b = Point(int(x[1:-1]), int(y[1:]))
-            _prize, x, y = prize.split()
-            p = Point(int(x[2:-1]) + shift, int(y[2:]) + shift)
-            yield ClawMachine(a, b, p)
+    if machines is None:
+        machines = parse_input()
+    for a_x, a_y, b_x, b_y, prize_x, prize_y in machines:
+        yield ClawMachine(Point(a_x, a_y), Point(b_x, b_y), Point(prize_x + shift, prize_y + shift))
 
 
 class Point:
@@ -61,9 +68,10 @@ class ClawMachine:
         b_a = self.b.x * self.a.y - self.b.y * self.a.x
         return prize_b / a_b, prize_a / b_a
 
-    def solve(self) -> int | None:
+    def solve(self) -> int:
         """
         Solve the claw machine problem
+        :return: Tokens needed to win the prize, 0 if it can not be won
         """
         a_times, b_times = self.min_tokens()
 
@@ -78,18 +86,24 @@ class ClawMachine:
         return int(a_times * A_TOKENS + b_times * B_TOKENS)
 
 
-def main():
-    tokens, shifted_tokens = 0, 0
-    for machine in read_input():
-        tokens += machine.solve()
+def part_one(machines: Numbers | None = None) -> int:
+    return sum(machine.solve() for machine in read_input(machines=machines))
 
-    print(f"Tokens needed for game: {tokens}")  # 37128
 
+def part_two(machines: Numbers | None = None) -> int:
     # Part 2, the prize is shifted by 10000000000000 in both directions
-    for machine in read_input(shift=10000000000000):
-        shifted_tokens += machine.solve()
+    return sum(machine.solve() for machine in read_input(shift=10000000000000, machines=machines))
+
+
+def solve(data: bytes | str) -> Results:
+    machines = parse_input(data)
+    return Results(part_one(machines), part_two(machines))
 
-    print(f"Tokens needed for game with shifted prize: {shifted_tokens}")  # 74914228471331
+
+def main():
+    machines = parse_input()
+    print(f"Tokens needed for game: {part_one(machines)}")  # 37128
+    print(f"Tokens needed for game with shifted prize: {part_two(machines)}")  # 74914228471331
 
 
 if __name__ == "__main__":
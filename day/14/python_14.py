@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
+from collections.abc import Iterator
+
+from aoc.parse import Numbers, parse_numbers, read_numbers
+from aoc.render import plot
+from aoc.solution import Results
 
 # INPUT = "input_example.txt"
 # WIDTH = 11
@@ -10,46 +13,58 @@ INPUT = "input.txt"
 WIDTH = 101
 HEIGHT = 103
 
-PATTERN = re.compile(r"p=(?P<px>-?\d+),(?P<py>-?\d+) v=(?P<vx>-?\d+),(?P<vy>-?\d+)")
+
+def parse_input(data: bytes | str | None = None) -> Numbers:
+    """
+    Parse the robots (of the input file when no data is given) once, shared by both parts.
+    One record per robot: `p=px,py v=vx,vy`
+    """
+    return read_numbers(INPUT) if data is None else parse_numbers(data)
 
 
-def read_input() -> list[Robot]:
-    result: list[Robot] = []
-    with open(INPUT) as f:
-        for line in f:
-            match = PATTERN.match(line)
-            if match:
-                px, py, vx, vy = map(int, match.groups())
-                result.append(Robot(position=Point(x=px, y=py), velocity=Point(x=vx, y=vy)))
-    return result
+def read_input(robots: Numbers | None = None) -> list[Robot]:
+    """
+    Robots at their initial positions, created from the parsed input as they move
+    """
+    if robots is None:
+        robots = parse_input()
+    return [Robot(position=Point(x=px, y=py), velocity=Point(x=vx, y=vy)) for px, py, vx, vy in robots]
 
 
-@dataclass
 class Point:
-    x: int
-    y: int
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+
+    def __repr__(self):
+        return f"Point(x={self.x}, y={self.y})"
 
 
-@dataclass
 class Robot:
-    position: Point
-    velocity: Point
+    def __init__(self, position: Point, velocity: Point):
+        self.position = position
+        self.velocity = velocity
 
-    def move(self):
-        self.position.x = (self.position.x + self.velocity.x) % WIDTH
-        self.position.y = (self.position.y + self.velocity.y) % HEIGHT
+    def __repr__(self):
+        return f"Robot(position={self.position}, velocity={self.velocity})"
+
+    def move(self, width: int = WIDTH, height: int = HEIGHT):
+        self.position.x = (self.position.x + self.velocity.x) % width
+        self.position.y = (self.position.y + self.velocity.y) % height
 
 
-@dataclass
 class World:
-    robots: list[Robot]
+    def __init__(self, robots: list[Robot], width: int = WIDTH, height: int = HEIGHT):
+        self.robots = robots
+        self.width = width
+        self.height = height
 
     def tick(self):
         for robot in self.robots:
-            robot.move()
+            robot.move(self.width, self.height)
 
     def get_world(self) -> list[list[int]]:
-        result = [[0] * WIDTH for _ in range(HEIGHT)]
+        result = [[0] * self.width for _ in range(self.height)]
         for robot in self.robots:
             result[robot.position.y][robot.position.x] += 1
         return result
@@ -59,8 +74,8 @@ class World:
 
     def count_quarters(self) -> tuple[int, int, int, int]:
         world = self.get_world()
-        half_height = HEIGHT // 2
-        half_width = WIDTH // 2
+        half_height = self.height // 2
+        half_width = self.width // 2
         top, bottom = world[:half_height], world[half_height + 1 :]
         q1 = [i[:half_width] for i in top]
         q2 = [i[half_width + 1 :] for i in top]
@@ -68,29 +83,66 @@ class World:
         q4 = [i[half_width + 1 :] for i in bottom]
         return self.sum_q(q1), self.sum_q(q2), self.sum_q(q3), self.sum_q(q4)
 
+    def no_overlaps(self) -> bool:
+        return len({(robot.position.x, robot.position.y) for robot in self.robots}) == len(self.robots)
+
+    def frame(self) -> bytes:
+        points = (robot.position.y * self.width + robot.position.x for robot in self.robots)
+        return plot(self.width, self.height, points)
+
     def print(self):
-        result = ""
-        for line in self.get_world():
-            for cell in line:
-                result += "#" if cell else "."
-            result += "\n"
-        print(result)
+        print(self.frame().decode())
+        print()
 
 
-def main():
-    world = World(robots=read_input())
+def frames(robots: Numbers | None = None, width: int = WIDTH, height: int = HEIGHT) -> Iterator[bytes]:
+    """
+    Frames of the robots from the start until their positions repeat
+    """
+    world = World(robots=read_input(robots), width=width, height=height)
+    yield world.frame()
+    for _ in range(width * height - 1):
+        world.tick()
+        yield world.frame()
+
+
+def part_one(robots: Numbers | None = None, width: int = WIDTH, height: int = HEIGHT) -> int:
+    world = World(robots=read_input(robots), width=width, height=height)
     for _ in range(100):
         world.tick()
-    world.print()
     q1, q2, q3, q4 = world.count_quarters()
-    safety_factory = q1 * q2 * q3 * q4
-    print(f"Part 1: {safety_factory}")
+    return q1 * q2 * q3 * q4
+
+
+def part_two(robots: Numbers | None = None, width: int = WIDTH, height: int = HEIGHT) -> int | None:
     # In part 2 I've noticed some pattern in the output when I used `if i % 103 == 22:`
-    world = World(robots=read_input())
-    for i in range(1, 8160):
+    # The easter egg (8159) is the first frame where no robots overlap each other
+    world = World(robots=read_input(robots), width=width, height=height)
+    for i in range(1, width * height + 1):
+        world.tick()
+        if world.no_overlaps():
+            return i
+    # The robots repeat after width * height seconds, e.g. random ones never draw the easter egg
+    return None
+
+
+def solve(data: bytes | str, width: int = WIDTH, height: int = HEIGHT) -> Results:
+    robots = parse_input(data)
+    return Results(part_one(robots, width, height), part_two(robots, width, height))
+
+
+def main():
+    robots = parse_input()
+    print(f"Part 1: {part_one(robots)}")  # 231852216
+    easter_egg = part_two(robots)
+    if easter_egg is None:
+        print("Part 2: the robots never draw the easter egg")
+        return
+    world = World(robots=read_input(robots))
+    for _ in range(easter_egg):
         world.tick()
     world.print()
-    print("Part 2: 8159")
+    print(f"Part 2: {easter_egg}")  # 8159
 
 
 if __name__ == "__main__":
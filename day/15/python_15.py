@@ -1,4 +1,8 @@
-from collections import namedtuple
+from collections.abc import Iterator
+
+from aoc.grid import ByteGrid
+from aoc.render import frame
+from aoc.solution import Results, read_text
 
 # INPUT = "input_example_small.txt"
 # INPUT = "input_example.txt"
@@ -13,76 +17,96 @@ ROBOT = "@"
 DIRECTIONS = {"^": (0, -1), ">": (1, 0), "v": (0, 1), "<": (-1, 0)}
 
 
-def get_input() -> tuple[list[list[str]], str]:
-    with open(INPUT) as f:
-        data = f.read()
-        map_data, instructions = data.split("\n\n")
-        instructions = "".join(instructions.splitlines())
-        return [list(line.strip()) for line in map_data.splitlines()], instructions
-
-
-Location = namedtuple("Location", ["x", "y"])
+def parse_input(data: bytes | str | None = None) -> tuple[list[str], str]:
+    map_data, instructions = read_text(data, INPUT).split("\n\n")
+    instructions = "".join(instructions.splitlines())
+    return [line.strip() for line in map_data.splitlines()], instructions
 
 
 class World:
-    def __init__(self, map_data: list[list[str]]):
-        self.height = len(map_data)
-        self.width = len(map_data[0])
-        self.map = map_data
+    def __init__(self, map_data: list[str]):
+        self.map = ByteGrid.from_lines(map_data, border=WALL)
+        self.height = self.map.height
+        self.width = self.map.width
+        # Index offsets of the robot's moves
+        self.directions = {key: dy * self.map.stride + dx for key, (dx, dy) in DIRECTIONS.items()}
 
-        for y, row in enumerate(map_data):
-            for x, cell in enumerate(row):
-                if cell == ROBOT:
-                    self.robot = Location(x, y)
-                    self.map[y][x] = EMPTY
+        self.robot = self.map.find(ROBOT)
+        self.map[self.robot] = EMPTY
 
     def __str__(self):
-        map_data = [line.copy() for line in self.map]
-        map_data[self.robot.y][self.robot.x] = ROBOT
-        return "\n".join(["".join(row) for row in map_data])
+        return self.frame().decode()
+
+    def frame(self) -> bytes:
+        return frame(self.map, [(self.robot, ROBOT)])
 
     def sum_box_gps(self):
         result = 0
-        for y, row in enumerate(self.map):
-            for x, cell in enumerate(row):
-                if cell == BOX:
-                    result += (100 * y) + x
+        for box in self.map.find_all(BOX):
+            x, y = self.map.coords(box)
+            result += (100 * y) + x
         return result
 
     def move_robot(self, direction: str):
-        dx, dy = DIRECTIONS[direction]
-        new_robot_pos = p = Location(self.robot.x + dx, self.robot.y + dy)
+        offset = self.directions[direction]
+        cells = self.map.cells
+        new_robot_pos = p = self.robot + offset
 
-        if self.map[p.y][p.x] == WALL:
+        if cells[p] == ord(WALL):
             # Do not move into walls
             return
 
-        while self.map[p.y][p.x] == BOX:
+        while cells[p] == ord(BOX):
             # Check all boxes can be moved together
-            new_box_pos = Location(p.x + dx, p.y + dy)
-            if self.map[new_box_pos.y][new_box_pos.x] == WALL:
+            new_box_pos = p + offset
+            if cells[new_box_pos] == ord(WALL):
                 return
             p = new_box_pos
 
         while p != self.robot:
             # Swap boxes with empty space (in opposite direction)
-            d = Location(p.x - dx, p.y - dy)
-            self.map[p.y][p.x], self.map[d.y][d.x] = self.map[d.y][d.x], self.map[p.y][p.x]
+            d = p - offset
+            cells[p], cells[d] = cells[d], cells[p]
             p = d
 
         self.robot = new_robot_pos
 
 
-def main():
-    map_data, instructions = get_input()
+def run_robot(data: tuple[list[str], str] | None = None) -> World:
+    map_data, instructions = parse_input() if data is None else data
     world = World(map_data)
     for idx, instruction in enumerate(instructions, start=1):
         # print(f"Move {instruction}\t{idx}")
         world.move_robot(instruction)
+    return world
+
 
+def frames(data: tuple[list[str], str] | None = None) -> Iterator[bytes]:
+    """
+    Frames of the warehouse from the start, one after every move of the robot
+    """
+    map_data, instructions = parse_input() if data is None else data
+    world = World(map_data)
+    yield world.frame()
+    for instruction in instructions:
+        world.move_robot(instruction)
+        yield world.frame()
+
+
+def part_one(data: tuple[list[str], str] | None = None) -> int:
+    return run_robot(data).sum_box_gps()
+
+
+def solve(data: bytes | str) -> Results:
+    # The second part is not solved
+    return Results(part_one(parse_input(data)), None)
+
+
+def main():
+    world = run_robot()
     print(world)
     print()
-    print(f"Sum of box GPS: {world.sum_box_gps()}")
+    print(f"Sum of box GPS: {world.sum_box_gps()}")  # 1318523
 
 
 if __name__ == "__main__":
@@ -1,99 +1,78 @@
-import heapq
-from collections import defaultdict, deque
-from dataclasses import dataclass
+from array import array
+
+from aoc.grid import ByteGrid
+from aoc.search import INFINITY, SearchResult, shortest_paths
+from aoc.solution import Results, read_text
 
 INPUT = "input.txt"  # 65436, 489
 # INPUT = "input_example.txt"  # 11048, 64
 # INPUT = "input_example_small.txt"  # 7036, 45
 
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # right, down, left, up
-
-
-def read_input() -> list[str]:
-    with open(INPUT) as f:
-        return f.read().splitlines()
-
-
-def float_inf() -> float:
-    return float("inf")
-
-
-@dataclass
-class Point:
-    x: int
-    y: int
+WALL = "#"
+MOVE_COST = 1
+ROTATION_COST = 1000
 
-    def __add__(self, other):
-        return Point(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other):
-        return Point(self.x - other.x, self.y - other.y)
-
-    def __repr__(self):
-        return f"Point({self.x}, {self.y})"
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # right, down, left, up
 
-    def __hash__(self):
-        return hash((self.x, self.y))
 
-    def __lt__(self, other):
-        return (self.x, self.y) < (other.x, other.y)
+def parse_input(data: bytes | str | None = None) -> list[str]:
+    return read_text(data, INPUT).splitlines()
 
 
 class Maze:
     def __init__(self, data: list[str]):
-        self.data = data
-        self.height = len(data)
-        self.width = len(data[0])
-        for i in range(self.height):
-            for j in range(self.width):
-                if data[i][j] == "S":
-                    self.start = Point(i, j)
-                elif data[i][j] == "E":
-                    self.end = Point(i, j)
+        self.grid = ByteGrid.from_lines(data, border=WALL)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.start = self.grid.find("S")
+        self.end = self.grid.find("E")
+        # Index offsets of the moves in DIRECTIONS
+        self.directions = [dx * self.grid.stride + dy for dx, dy in DIRECTIONS]
         self.direction = 0  # right
-        self.visited: dict[tuple[Point, int], float] = defaultdict(float_inf)  # (position, direction) -> cost
-        self.visited[(self.start, self.direction)] = 0
+        # Cost of the states, a state is packed as `position * 4 + direction`
+        self.visited = array("q", [INFINITY]) * (len(self.grid) * 4)
+        self.visited[self.start * 4 + self.direction] = 0
+        self.search: SearchResult | None = None  # Result of the last search, with the shortest paths
 
-    def on_map(self, position: Point) -> bool:
-        return 0 <= position.x < self.height and 0 <= position.y < self.width
+    def is_valid(self, position: int) -> bool:
+        # The border around the grid is a wall too
+        return self.grid[position] != ord(WALL)
 
-    def is_valid(self, position: Point) -> bool:
-        return self.on_map(position) and self.data[position.x][position.y] != "#"
+    def neighbors(self, state: int) -> list[int]:
+        """
+        States reachable from the state: rotate left, rotate right or move forward
+        """
+        position, direction = divmod(state, 4)
+        states = [position * 4 + (direction + 1) % 4, position * 4 + (direction - 1) % 4]
+        new_position = position + self.directions[direction]
+        if self.is_valid(new_position):
+            states.append(new_position * 4 + direction)
+        return states
+
+    @staticmethod
+    def cost(state: int, new_state: int) -> int:
+        """
+        Cost of moving forward (same direction) or rotation
+        """
+        return MOVE_COST if state % 4 == new_state % 4 else ROTATION_COST
 
     def dijkstra(self) -> int | None:
         """
-        Dijkstra's algorithm
+        Find the cheapest paths from the start, by Dial's algorithm for the two costs
         https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
-        :return:
+        :return: Cost of the cheapest path to the end, None if the end can not be reached
         """
-
-        # Priority queue with the cost
-        pq = [(0, (self.start, self.direction))]
-
-        while pq:
-            cost, (position, direction) = heapq.heappop(pq)
-
-            # Skip visited with lower cost
-            if self.visited[(position, direction)] < cost:
-                continue
-
-            # Move forward
-            dx, dy = DIRECTIONS[direction]
-            new_position = position + Point(dx, dy)
-            if self.is_valid(new_position):
-                new_cost = cost + 1  # cost of moving forward
-                if self.visited[(new_position, direction)] > new_cost:
-                    self.visited[(new_position, direction)] = new_cost
-                    heapq.heappush(pq, (new_cost, (new_position, direction)))
-
-            # Rotate left and right
-            for new_direction in [(direction + 1) % 4, (direction - 1) % 4]:
-                new_cost = cost + 1000  # cost of rotation
-                if self.visited[(position, new_direction)] > new_cost:
-                    self.visited[(position, new_direction)] = new_cost
-                    heapq.heappush(pq, (new_cost, (position, new_direction)))
-
-        return int(min(self.visited[(self.end, direction)] for direction in range(4)))
+        self.search = shortest_paths(
+            [self.start * 4 + self.direction],
+            self.neighbors,
+            len(self.visited),
+            cost=self.cost,
+            weights=(MOVE_COST, ROTATION_COST),
+            predecessors=True,
+        )
+        self.visited = self.search.distances
+        costs = (self.search.distance(self.end * 4 + direction) for direction in range(4))
+        return min((cost for cost in costs if cost is not None), default=None)
 
     def backtrack(self, min_cost: int) -> int:
         """
@@ -101,46 +80,37 @@ class Maze:
         :param min_cost: Cost of the shortest path
         :return: Count of unique tiles in the shortest path
         """
-        shortest_path: set[tuple[Point, int]] = set()  # set of shortest path tiles
-        q: deque[tuple[Point, int]] = deque()  # queue for backtracking
-
-        for d in range(4):
-            # Add all end state with the minimum cost
-            if self.visited[(self.end, d)] == min_cost:
-                shortest_path.add((self.end, d))
-                q.append((self.end, d))
-
-        while q:
-            position, direction = q.popleft()
-            current_cost = self.visited[(position, direction)]
-
-            # Backtrack moves
-            dx, dy = DIRECTIONS[direction]
-            new_position = position - Point(dx, dy)
-            if self.is_valid(new_position):
-                new_state = (new_position, direction)
-                if 0 <= current_cost - 1 == self.visited[new_state]:
-                    if new_state not in shortest_path:
-                        shortest_path.add(new_state)
-                        q.append(new_state)
-
-            # Backtrack rotations
-            if current_cost >= 1000:
-                for new_direction in [(direction + 1) % 4, (direction - 1) % 4]:
-                    new_state = (position, new_direction)
-                    if self.visited[new_state] == current_cost - 1000:
-                        if new_state not in shortest_path:
-                            shortest_path.add(new_state)
-                            q.append(new_state)
-
-        return len({p for (p, d) in shortest_path})
+        # All end states with the minimum cost
+        ends = [self.end * 4 + d for d in range(4) if self.visited[self.end * 4 + d] == min_cost]
+        assert self.search is not None, "Run the search first"
+        return len({state // 4 for state in self.search.path_states(ends)})
+
+
+def part_one(data: list[str] | None = None) -> int | None:
+    return Maze(parse_input() if data is None else data).dijkstra()
+
+
+def part_two(data: list[str] | None = None) -> int | None:
+    maze = Maze(parse_input() if data is None else data)
+    min_cost = maze.dijkstra()
+    return None if min_cost is None else maze.backtrack(min_cost)
+
+
+def solve(data: bytes | str) -> Results:
+    # The backtracking reuses the shortest paths of the first part
+    maze = Maze(parse_input(data))
+    min_cost = maze.dijkstra()
+    return Results(min_cost, None if min_cost is None else maze.backtrack(min_cost))
 
 
 def main():
-    data = read_input()
+    data = parse_input()
     maze = Maze(data)
     # print(maze.data)
     min_cost = maze.dijkstra()
+    if min_cost is None:
+        print("The end can not be reached")
+        return
     print(f"Shortest path cost: {min_cost}")  # 65436
     print(f"Unique tiles in the shortest path: {maze.backtrack(min_cost)}")  # 489
 
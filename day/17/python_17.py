@@ -1,14 +1,14 @@
-import re
+from aoc.parse import parse_numbers, read_numbers
+from aoc.solution import Results
 
 INPUT = "input.txt"
 
 
-def read_input() -> tuple[list[int], list[int]]:
-    with open(INPUT) as f:
-        r, p = f.read().split("\n\n")
-        registers = list(map(int, re.findall(r"\d+", r)))
-        program = list(map(int, re.findall(r"\d+", p)))
-        return registers, program
+def parse_input(data: bytes | str | None = None) -> tuple[list[int], list[int]]:
+    # Registers A, B and C followed by the program, of the input file when no data is given
+    numbers = read_numbers(INPUT, signed=False) if data is None else parse_numbers(data, signed=False)
+    values = numbers.values
+    return list(values[:3]), list(values[3:])
 
 
 class Program:
@@ -58,11 +58,11 @@ class Program:
 
         return result
 
-    def find_a_register_value(self, program: list[int]) -> int:
+    def find_a_register_value(self, program: list[int]) -> int | None:
         """
         Get a value of `A` register to find output being a copy of itself
         :param program: Program to run. A set of pairs of optcode and operand
-        :return: Value of `A` that will halt the program
+        :return: Lowest value of `A` that will halt the program, None if no value outputs the program
         """
         results: list[int] = []
         # Start from end of the program
@@ -82,17 +82,28 @@ class Program:
                         # Otherwise, add the new position and value to the todos
                         todos.append((position - 1, a))
 
-        return min(results)
+        return min(results, default=None)
 
 
-def main():
-    registers, program = read_input()
-    p = Program(registers)
-    result = p.execute(program)
-    print(f"The result of program: {','.join(map(str, result))}")
+def part_one(data: tuple[list[int], list[int]] | None = None) -> str:
+    registers, program = parse_input() if data is None else data
+    return ",".join(map(str, Program(registers).execute(program)))
+
+
+def part_two(data: tuple[list[int], list[int]] | None = None) -> int | None:
+    registers, program = parse_input() if data is None else data
+    return Program(registers).find_a_register_value(program)
+
 
-    a = p.find_a_register_value(program)
-    print(f"The value of `A` for program copy: {a}")
+def solve(data: bytes | str) -> Results:
+    registers_and_program = parse_input(data)
+    return Results(part_one(registers_and_program), part_two(registers_and_program))
+
+
+def main():
+    registers_and_program = parse_input()
+    print(f"The result of program: {part_one(registers_and_program)}")  # 6,0,6,3,0,2,3,1,6
+    print(f"The value of `A` for program copy: {part_two(registers_and_program)}")  # 236539226447469
 
 
 if __name__ == "__main__":
@@ -1,43 +1,22 @@
-import heapq
-from collections import defaultdict
-from dataclasses import dataclass
+from aoc.bitboard import Bitboard
+from aoc.grid import ByteGrid
+from aoc.parse import parse_numbers, read_numbers
+from aoc.progress import Progress
+from aoc.render import frame
+from aoc.solution import Results
 
 INPUT = "input.txt"
 WIDTH = 70
 HEIGHT = 70
 N_STEPS = 1024
 
-DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # right, down, left, up
+CORRUPTED = "#"
+EMPTY = "."
 
 
-def float_inf() -> float:
-    return float("inf")
-
-
-@dataclass
-class Point:
-    x: int
-    y: int
-
-    def __add__(self, other):
-        return Point(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other):
-        return Point(self.x - other.x, self.y - other.y)
-
-    def __repr__(self):
-        return f"Point({self.x}, {self.y})"
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def __lt__(self, other):
-        return (self.x, self.y) < (other.x, other.y)
-
-
-def read_input() -> list[Point]:
+def parse_input(data: bytes | str | None = None) -> list[tuple[int, int]]:
     """
-    Read the input file and return a list of points
+    Read the data (the input file when no data is given) and return a list of positions
 
     Example:
     5,4
@@ -45,118 +24,129 @@ def read_input() -> list[Point]:
     4,5
 
     Returns:
-    [Point(5, 4), Point(4, 2), Point(4, 5)]
+    [(5, 4), (4, 2), (4, 5)]
 
-    :return: List of points
+    :return: List of (X, Y) positions
     """
-    with open(INPUT) as f:
-        return [Point(y=int(line.split(",")[0]), x=int(line.split(",")[1])) for line in f.readlines()]
+    numbers = read_numbers(INPUT, signed=False) if data is None else parse_numbers(data, signed=False)
+    return list(zip(*numbers.columns(2)))
 
 
 class Maze:
-    def __init__(self, memory_space: list[Point]):
+    def __init__(self, memory_space: list[tuple[int, int]], width: int = WIDTH, height: int = HEIGHT):
         """
         Initialize the maze with the memory space
 
-        :param memory_space: List of points where bytes fall into
+        :param memory_space: List of (X, Y) positions where bytes fall into
+        :param width: Largest X coordinate of the memory space
+        :param height: Largest Y coordinate of the memory space
         """
         self.memory_space = memory_space
-        self.width = WIDTH
-        self.height = HEIGHT
-        self.start = Point(0, 0)
-        self.end = Point(self.width, self.height)
-        self.visited: dict[Point, float] = defaultdict(float_inf)  # (position, direction) -> cost
-        self.visited[self.start] = 0
-
-    def add_byte(self, position: Point):
+        self.width = width
+        self.height = height
+        # Corrupted memory is a wall, the border around the memory space too
+        self.grid = ByteGrid(self.width + 1, self.height + 1, fill=EMPTY, border=CORRUPTED)
+        for position in memory_space:
+            self.grid[self.grid.index(*position)] = CORRUPTED
+        self.start = self.grid.index(0, 0)
+        self.end = self.grid.index(self.width, self.height)
+        self.board = Bitboard(self.grid)
+        self.passable = self.board.cells(EMPTY)  # Bitboard of the cells that are not corrupted
+        self.visited = 0  # Bitboard of the cells reached by the last search
+
+    def add_byte(self, position: tuple[int, int]):
         """
         Add a byte to the memory space
-        :param position: Position to add the byte
+        :param position: (X, Y) position to add the byte
         """
         self.memory_space.append(position)
+        index = self.grid.index(*position)
+        self.grid[index] = CORRUPTED
+        self.passable &= ~self.board.bit(index)
         # Reset the visited map
-        self.visited = defaultdict(float_inf)  # (position, direction) -> cost
-        self.visited[self.start] = 0
-
-    def on_map(self, position: Point) -> bool:
-        """
-        Check if the position is on the map
-        :param position: Position ot check
-        :return: True if the position is on the map
-        """
-        return 0 <= position.x < self.height + 1 and 0 <= position.y < self.width + 1
+        self.visited = 0
 
-    def is_valid(self, position: Point) -> bool:
+    def is_valid(self, position: int) -> bool:
         """
         Check if the position is valid, meaning it is on the map and not in the memory space
         :param position: Position to check
         :return: True if the position is valid
         """
-        return self.on_map(position) and position not in self.memory_space
+        return self.grid[position] != ord(CORRUPTED)
 
     def dijkstra(self) -> int | None:
         """
-        Dijkstra's algorithm
-        https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
-        :return:
+        Shortest path to the exit, by breadth-first search as every step costs 1. The wide layers of
+        the search are bitboards, one step of all paths at once (see `Bitboard.search`).
+        :return: Number of steps or None if the exit is blocked
         """
-
-        # Priority queue with the cost
-        pq = [(0, self.start)]
-
-        while pq:
-            cost, position = heapq.heappop(pq)
-
-            # Skip visited with lower cost
-            if self.visited[position] < cost:
-                continue
-
-            # Move into all directions
-            for dy, dx in DIRECTIONS:
-                new_position = position + Point(x=dx, y=dy)
-                if self.is_valid(new_position):
-                    new_cost = cost + 1
-                    if self.visited[new_position] > new_cost:
-                        self.visited[new_position] = new_cost
-                        heapq.heappush(pq, (new_cost, new_position))
-
-        if not self.visited[self.end].is_integer():
-            return None
-        else:
-            return int(self.visited[self.end])
+        steps, self.visited = self.board.search(
+            self.board.bit(self.start), self.passable, self.board.bit(self.end)
+        )
+        return steps
 
     def print(self):
         """
         Print the maze for debugging purposes
         """
-        for i in range(self.height + 1):
-            for j in range(self.width + 1):
-                point = Point(i, j)
-                if point in self.memory_space:
-                    print("#", end="")
-                elif point in self.visited:
-                    print("O", end="")
-                else:
-                    print(".", end="")
-            print()
+        print(frame(self.grid, ((position, "O") for position in Bitboard.positions(self.visited))).decode())
+
+
+def part_one(
+    memory_space: list[tuple[int, int]] | None = None,
+    width: int = WIDTH,
+    height: int = HEIGHT,
+    n_steps: int = N_STEPS,
+) -> int | None:
+    if memory_space is None:
+        memory_space = parse_input()
+    return Maze(memory_space[:n_steps], width, height).dijkstra()
+
+
+def part_two(
+    memory_space: list[tuple[int, int]] | None = None,
+    width: int = WIDTH,
+    height: int = HEIGHT,
+    n_steps: int = N_STEPS,
+) -> str | None:
+    """
+    Find the first byte blocking the exit
+    :return: Position of the byte as `X,Y`
+    """
+    if memory_space is None:
+        memory_space = parse_input()
+    # The exit of the real input stays open long after the first bytes, so those are added without
+    # a search. If it is already blocked there (e.g. the example), search from the first bytes.
+    skip = int(n_steps * 2.8)
+    maze = Maze(memory_space[:skip], width, height)
+    if maze.dijkstra() is None:
+        skip = n_steps
+        maze = Maze(memory_space[:skip], width, height)
+    with Progress("day18.part_two", len(memory_space) - skip) as progress:
+        for byte in memory_space[skip:]:
+            maze.add_byte(byte)
+            steps = maze.dijkstra()
+            progress.update()
+            if steps is not None:
+                continue
+            # maze.print()
+            return "{},{}".format(*byte)
+    return None
+
+
+def solve(data: bytes | str, width: int = WIDTH, height: int = HEIGHT, n_steps: int = N_STEPS) -> Results:
+    memory_space = parse_input(data)
+    return Results(
+        part_one(memory_space, width, height, n_steps), part_two(memory_space, width, height, n_steps)
+    )
 
 
 def main():
-    memory_space = read_input()
+    memory_space = parse_input()
     maze = Maze(memory_space[:N_STEPS])
     maze.print()
-    steps = maze.dijkstra()
-    print(f"Steps to exit the maze: {steps}")
-    for byte in memory_space[N_STEPS : int(N_STEPS * 2.8)]:
-        maze.add_byte(byte)
-    for byte in memory_space[int(2.8 * N_STEPS) :]:
-        maze.add_byte(byte)
-        steps = maze.dijkstra()
-        if steps is not None:
-            continue
-        print(f"Byte at position `{byte.y},{byte.x}` is blocking the exit")
-        # maze.print()
-        break
+    print(f"Steps to exit the maze: {part_one()}")  # 270
+    print(f"Byte at position `{part_two()}` is blocking the exit")  # 51,40
 
 
 if __name__ == "__main__":
@@ -1,64 +1,81 @@
-from functools import cache
+from aoc.instrument import count, counted
+from aoc.solution import Results, read_text
 
 INPUT = "input.txt"
 
 
-def read_input() -> tuple[set[str], list[str]]:
-    with open(INPUT) as f:
-        _towels, _patterns = f.read().split("\n\n")
-        towels = set(_towels.split(", "))
-        patterns = _patterns.strip().split("\n")
-        return towels, patterns
+def parse_input(data: bytes | str | None = None) -> tuple[set[str], list[str]]:
+    _towels, _patterns = read_text(data, INPUT).split("\n\n")
+    towels = set(_towels.strip().split(", "))
+    patterns = _patterns.strip().split("\n")
+    return towels, patterns
 
 
+@counted("day19.can_form_pattern")
 def can_form_pattern(towels: set[str], pattern: str) -> bool:
     """
-    Recursive function to check if a pattern can be formed by the towels.
+    Check if a pattern can be formed by the towels.
     :param towels: Towels to use to form a pattern.
     :param pattern: Pattern to form.
     :return: True if the pattern can be formed, False otherwise.
     """
-    for towel in towels:
-        # If the towel is the pattern, return True.
-        if towel == pattern:
-            return True
-        # If the pattern starts with the towel, check if the rest of the pattern can be formed.
-        if pattern.startswith(towel):
-            if can_form_pattern(towels, pattern[len(towel) :]):
-                return True
-    # If the pattern cannot be formed, return False.
-    return False
+    return count_formation(towels, pattern, limit=1) > 0
+
+
+def count_formation(towels: set[str], pattern: str, limit: int | None = None) -> int:
+    """
+    Count the formations of a pattern, bottom-up from the end of the pattern.
+    :param towels: Towels to use to form a pattern.
+    :param pattern: Pattern to form.
+    :param limit: Stop counting at this count.
+    :return: Number of formations of the pattern (at most `limit`).
+    """
+    lengths = sorted({len(towel) for towel in towels})
+    # Formations of every suffix of the pattern, the empty suffix is formed by no towel
+    formations = [0] * len(pattern) + [1]
+    for start in range(len(pattern) - 1, -1, -1):
+        total = 0
+        for length in lengths:
+            if start + length > len(pattern):
+                break
+            # If the suffix starts with a towel, count the formations of the rest of the suffix.
+            if pattern[start : start + length] in towels:
+                total += formations[start + length]
+        formations[start] = total if limit is None else min(total, limit)
+    return formations[0] if pattern else 0
 
 
 def count_formations(towels: set[str], patterns: list[str]) -> int:
     """
-    Recursive function to count the number of formations of a pattern.
+    Count the formations of all patterns.
     :param towels: Towels to use to form a pattern.
     :param patterns: Patterns to form.
-    :return: Number of formations of the pattern.
+    :return: Number of formations of the patterns.
     """
+    count("day19.count_formation.positions", sum(len(pattern) for pattern in patterns))
+    return sum(count_formation(towels, pattern) for pattern in patterns)
+
+
+def part_one(data: tuple[set[str], list[str]] | None = None) -> int:
+    towels, patterns = parse_input() if data is None else data
+    return sum([can_form_pattern(towels, pattern) for pattern in patterns])
+
+
+def part_two(data: tuple[set[str], list[str]] | None = None) -> int:
+    towels, patterns = parse_input() if data is None else data
+    return count_formations(towels, patterns)
 
-    @cache
-    def count_formation(pattern: str) -> int:
-        count = 0
-        for towel in towels:
-            # If the towel is the pattern, increment the count.
-            if towel == pattern:
-                count += 1
-            # If the pattern starts with the towel, count the number of formations of the rest of the pattern.
-            if pattern.startswith(towel):
-                count += count_formation(pattern[len(towel) :])
-        return count
 
-    return sum([count_formation(pattern) for pattern in patterns])
+def solve(data: bytes | str) -> Results:
+    towels_and_patterns = parse_input(data)
+    return Results(part_one(towels_and_patterns), part_two(towels_and_patterns))
 
 
 def main():
-    towels, patterns = read_input()
-    count_can_form = sum([can_form_pattern(towels, pattern) for pattern in patterns])
-    count_formation = count_formations(towels, patterns)
-    print(f"{count_can_form} patterns can be formed by the towels.")
-    print(f"{count_formation} formations of the patterns can be made by the towels.")
+    towels_and_patterns = parse_input()
+    print(f"{part_one(towels_and_patterns)} patterns can be formed by the towels.")  # 285
+    # 636483903099279
+    print(f"{part_two(towels_and_patterns)} formations of the patterns can be made by the towels.")
 
 
 if __name__ == "__main__":
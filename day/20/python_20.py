@@ -1,93 +1,49 @@
-import heapq
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+from array import array
+from collections import Counter
 from itertools import product
 
-INPUT = "input.txt"
-
-DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # up, right, down, left
-
-
-def read_input() -> list[str]:
-    with open(INPUT) as f:
-        return f.read().splitlines()
-
-
-def float_inf() -> float:
-    return float("inf")
-
-
-@dataclass
-class Point:
-    x: int
-    y: int
+from aoc.grid import ByteGrid
+from aoc.search import INFINITY, shortest_paths
+from aoc.solution import Results, read_text
 
-    def __add__(self, other):
-        return Point(self.x + other.x, self.y + other.y)
-
-    def __sub__(self, other):
-        return Point(self.x - other.x, self.y - other.y)
+INPUT = "input.txt"
+THRESHOLD = 100  # Least saved picoseconds of the counted cheats
 
-    def __repr__(self):
-        return f"Point({self.x}, {self.y})"
+WALL = "#"
 
-    def __hash__(self):
-        return hash((self.x, self.y))
 
-    def __lt__(self, other):
-        return (self.x, self.y) < (other.x, other.y)
+def parse_input(data: bytes | str | None = None) -> list[str]:
+    return read_text(data, INPUT).splitlines()
 
 
 class Maze:
     def __init__(self, data: list[str]):
-        self.data = data
-        self.height = len(data)
-        self.width = len(data[0])
-        for i in range(self.height):
-            for j in range(self.width):
-                if data[i][j] == "S":
-                    self.start = Point(i, j)
-                elif data[i][j] == "E":
-                    self.end = Point(i, j)
-        self.visited: dict[Point, float | int] = defaultdict(float_inf)  # position: cost
+        self.grid = ByteGrid.from_lines(data, border=WALL)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.start = self.grid.find("S")
+        self.end = self.grid.find("E")
+        self.visited = array("q", [INFINITY]) * len(self.grid)  # position: cost
         self.visited[self.start] = 0
 
-    def on_map(self, position: Point) -> bool:
-        return 0 <= position.x < self.height and 0 <= position.y < self.width
+    def is_valid(self, position: int) -> bool:
+        # The border around the grid is a wall too
+        return self.grid[position] != ord(WALL)
 
-    def is_valid(self, position: Point) -> bool:
-        return self.on_map(position) and self.data[position.x][position.y] != "#"
+    def neighbors(self, position: int) -> list[int]:
+        """
+        Track positions in all directions from the position
+        """
+        return [position + offset for offset in self.grid.directions if self.is_valid(position + offset)]
 
     def dijkstra(self) -> int | None:
         """
-        Dijkstra's algorithm
-        https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
-        :return:
+        Distances of all track positions from the start, by breadth-first search as every move costs 1
+        :return: Distance of the end or None if it is unreachable
         """
-
-        # Priority queue with the cost
-        pq = [(0, self.start)]
-
-        while pq:
-            cost, position = heapq.heappop(pq)
-
-            # Skip visited with lower cost
-            if self.visited[position] < cost:
-                continue
-
-            # Move to any direction
-            for dx, dy in DIRECTIONS:
-                new_position = position + Point(dx, dy)
-                if self.is_valid(new_position):
-                    new_cost = cost + 1  # cost of move
-                    if self.visited[new_position] > new_cost:
-                        self.visited[new_position] = new_cost
-                        heapq.heappush(pq, (new_cost, new_position))
-
-        if not self.visited[self.end].is_integer():
-            return None
-        else:
-            return int(self.visited[self.end])
+        result = shortest_paths([self.start], self.neighbors, len(self.grid))
+        self.visited = result.distances
+        return result.distance(self.end)
 
     def find_cheating_paths(self, threshold: int, radius: int = 2) -> int:
         """
@@ -97,30 +53,28 @@ class Maze:
         :param radius: The radius of a cheat to check
         """
         counter: Counter[int] = Counter()
-
-        for x in range(1, self.height - 1):
-            for y in range(1, self.width - 1):
-
-                # Check if the point is a wall
-                if self.data[x][y] != "#":
-                    point = Point(x, y)
-                    # For radius in all directions
-                    for dx, dy in product(range(-radius, radius + 1), repeat=2):
-                        # Skip the point itself
-                        if (dx, dy) == (0, 0):
-                            continue
-                        # Calculate the steps to the neighbor
-                        steps = abs(dx) + abs(dy)
-                        # Skip if the steps are greater than the radius
-                        if steps > radius:
-                            continue
-                        # Check if the neighbor is visited
-                        new_point = point + Point(dx, dy)
-                        if self.visited[new_point].is_integer():
-                            # Calculate the difference between the max and min neighbor
-                            diff = self.visited[new_point] - self.visited[point] - steps
-                            if diff >= threshold:
-                                counter[int(diff)] += 1
+        visited = self.visited
+
+        # Row, column and index offsets of the cheats within the radius (without the point itself)
+        cheats = [
+            (dx, dy, dx * self.grid.stride + dy, abs(dx) + abs(dy))
+            for dx, dy in product(range(-radius, radius + 1), repeat=2)
+            if 0 < abs(dx) + abs(dy) <= radius
+        ]
+
+        for position in self.grid.positions():
+            # Check if the point is on the track
+            if visited[position] == INFINITY:
+                continue
+            column, row = self.grid.coords(position)
+            for dx, dy, offset, steps in cheats:
+                # Check if the neighbor is on the map and visited
+                if not self.grid.contains(column + dy, row + dx) or visited[position + offset] == INFINITY:
+                    continue
+                # Calculate the difference between the max and min neighbor
+                diff = visited[position + offset] - visited[position] - steps
+                if diff >= threshold:
+                    counter[diff] += 1
 
         return sum(counter.values())
 
@@ -128,27 +82,41 @@ class Maze:
         """
         Print the maze for debugging purposes
         """
-        for i in range(self.height):
-            for j in range(self.width):
-                point = Point(i, j)
-                if self.data[i][j] == "#":
-                    print("#", end="")
-                elif point in self.visited:
-                    print("O", end="")
-                else:
-                    print(".", end="")
-            print()
+        for position in self.grid.positions():
+            if not self.is_valid(position):
+                print("#", end="")
+            elif self.visited[position] != INFINITY:
+                print("O", end="")
+            else:
+                print(".", end="")
+            if self.grid.coords(position)[0] == self.width - 1:
+                print()
+
+
+def part_one(data: list[str] | None = None, threshold: int = THRESHOLD) -> int:
+    maze = Maze(parse_input() if data is None else data)
+    maze.dijkstra()
+    # maze.print()
+    return maze.find_cheating_paths(threshold=threshold)
 
 
-def main():
-    data = read_input()
-    maze = Maze(data)
+def part_two(data: list[str] | None = None, threshold: int = THRESHOLD) -> int:
+    maze = Maze(parse_input() if data is None else data)
     maze.dijkstra()
-    # maze.print()
-    cheats = maze.find_cheating_paths(threshold=100)
-    print(f"Cheating paths: {cheats} with threshold 100 and radius 2")
-    cheats = maze.find_cheating_paths(threshold=100, radius=20)
-    print(f"Cheating paths: {cheats} with threshold 100 and radius 20")
+    return maze.find_cheating_paths(threshold=threshold, radius=20)
+
+
+def solve(data: bytes | str, threshold: int = THRESHOLD) -> Results:
+    # Both parts count the cheats on the same distances from the start
+    maze = Maze(parse_input(data))
+    maze.dijkstra()
+    part_one = maze.find_cheating_paths(threshold=threshold)
+    return Results(part_one, maze.find_cheating_paths(threshold=threshold, radius=20))
+
+
+def main():
+    print(f"Cheating paths: {part_one()} with threshold 100 and radius 2")  # 1485
+    print(f"Cheating paths: {part_two()} with threshold 100 and radius 20")  # 1027501
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+from collections.abc import Iterator
+
+from aoc.batch import collect_inputs, read_manifest
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# inputs\na.txt\n\n  sub/b.txt  \n#c.txt\nd.txt")
+    paths = read_manifest(manifest)
+    assert isinstance(paths, Iterator)
+    assert list(paths) == [tmp_path / "a.txt", tmp_path / "sub/b.txt", tmp_path / "d.txt"]
+
+
+def test_read_manifest_lazily(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("a.txt\nb.txt\n")
+    paths = read_manifest(manifest)
+    assert next(paths) == tmp_path / "a.txt"
+    # Lines are read as the paths are consumed, the whole manifest is never materialized
+    with open(manifest, "a") as file:
+        file.write("c.txt\n")
+    assert list(paths) == [tmp_path / "b.txt", tmp_path / "c.txt"]
+
+
+def test_collect_inputs_directory(tmp_path):
+    for name in ["b.txt", "a.txt", ".hidden"]:
+        (tmp_path / name).write_text("")
+    (tmp_path / "sub").mkdir()
+    assert collect_inputs(tmp_path) == [tmp_path / "a.txt", tmp_path / "b.txt"]
@@ -0,0 +1,93 @@
+import io
+import random
+
+import pytest
+
+from aoc.days import discover, load
+from aoc.generate import generate
+
+DAY = load({day.number: day for day in discover()}[1])
+
+EXAMPLE = "3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n"
+
+
+@pytest.mark.parametrize("run_bytes", [1, 64, 4096, DAY.RUN_BYTES])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solve_external(tmp_path, run_bytes, seed):
+    output = io.StringIO()
+    generate(1, output, seed, lines=500)
+    path = tmp_path / "input.txt"
+    path.write_text(output.getvalue())
+    assert DAY.solve_external(path, run_bytes, directory=tmp_path) == DAY.solve(output.getvalue())
+
+
+@pytest.mark.parametrize("run_bytes", [1, DAY.RUN_BYTES])
+def test_solve_external_example(tmp_path, run_bytes):
+    path = tmp_path / "input.txt"
+    path.write_text(EXAMPLE)
+    assert DAY.solve_external(path, run_bytes, directory=tmp_path) == (11, 31)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_location_index(size, seed):
+    rng = random.Random(seed)
+    list_1 = [rng.randrange(size) for _ in range(size)]
+    list_2 = [rng.randrange(size) for _ in range(size)]
+    index = DAY.LocationIndex.from_lists(list_1, list_2, size)
+    for _ in range(300):
+        if list_1 and rng.random() < 0.4:
+            left, right = list_1.pop(rng.randrange(len(list_1))), list_2.pop(rng.randrange(len(list_2)))
+            index.remove(left, right)
+        else:
+            left, right = rng.randrange(size), rng.randrange(size)
+            list_1.append(left)
+            list_2.append(right)
+            index.insert(left, right)
+        assert len(index) == len(list_1)
+        assert (index.distance, index.similarity) == (
+            DAY.part_one((list_1, list_2)),
+            DAY.part_two((list_1, list_2)),
+        )
+
+
+def test_location_index_alternating():
+    # Balances -2, 0, -2, 0, ... change sign at every ID when a pair spans them
+    size = 64
+    index = DAY.LocationIndex(size)
+    list_1, list_2 = [], []
+    for position in range(0, size - 1, 2):
+        for _ in range(2):
+            index.insert(position + 1, position)
+            list_1.append(position + 1)
+            list_2.append(position)
+    for left, right in [(0, size - 1), (size - 1, 0)] * 3:
+        index.insert(left, right)
+        list_1.append(left)
+        list_2.append(right)
+        assert index.distance == DAY.part_one((list_1, list_2))
+
+
+@pytest.mark.parametrize("data", [EXAMPLE, "", "1,2\n3,4\n", "5 5\n\n-3 7\n", "1 2"])
+def test_vectorized(data):
+    pytest.importorskip("numpy")
+    assert DAY.solve(data, vectorized=True) == DAY.solve(data)
+
+
+@pytest.mark.parametrize("lines", [1, 10, 1000, 100_000])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_vectorized_generated(lines, seed):
+    # 100 000 lines are over a MiB, scanned by NumPy
+    pytest.importorskip("numpy")
+    output = io.StringIO()
+    generate(1, output, seed, lines=lines)
+    assert DAY.solve(output.getvalue(), vectorized=True) == DAY.solve(output.getvalue())
+
+
+@pytest.mark.parametrize("data", ["1 2 3\n4 5 6\n", "1 2\n3\n"])
+def test_vectorized_ragged(data):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="2 values"):
+        DAY.solve(data, vectorized=True)
+    with pytest.raises(ValueError, match="2 values"):
+        DAY.solve(data)
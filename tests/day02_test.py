@@ -0,0 +1,69 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from aoc.days import discover, load
+from aoc.parse import parse_numbers
+
+DAY = load({day.number: day for day in discover()}[2])
+
+
+def is_safe_brute_force(report, allowed_removals):
+    def safe(levels):
+        steps = [b - a for a, b in zip(levels, levels[1:])]
+        return all(1 <= step <= 3 for step in steps) or all(-3 <= step <= -1 for step in steps)
+
+    return any(
+        safe([level for i, level in enumerate(report) if i not in removed])
+        for removals in range(min(allowed_removals, len(report)) + 1)
+        for removed in combinations(range(len(report)), removals)
+    )
+
+
+def random_reports(seed, count=500, max_length=9):
+    rng = random.Random(seed)
+    reports = []
+    for _ in range(count):
+        level = rng.randint(1, 20)
+        report = [level]
+        for _ in range(rng.randint(0, max_length - 1)):
+            # Mostly safe steps, so that the removals matter
+            level += rng.choice([1, 2, 3, -1, -2, -3, 0, 4]) if rng.random() < 0.3 else rng.choice([1, 2, 3])
+            report.append(level)
+        reports.append(report)
+    return reports
+
+
+@pytest.mark.parametrize("allowed_removals", [0, 1, 2, 3])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_is_safe(allowed_removals, seed):
+    for report in random_reports(seed):
+        assert DAY.is_safe(report, allowed_removals) == is_safe_brute_force(report, allowed_removals), report
+
+
+@pytest.mark.parametrize("report", [[], [5], [5, 5], [5, 9], [1, 2, 3, 4, 5], [9, 1, 2, 3], [1, 2, 3, 9]])
+@pytest.mark.parametrize("allowed_removals", [0, 1, 2])
+def test_is_safe_edge_cases(report, allowed_removals):
+    assert DAY.is_safe(report, allowed_removals) == is_safe_brute_force(report, allowed_removals)
+
+
+@pytest.mark.parametrize("batch", [1, 2, 3, 7, 64, DAY.BATCH])
+@pytest.mark.parametrize("allowed_removals", [0, 1])
+def test_count_safe_vectorized(batch, allowed_removals):
+    pytest.importorskip("numpy")
+    # Reports of 1 and 2 levels and safe reports next to unsafe ones across the batch boundaries
+    reports = [[5], [5, 5], [5, 9], [1, 2], [7, 6, 4, 2, 1], [1, 2, 7, 8, 9], [1, 3, 2, 4, 5]]
+    reports += random_reports(3, count=200)
+    data = "\n".join(" ".join(map(str, report)) for report in reports) + "\n"
+    expected = sum(DAY.is_safe(report, allowed_removals) for report in reports)
+    assert DAY.count_safe_vectorized(parse_numbers(data), allowed_removals, batch) == expected
+
+
+@pytest.mark.parametrize("data", ["", "\n", "5\n", "5 5\n", "1 2\n3\n"])
+def test_count_safe_vectorized_small(data):
+    pytest.importorskip("numpy")
+    reports = parse_numbers(data)
+    for allowed_removals in (0, 1):
+        expected = sum(DAY.is_safe(report, allowed_removals) for report in reports)
+        assert DAY.count_safe_vectorized(reports, allowed_removals, batch=1) == expected
@@ -0,0 +1,51 @@
+import io
+import re
+
+import pytest
+
+from aoc.days import discover, load
+from aoc.generate import generate
+
+DAY = load({day.number: day for day in discover()}[3])
+
+EXAMPLE = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+
+
+def brute_force(data: bytes) -> tuple[int, int]:
+    total = enabled_total = 0
+    enabled = True
+    for token in re.finditer(DAY.TOKENS, data):
+        if token.group(1) is None:
+            enabled = token.group() == b"do()"
+        else:
+            product = int(token.group(1)) * int(token.group(2))
+            total += product
+            enabled_total += product if enabled else 0
+    return total, enabled_total
+
+
+def test_example():
+    assert DAY.solve(EXAMPLE) == DAY.solve(EXAMPLE.decode()) == (161, 48)
+    assert DAY.parse_input(EXAMPLE) == (161, 48)
+
+
+@pytest.mark.parametrize("offset", range(len(EXAMPLE) + 1))
+def test_scan_split(offset):
+    # The `mul(`, `do()` and `don't()` tokens are cut at every byte, carried over to the next chunk
+    assert DAY.scan([EXAMPLE[:offset], EXAMPLE[offset:]]) == (161, 48)
+
+
+@pytest.mark.parametrize("offset", range(len(EXAMPLE) + 1))
+def test_scan_split_three(offset):
+    # A chunk shorter than a token between the others
+    for end in range(offset, min(offset + DAY.LONGEST_TOKEN, len(EXAMPLE)) + 1):
+        assert DAY.scan([EXAMPLE[:offset], EXAMPLE[offset:end], EXAMPLE[end:]]) == (161, 48)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 12, 13, 64])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solve_generated(chunk_size, seed):
+    output = io.StringIO()
+    generate(3, output, seed, lines=3, line_length=500)
+    data = output.getvalue().encode()
+    assert DAY.scan(DAY.split_chunks(data, chunk_size)) == DAY.solve(data) == brute_force(data)
@@ -0,0 +1,16 @@
+from pathlib import Path
+
+from aoc.days import discover, load
+
+DAY = load({day.number: day for day in discover()}[6])
+
+EXAMPLE = (Path(DAY.__file__).parent / "input_example.txt").read_text()
+
+
+def test_example():
+    assert DAY.solve(EXAMPLE) == (41, 6)
+
+
+def test_no_obstacle_on_start():
+    # An obstacle on the start would trap the guard between (1, 1) and (2, 1), but the guard stands there
+    assert DAY.part_two([".##.", "#..#", "..^."]) == 0
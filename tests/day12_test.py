@@ -0,0 +1,77 @@
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from aoc.days import discover, load
+from aoc.generate import generate
+
+DAY = load({day.number: day for day in discover()}[12])
+
+
+def brute_force(lines):
+    """
+    Prices of the regions found cell by cell, sides counted as corners of the plot sets
+    """
+    plots = {(x, y): plant for y, line in enumerate(lines) for x, plant in enumerate(line)}
+    seen: set[tuple[int, int]] = set()
+    prices = [0, 0]
+    for start, plant in plots.items():
+        if start in seen:
+            continue
+        region, stack = {start}, [start]
+        while stack:
+            x, y = stack.pop()
+            for neighbor in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                if plots.get(neighbor) == plant and neighbor not in region:
+                    region.add(neighbor)
+                    stack.append(neighbor)
+        seen |= region
+        perimeter = sum(
+            (x + dx, y + dy) not in region for x, y in region for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0))
+        )
+        corners = 0
+        for x, y in region:
+            for dx, dy in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+                horizontal, vertical = (x + dx, y) in region, (x, y + dy) in region
+                inner = horizontal and vertical and (x + dx, y + dy) not in region
+                corners += inner or not (horizontal or vertical)
+        prices[0] += perimeter * len(region)
+        prices[1] += corners * len(region)
+    return tuple(prices)
+
+
+def garden(seed, width, height, **params):
+    output = io.StringIO()
+    generate(12, output, seed, width=width, height=height, **params)
+    return DAY.parse_input(output.getvalue())
+
+
+@pytest.mark.parametrize(
+    "name, results", [("input_example_small.txt", (140, 80)), ("input_example.txt", (1930, 1206))]
+)
+def test_examples(name, results):
+    assert DAY.solve((Path(DAY.__file__).parent / name).read_text()) == results
+
+
+@pytest.mark.parametrize("small_region", [0, DAY.SMALL_REGION, 1 << 20])
+@pytest.mark.parametrize("seed", range(4))
+def test_random_gardens(seed, small_region, monkeypatch):
+    # Every region searched cell by cell, the default mix of both searches, every region by layers
+    monkeypatch.setattr(DAY, "SMALL_REGION", small_region)
+    rng = random.Random(seed)
+    lines = garden(seed, rng.randint(1, 60), rng.randint(1, 60), plants=rng.randint(1, 4))
+    assert DAY.total_prices(lines) == brute_force(lines)
+
+
+@pytest.mark.parametrize("small_region", [0, DAY.SMALL_REGION, 1 << 20])
+def test_large_regions(small_region, monkeypatch):
+    monkeypatch.setattr(DAY, "SMALL_REGION", small_region)
+    # A single region and a serpentine region winding over every row of the garden
+    single = ["A" * 50] * 40
+    serpentine = [
+        "A" * 50 if y % 2 == 0 else "B" * 49 + "A" if y % 4 == 1 else "A" + "B" * 49 for y in range(41)
+    ]
+    for lines in (single, serpentine):
+        assert DAY.total_prices(lines) == brute_force(lines)
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from aoc.days import discover, load
+
+DAY = load({day.number: day for day in discover()}[16])
+
+
+@pytest.mark.parametrize(
+    "name, results", [("input_example_small.txt", (7036, 45)), ("input_example.txt", (11048, 64))]
+)
+def test_examples(name, results):
+    assert DAY.solve((Path(DAY.__file__).parent / name).read_text()) == results
+
+
+def test_unreachable_end():
+    lines = ["#######", "#S.#.E#", "#######"]
+    assert DAY.part_one(lines) is None
+    assert DAY.part_two(lines) is None
+    assert DAY.solve("\n".join(lines)) == (None, None)
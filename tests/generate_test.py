@@ -0,0 +1,212 @@
+import io
+import re
+from collections import deque
+from functools import cache
+from itertools import product
+
+import pytest
+
+from aoc.days import discover, load
+from aoc.generate import GENERATORS, generate
+
+DAYS = {day.number: day for day in discover()}
+
+# Smaller inputs of the slow days: (generator params, solve() params)
+SIZES = {
+    7: ({"lines": 100}, {}),
+    9: ({"length": 999}, {}),
+    14: ({"count": 50, "width": 11, "height": 7}, {"width": 11, "height": 7}),
+    20: ({"width": 41, "height": 41}, {"threshold": 10}),
+}
+
+MOVES = [(0, -1), (1, 0), (0, 1), (-1, 0)]  # Up, right, down, left
+
+
+def generated(day: int, seed: int = 0, **params) -> str:
+    output = io.StringIO()
+    generate(day, output, seed, **params)
+    return output.getvalue()
+
+
+def find(rows: list[str], value: str) -> list[tuple[int, int]]:
+    return [(x, y) for y, row in enumerate(rows) for x, cell in enumerate(row) if cell == value]
+
+
+def reachable(rows: list[str], start: tuple[int, int], walls: str = "#") -> set[tuple[int, int]]:
+    seen, queue = {start}, deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= ny < len(rows) and 0 <= nx < len(rows[ny]) and rows[ny][nx] not in walls:
+                if (nx, ny) not in seen:
+                    seen.add((nx, ny))
+                    queue.append((nx, ny))
+    return seen
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solve_generated_input(day, seed):
+    generator_params, solve_params = SIZES.get(day, ({}, {}))
+    results = load(DAYS[day]).solve(generated(day, seed, **generator_params), **solve_params)
+    assert results.part_one is not None
+
+
+@pytest.mark.parametrize(
+    "day, params, size, cells",
+    [
+        (4, {"width": 30, "height": 20}, (30, 20), "XMAS"),
+        (6, {"width": 30, "height": 20}, (30, 20), ".#^"),
+        (8, {"width": 30, "height": 20}, (30, 20), None),
+        (10, {"width": 30, "height": 20}, (30, 20), "0123456789"),
+        (12, {"width": 30, "height": 20, "plants": 5}, (30, 20), "ABCDE"),
+        (16, {"width": 41, "height": 31}, (41, 31), ".#SE"),
+        (20, {"width": 40, "height": 30}, (39, 29), ".#SE"),  # Rounded down to odd sizes
+    ],
+)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_grid_size(day, params, size, cells, seed):
+    rows = generated(day, seed, **params).splitlines()
+    width, height = size
+    assert len(rows) == height
+    assert all(len(row) == width for row in rows)
+    if cells is not None:
+        assert set("".join(rows)) <= set(cells)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_guard_map(seed):
+    rows = generated(6, seed, width=20, height=15, density=0.2).splitlines()
+    [(x, y)] = find(rows, "^")
+    # The guard walks up, turns right at an obstacle and leaves the map without a loop
+    direction, seen = 0, set()
+    while 0 <= y < len(rows) and 0 <= x < len(rows[0]):
+        assert (x, y, direction) not in seen, "The guard loops"
+        seen.add((x, y, direction))
+        dx, dy = MOVES[direction]
+        if 0 <= y + dy < len(rows) and 0 <= x + dx < len(rows[0]) and rows[y + dy][x + dx] == "#":
+            direction = (direction + 1) % 4
+        else:
+            x, y = x + dx, y + dy
+
+
+@pytest.mark.parametrize("day, loops", [(16, 0.0), (16, 0.2), (20, 0.0)])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_maze(day, loops, seed):
+    rows = generated(day, seed, width=21, height=15, loops=loops).splitlines()
+    [start], [end] = find(rows, "S"), find(rows, "E")
+    assert start == (1, len(rows) - 2) and end == (len(rows[0]) - 2, 1)
+    open_cells = {cell for value in ".SE" for cell in find(rows, value)}
+    # All corridors are connected, so the exit is reachable
+    assert reachable(rows, start) == open_cells
+    assert all(row[0] == row[-1] == "#" for row in rows) and set(rows[0] + rows[-1]) == {"#"}
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_warehouse(seed):
+    warehouse, moves = generated(15, seed, width=12, height=9, moves=2500).split("\n\n")
+    rows = warehouse.splitlines()
+    assert len(rows) == 9 and all(len(row) == 12 for row in rows)
+    assert len(find(rows, "@")) == 1
+    assert set(rows[0] + rows[-1]) == {"#"} and all(row[0] == row[-1] == "#" for row in rows)
+    assert len(moves.replace("\n", "")) == 2500 and set(moves) <= set("^>v<\n")
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_page_ordering(seed):
+    rules, updates = generated(5, seed, pages=12, updates=50).split("\n\n")
+    pairs = {tuple(rule.split("|")) for rule in rules.splitlines()}
+    for update in updates.splitlines():
+        pages = update.split(",")
+        assert len(pages) % 2 == 1 and len(set(pages)) == len(pages)
+        # Every pair of the pages of an update is ordered by a rule
+        for i, left in enumerate(pages):
+            for right in pages[i + 1 :]:
+                assert (left, right) in pairs or (right, left) in pairs
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_falling_bytes(seed):
+    lines = generated(18, seed, width=9, height=7, count=100).splitlines()
+    positions = [tuple(map(int, line.split(","))) for line in lines]
+    assert len(positions) == len(set(positions)) == 9 * 7 - 2
+    assert all(0 <= x < 9 and 0 <= y < 7 for x, y in positions)
+    assert (0, 0) not in positions and (8, 6) not in positions
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_equations_brute_force(seed):
+    data = generated(7, seed, lines=60, max_numbers=7)
+    expected = [0, 0]
+    for line in data.splitlines():
+        value, *numbers = map(int, re.findall(r"\d+", line))
+        for part, operators in enumerate(("+*", "+*|")):
+            for chosen in product(operators, repeat=len(numbers) - 1):
+                result = numbers[0]
+                for operator, number in zip(chosen, numbers[1:]):
+                    result = {"+": result + number, "*": result * number, "|": int(f"{result}{number}")}[
+                        operator
+                    ]
+                if result == value:
+                    expected[part] += value
+                    break
+    assert expected[1] > expected[0] > 0  # Generated with all three operators
+    assert tuple(load(DAYS[7]).solve(data)) == tuple(expected)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_claw_machines_brute_force(seed):
+    data = generated(13, seed, count=40)
+    expected = 0
+    for machine in data.split("\n\n"):
+        ax, ay, bx, by, px, py = map(int, re.findall(r"\d+", machine))
+        costs = [
+            3 * a + b
+            for a in range(101)
+            for b in range(101)
+            if (a * ax + b * bx, a * ay + b * by) == (px, py)
+        ]
+        expected += min(costs, default=0)
+    assert expected > 0
+    assert load(DAYS[13]).solve(data).part_one == expected
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_falling_bytes_brute_force(seed):
+    data = generated(18, seed, width=7, height=7, count=30)
+    positions = [tuple(map(int, line.split(","))) for line in data.splitlines()]
+
+    def steps(fallen: int) -> int | None:
+        walls = set(positions[:fallen])
+        rows = ["".join("#" if (x, y) in walls else "." for x in range(7)) for y in range(7)]
+        distances, queue = {(0, 0): 0}, deque([(0, 0)])
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in MOVES:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < 7 and 0 <= ny < 7 and rows[ny][nx] == "." and (nx, ny) not in distances:
+                    distances[nx, ny] = distances[x, y] + 1
+                    queue.append((nx, ny))
+        return distances.get((6, 6))
+
+    blocking = next((fallen for fallen in range(12, len(positions) + 1) if steps(fallen) is None), None)
+    results = load(DAYS[18]).solve(data, width=6, height=6, n_steps=12)
+    assert results.part_one == steps(12)
+    assert results.part_two == (None if blocking is None else "{},{}".format(*positions[blocking - 1]))
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_towel_patterns_brute_force(seed):
+    data = generated(19, seed, towels=12, max_towel_length=3, patterns=40, min_length=5, max_length=12)
+    towels, patterns = data.split("\n\n")
+    available = towels.split(", ")
+
+    @cache
+    def formations(pattern: str) -> int:
+        if not pattern:
+            return 1
+        return sum(formations(pattern[len(towel) :]) for towel in available if pattern.startswith(towel))
+
+    counts = [formations(pattern) for pattern in patterns.split()]
+    assert tuple(load(DAYS[19]).solve(data)) == (sum(count > 0 for count in counts), sum(counts))
@@ -0,0 +1,17 @@
+import pytest
+
+from aoc.grid import ByteGrid
+
+
+def test_from_lines():
+    grid = ByteGrid.from_lines(["#..", ".S."], border="*")
+    assert (grid.width, grid.height) == (3, 2)
+    assert grid.coords(grid.find("S")) == (1, 1)
+    assert len(grid) == (3 + 2) * (2 + 2)
+    assert grid[grid.index(0, 0) + grid.directions[0]] == ord("*")
+
+
+@pytest.mark.parametrize("lines", [["abc", "ab"], ["abc", "abcd"], ["ab", "ab", ""], [b"abc", b"abc", b"a"]])
+def test_from_lines_ragged(lines):
+    with pytest.raises(ValueError, match="expected"):
+        ByteGrid.from_lines(lines)
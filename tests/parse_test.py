@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from aoc import parse
+from aoc.parse import parse_numbers, read_numbers
+
+
+def test_parse_numbers():
+    numbers = parse_numbers("p=0,4 v=3,-3\n\nButton A: X+94, Y+34\n5-2\n")
+    assert list(map(list, numbers)) == [[0, 4, 3, -3], [94, 34], [5, -2]]
+    assert list(map(list, parse_numbers("1 2\n\n3\n4 5\n", separator=b"\n\n", signed=False))) == [
+        [1, 2],
+        [3, 4, 5],
+    ]
+    assert parse_numbers("1 2\n3 4\n").columns(2) == (parse.array("q", [1, 3]), parse.array("q", [2, 4]))
+    assert parse_numbers("1 123456789012345678901234567890\n").values == [1, 123456789012345678901234567890]
+
+
+def random_text(rng: random.Random) -> bytes:
+    tokens = ["\n", "\n\n", " ", ",", "-", "p=", "x", "--", "0", "007"]
+    parts = [
+        rng.choice(tokens + [str(rng.randint(-(10**15), 10**15))] * 4) for _ in range(rng.randint(0, 60))
+    ]
+    return "".join(parts).encode()
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 64, parse.CHUNK_BYTES])
+@pytest.mark.parametrize("separator", [b"\n", b"\n\n"])
+@pytest.mark.parametrize("signed", [True, False])
+def test_scan_numpy(monkeypatch, chunk_bytes, separator, signed):
+    pytest.importorskip("numpy")
+    rng = random.Random(chunk_bytes)
+    for _ in range(100):
+        data = random_text(rng)
+        expected = parse_numbers(data, separator, signed)
+        monkeypatch.setattr(parse, "VECTORIZED_BYTES", 0)
+        monkeypatch.setattr(parse, "CHUNK_BYTES", chunk_bytes)
+        assert parse_numbers(data, separator, signed) == expected, data
+        monkeypatch.undo()
+
+
+def test_scan_numpy_overflow(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(parse, "VECTORIZED_BYTES", 0)
+    # 19 digits still fit into 64 bits, 20 digits do not
+    assert list(parse_numbers(b"1 2\n3 1234567890123456789\n").values) == [1, 2, 3, 1234567890123456789]
+    assert parse_numbers(b"1 2\n3 12345678901234567890\n").values == [1, 2, 3, 12345678901234567890]
+
+
+def test_read_numbers(tmp_path, monkeypatch):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"")
+    assert len(read_numbers(path)) == 0
+    path.write_bytes(b"3   4\n4   3\n" * 1000)
+    expected = read_numbers(path)
+    # The memory map is closed after a NumPy scan too
+    monkeypatch.setattr(parse, "VECTORIZED_BYTES", 0)
+    assert read_numbers(path) == expected